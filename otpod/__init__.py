@@ -22,6 +22,7 @@ def _initializing():
 _initializing()
 
 from ._univariate_linear_model_analysis import *
+from ._univariate_linear_model_analysis_batch import *
 from ._univariate_linear_model_pod import *
 from ._quantile_regression_pod import *
 from ._polynomial_chaos_pod import *
@@ -37,6 +38,7 @@ from ._math_tools import *
 __version__ = "0.6.6"
 
 __all__ = (_univariate_linear_model_analysis.__all__ +
+           _univariate_linear_model_analysis_batch.__all__ +
            _univariate_linear_model_pod.__all__ + 
            _quantile_regression_pod.__all__ +
            _polynomial_chaos_pod.__all__ +
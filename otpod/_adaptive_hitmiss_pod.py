@@ -10,6 +10,9 @@ from ._pod import POD
 from scipy.interpolate import interp1d
 from ._progress_bar import updateProgress
 from ._decorator import DocInherit, keepingArgs
+from ._parallel import submitEvaluation
+from ._sampling import drawSample, checkSamplingMethod
+from ._checkpoint import saveCheckpoint, loadCheckpoint, restoreRandomState
 import logging
 import matplotlib.pyplot as plt
 from sklearn.ensemble import ExtraTreesClassifier
@@ -66,6 +69,11 @@ class AdaptiveHitMissPOD(POD):
     choice of the algorithm can be defined using *setClassifierType*. The default
     algorithm is the random forests.
 
+    The physical model can be evaluated asynchronously while the next points are
+    selected, see *setPhysicalModelExecutor*. The state of the algorithm can be
+    saved at each iteration in order to resume it, see *setCheckpoint* and
+    *resume*.
+
     The physical model can return either the hit miss value (0 or 1) or the signal
     value. In this case, the detection value must be given and the physical 
     model is transformed in order to provide a hit miss value.
@@ -110,6 +118,8 @@ class AdaptiveHitMissPOD(POD):
         self._pmin = 0.45
         self._initialStartSize = 1000
         self._samplingSize = 10000 # Number of MC simulations to compute POD
+        self._samplingMethod = "MonteCarlo"
+        self._samplingReplicates = 10
         self._candidateSize = 5000
         self._nMorePoints = nMorePoints
         self._verbose = True
@@ -117,6 +127,9 @@ class AdaptiveHitMissPOD(POD):
         self._probabilityLevel = None # default graph option
         self._confidenceLevel = None # default graph option
         self._graphDirectory = None # graph directory for saving
+        self._executor = None
+        self._checkpoint = None
+        self._resumeState = None
         
         self._normalDist = ot.Normal()
 
@@ -175,9 +188,15 @@ class AdaptiveHitMissPOD(POD):
             marginals = [ot.Uniform(inputMin[i], inputMax[i]) for i in range(self._dim)]
             self._distribution = ot.ComposedDistribution(marginals)
 
+        # state of the algorithm given by the method resume
+        state = self._resumeState
+        self._resumeState = None
+
         # Create the design of experiments of the candidate points where the
         # criterion is computed
-        if self._distribution.hasIndependentCopula():
+        if state is not None:
+            doeCandidate = state['candidates']
+        elif self._distribution.hasIndependentCopula():
             # without copula use low discrepancy experiment as first doe
             doeCandidate = ot.LowDiscrepancyExperiment(ot.SobolSequence(), 
                             self._distribution, self._candidateSize).generate()
@@ -198,45 +217,37 @@ class AdaptiveHitMissPOD(POD):
 
         n_added_points = 0
         algo_iteration = 0
-        
-        ## Cas de la classif par svc
-        if self._classifierType == "svc" :
-            algo_temp = list(map(
-                lambda C, kernel, degree, probability :
-                svm.SVC(
-                    C=C,
-                    kernel=kernel,
-                    degree=degree,
-                    gamma='auto',
-                    probability=probability,
-                    coef0=1,
-                ),
-                *self._ClassifierParameters))[0]
+        # size of the DOE used to train the classifier of each iteration
+        history = [n_ini]
 
-        ## Cas de la classif par fro
-        if self._classifierType == "rf" :
-            algo_temp = list(map(
-                lambda n_estimators, max_depth, min_samples_split, random_state :                               
-                ExtraTreesClassifier(
-                    n_estimators=n_estimators,
-                    max_depth=max_depth,
-                    min_samples_split=min_samples_split,
-                    random_state=random_state
-                ),
-                *self._ClassifierParameters))[0]                        
-                    
-        algo_temp.fit(self._input,self._signals)
-        
+        f_iter = self._fitClassifier(self._input, self._signals)
         list_classifiers = []
-        f_iter = algo_temp.predict_proba
         list_classifiers.append(f_iter)
         self._classifierModel = f_iter
+
+        if state is not None:
+            # train again the classifiers of the completed iterations
+            self._input = state['input']
+            self._signals = state['signals']
+            history = list(state['history'])
+            for n_iter in history[1:]:
+                f_iter = self._aggregateClassifier(list_classifiers,
+                            self._input[:n_iter], self._signals[:n_iter])
+                list_classifiers.append(f_iter)
+            self._classifierModel = f_iter
+            n_added_points = len(self._input) - n_ini
+            algo_iteration = len(history) - 1
+            restoreRandomState(state)
+            if self._verbose:
+                print('Resume the algorithm after iteration {}'.format(algo_iteration))
         
         plt.ion()
         # Start the improvment loop
         if self._verbose and self._nMorePoints > 0:
             print('Start the improvement loop')
 
+        # points evaluated by the physical model and not added to the DOE yet
+        pending = []
         while n_added_points < self._nMorePoints : 
         
             # calcul de ce qu il y a dans l' exp de la proba          
@@ -247,6 +258,9 @@ class AdaptiveHitMissPOD(POD):
             ind_p2 = np.where(probs>=self._pmin)[0]
             ind_p = np.intersect1d(ind_p2,ind_p1)
             ind = ind_p
+            # the pending points are not selected again
+            for x_pending, ind_pending, future in pending:
+                ind = np.setdiff1d(ind, ind_pending)
                             
             # s'il n'a pas d indices on elargit p_min = 0.45, p_max=0.55
             if len(ind)==0:
@@ -263,71 +277,35 @@ class AdaptiveHitMissPOD(POD):
                      len(ind)-1]
 
             ind_bis = ind_rank[quant]
-            x_new = doeCandidate[ind[ind_bis],:]
-            z_new = np.hstack(self._physicalModel(x_new))        
-            
-            n_new_temp = len(self._input) + len(x_new)
-
+            n_pending = sum([len(x_pending) for x_pending, ind_pending, future in pending])
             # si on depasse le nombre de points, on s arrete
-            if n_new_temp > (n_ini + self._nMorePoints) :
-                x_new = x_new[:self._nMorePoints + n_ini - len(self._input),:]
-                z_new = z_new[:self._nMorePoints + n_ini - len(self._input)]
-            
-            self._input = np.vstack((self._input,x_new))   
-            self._signals = np.hstack((self._signals,z_new))
+            ind_new = ind[ind_bis][:self._nMorePoints - n_added_points - n_pending]
+            x_new = doeCandidate[ind_new,:]
+            pending.append((x_new, ind_new, submitEvaluation(self._executor,
+                                                    self._physicalModel, x_new)))
+            n_pending += len(x_new)
+
+            # the last points are kept pending in order to select the next ones
+            # while they are evaluated, unless all points are selected
+            if self._executor is None or \
+               n_added_points + n_pending >= self._nMorePoints:
+                completed, pending = pending, []
+            else:
+                completed, pending = pending[:-1], pending[-1:]
+            if not completed:
+                continue
+            for x_new, ind_new, future in completed:
+                z_new = np.hstack(future.result())
+                self._input = np.vstack((self._input,x_new))   
+                self._signals = np.hstack((self._signals,z_new))
             
-            n_added_points = n_new_temp - n_ini
+            n_added_points = len(self._input) - n_ini
             algo_iteration =  algo_iteration + 1
-            
-            if self._classifierType == "svc" :
-                algo_temp = list(map(
-                    lambda C, kernel, degree, probability :
-                    svm.SVC(
-                        C=C,
-                        kernel=kernel,
-                        degree=degree,
-                        gamma='auto',
-                        probability=probability,
-                        coef0=1),
-                    *self._ClassifierParameters))[0]
-           
-        
-            if self._classifierType == "rf" :
-                algo_temp = list(map(
-                    lambda n_estimators, max_depth, min_samples_split, random_state :                               
-                    ExtraTreesClassifier(
-                        n_estimators=n_estimators,
-                        max_depth=max_depth,
-                        min_samples_split=min_samples_split,
-                        random_state=random_state
-                    ),
-                    *self._ClassifierParameters))[0]                        
-                                               
-            # Apprentissage avec self._input,self._signals
-            algo_temp.fit(self._input,self._signals)
-            
+            history.append(len(self._input))
 
-            self._confMat = np.zeros((2,2))            
-            for classifier in list_classifiers :
-                conf_temp = 1.*confusion_matrix(self._signals, classifier(self._input)[:,1]>=0.5 )
-                conf_temp = 1.*conf_temp/conf_temp.sum(axis=0)
-                self._confMat = conf_temp + self._confMat             
-                
-            self._confMat = 1.*self._confMat/len(list_classifiers)
-            classif_algo_temp = algo_temp.predict_proba
-                                            
-            p11 = self._confMat[1,1]
-            p10 = self._confMat[1,0]                   
-            
-            def agg_classifier(x_in):
-                c = p11-p10
-                p1_bayes = 1./c*(classif_algo_temp(x_in)[:,1] - p10)
-                p1_bayes = np.vstack(np.min(np.array([np.max(np.array(
-                            [p1_bayes,np.zeros(len(p1_bayes))]), axis=0),
-                            np.ones(len(p1_bayes))]), axis=0))               
-                return(np.array([1-p1_bayes,p1_bayes]).T)[0]
-            
-            f_iter = agg_classifier
+            # Apprentissage avec self._input,self._signals
+            f_iter = self._aggregateClassifier(list_classifiers, self._input,
+                                               self._signals)
             list_classifiers.append(f_iter)
             self._classifierModel = f_iter
 
@@ -335,7 +313,7 @@ class AdaptiveHitMissPOD(POD):
                 updateProgress(n_added_points-1, self._nMorePoints, 'Adding points')
 
             if self._graph:
-                self._PODPerDefect = self._computePOD(self._defectSizes, agg_classifier)
+                self._PODPerDefect = self._computePOD(self._defectSizes, f_iter)
                 # create the interpolate function of the POD model
                 meanPOD = self._PODPerDefect.computeMean()
                 interpModel = interp1d(self._defectSizes, np.array(meanPOD), kind='linear')
@@ -349,6 +327,11 @@ class AdaptiveHitMissPOD(POD):
                     fig.savefig(os.path.join(self._graphDirectory, 'AdaptiveHitMissPOD_')+str(algo_iteration),
                                 bbox_inches='tight', transparent=True)
 
+            if self._checkpoint is not None:
+                saveCheckpoint(self._checkpoint, input=self._input,
+                               signals=self._signals, candidates=doeCandidate,
+                               history=np.array(history))
+
         self._input = ot.Sample(self._input)
         self._signals = ot.Sample(np.vstack(self._signals))
         # Compute the sample predicted for each defect sizes
@@ -364,6 +347,27 @@ class AdaptiveHitMissPOD(POD):
         # remove the interactive plotting
         plt.ioff()
 
+    def resume(self, path):
+        """
+        Resume the algorithm from a checkpoint file and build the POD models.
+
+        Parameters
+        ----------
+        path : string
+            The checkpoint file written by a previous run, see *setCheckpoint*.
+
+        Notes
+        -----
+        The object must be created and parametrized as for the interrupted
+        run. The design of experiments, the candidate points and the state of
+        the random generators are loaded from the file and the classifiers of
+        the completed iterations are trained again, then the algorithm
+        continues without evaluating the physical model on the points already
+        added.
+        """
+        self._resumeState = loadCheckpoint(path)
+        self.run()
+
     def getPODModel(self):
         """
         Accessor to the POD model.
@@ -565,6 +569,76 @@ class AdaptiveHitMissPOD(POD):
         """
         self._candidateSize = size
 
+    def getCheckpoint(self):
+        """
+        Accessor to the checkpoint file.
+
+        Returns
+        -------
+        path : string
+            The file where the state of the algorithm is saved, None if no
+            checkpoint is written.
+        """
+        return self._checkpoint
+
+    def setCheckpoint(self, path):
+        """
+        Accessor to the checkpoint file.
+
+        Parameters
+        ----------
+        path : string
+            The file where the state of the algorithm is saved at the end of
+            each iteration, in the numpy *.npz* format. Default is None.
+
+        Notes
+        -----
+        The file contains the design of experiments, the candidate points, the
+        size of the design of experiments at each iteration, which is enough to
+        train the classifiers again, and the state of the random generators.
+        The algorithm can be continued using the method *resume*.
+        """
+        if type(path) is not str and path is not None:
+            raise TypeError("The parameter 'path' is not a string.")
+        self._checkpoint = path
+
+    def getPhysicalModelExecutor(self):
+        """
+        Accessor to the executor evaluating the physical model.
+
+        Returns
+        -------
+        executor : :py:class:`concurrent.futures.Executor`
+            The executor used to evaluate the physical model, None if the
+            physical model is evaluated at once.
+        """
+        return self._executor
+
+    def setPhysicalModelExecutor(self, executor):
+        """
+        Accessor to the executor evaluating the physical model.
+
+        Parameters
+        ----------
+        executor : :py:class:`concurrent.futures.Executor`
+            Any object with a *submit* method returning a future, for instance a
+            *ThreadPoolExecutor*. Default is None : the physical model is
+            evaluated at once.
+
+        Notes
+        -----
+        When an executor is given, the selected points are submitted to the
+        executor and the next points are selected with the current classifier
+        while they are evaluated, the pending points being excluded from the
+        selection. The hit miss values are added to the design of experiments
+        and the classifier is trained again once the evaluation is completed.
+
+        With a *ProcessPoolExecutor*, the physical model must be picklable.
+        """
+        if executor is not None and not hasattr(executor, 'submit'):
+            raise TypeError("The executor must have a 'submit' method.")
+        self._executor = executor
+
     def getGraphActive(self):
         """
         Accessor to the graph verbosity.
@@ -629,6 +703,39 @@ class AdaptiveHitMissPOD(POD):
         """
         self._samplingSize = size
 
+    def getSamplingMethod(self):
+        """
+        Accessor to the sampling method of the Monte Carlo simulation.
+
+        Returns
+        -------
+        method : string
+            Either "MonteCarlo", "LHS" or "QMC".
+        replicates : int
+            The number of independent designs of the "LHS" and "QMC" methods.
+        """
+        return self._samplingMethod, self._samplingReplicates
+
+    def setSamplingMethod(self, method, replicates=10):
+        """
+        Accessor to the sampling method of the Monte Carlo simulation.
+
+        Parameters
+        ----------
+        method : string
+            "MonteCarlo" : the sample is drawn from the distribution.
+            "LHS" : the sample is made of Latin hypercube designs.
+            "QMC" : the sample is made of Sobol' sequences randomized with a
+            random shift.
+            Default is "MonteCarlo".
+        replicates : int
+            The number of independent designs of the "LHS" and "QMC" methods,
+            the sampling size is split between them. Default is 10.
+        """
+        checkSamplingMethod(method, replicates)
+        self._samplingMethod = method
+        self._samplingReplicates = replicates
+
     def getDefectSizes(self):
         """
         Accessor to the defect size where POD is computed.
@@ -748,7 +855,8 @@ class AdaptiveHitMissPOD(POD):
         Compute the POD sample for all defect sizes in a vectorized way.
         """
         # create the input sample that must be computed by the metamodels
-        samplePred = self._distribution.getSample(self._samplingSize)[:,1:]
+        samplePred = drawSample(self._distribution, self._samplingSize,
+                        self._samplingMethod, self._samplingReplicates)[:,1:]
         fullSamplePred = ot.Sample(self._samplingSize * self._defectNumber,
                                                                     self._dim)
         for i, defect in enumerate(defectSizes):
@@ -759,3 +867,70 @@ class AdaptiveHitMissPOD(POD):
         classifierSample = np.reshape(classifierSample, (self._samplingSize,
                                        self._defectNumber), 'F')
         return ot.Sample(classifierSample)
+
+    def _fitClassifier(self, inputDOE, signals):
+        """
+        Train a new classifier and return its function computing the
+        probabilities.
+        """
+        ## Cas de la classif par svc
+        if self._classifierType == "svc" :
+            algo_temp = list(map(
+                lambda C, kernel, degree, probability :
+                svm.SVC(
+                    C=C,
+                    kernel=kernel,
+                    degree=degree,
+                    gamma='auto',
+                    probability=probability,
+                    coef0=1,
+                ),
+                *self._ClassifierParameters))[0]
+
+        ## Cas de la classif par fro
+        if self._classifierType == "rf" :
+            algo_temp = list(map(
+                lambda n_estimators, max_depth, min_samples_split, random_state :
+                ExtraTreesClassifier(
+                    n_estimators=n_estimators,
+                    max_depth=max_depth,
+                    min_samples_split=min_samples_split,
+                    random_state=random_state
+                ),
+                *self._ClassifierParameters))[0]
+
+        algo_temp.fit(inputDOE, signals)
+        return algo_temp.predict_proba
+
+    def _aggregateClassifier(self, classifiers, inputDOE, signals):
+        """
+        Train a new classifier and correct its probabilities using the mean
+        confusion matrix of the previous classifiers on the DOE.
+        """
+        classif_algo_temp = self._fitClassifier(inputDOE, signals)
+
+        # the aggregated classifiers used to share the last trained classifier
+        # and its confusion matrix : the previous aggregated classifiers are
+        # all replaced by the last one to keep the same confusion matrix
+        classifiers = classifiers[:1] + classifiers[-1:] * (len(classifiers) - 1)
+        self._confMat = np.zeros((2,2))
+        for classifier in classifiers :
+            conf_temp = 1.*confusion_matrix(signals, classifier(inputDOE)[:,1]>=0.5 )
+            conf_temp = 1.*conf_temp/conf_temp.sum(axis=0)
+            self._confMat = conf_temp + self._confMat
+
+        self._confMat = 1.*self._confMat/len(classifiers)
+
+        p11 = self._confMat[1,1]
+        p10 = self._confMat[1,0]
+
+        def agg_classifier(x_in):
+            c = p11-p10
+            p1_bayes = 1./c*(classif_algo_temp(x_in)[:,1] - p10)
+            p1_bayes = np.vstack(np.min(np.array([np.max(np.array(
+                        [p1_bayes,np.zeros(len(p1_bayes))]), axis=0),
+                        np.ones(len(p1_bayes))]), axis=0))
+            return(np.array([1-p1_bayes,p1_bayes]).T)[0]
+
+        return agg_classifier
+
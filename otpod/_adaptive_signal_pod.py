@@ -9,7 +9,9 @@ import numpy as np
 from ._pod import POD
 from scipy.interpolate import interp1d
 from ._progress_bar import updateProgress
-from ._kriging_tools import KrigingBase
+from ._kriging_tools import KrigingBase, KrigingPredictor, computeCriterion
+from ._parallel import submitEvaluation
+from ._checkpoint import saveCheckpoint, loadCheckpoint, restoreRandomState
 import logging
 import matplotlib.pyplot as plt
 
@@ -71,7 +73,9 @@ class AdaptiveSignalPOD(POD, KrigingBase):
     are 20 defect sizes between the minimum and maximum value of the defect sample.
     The defect sizes can be changed using the method *setDefectSizes*. It is
     adviced to run a preliminary POD study in order to know the interesting range
-    of defect sizes. This enables reducing the computing time.
+    of defect sizes. This enables reducing the computing time. The distribution
+    of the POD estimator can also be kept in closed form using the method
+    *setPODDistributionMethod* instead of being sampled.
 
     The default kriging model is built with a linear basis only for the defect
     size and constant otherwise. The covariance model is an anisotropic squared
@@ -80,7 +84,15 @@ class AdaptiveSignalPOD(POD, KrigingBase):
 
     In the algorithm, when a point is added to the design of experiments, the kriging
     model is not always optimized. The covariance model scale coefficients are
-    optimized only if the Q2 value is lower than 0.95.
+    optimized only if the Q2 value is lower than 0.95. The kriging model of each
+    candidate point can be obtained by updating the factorizations of the
+    current model, see *setKrigingUpdateMethod*. The criterion can also be
+    computed in closed form for all candidates at once, see
+    *setCriterionMethod*. Several points can be added at each iteration, see
+    *setBatchSize*. The physical model can be evaluated asynchronously while
+    the next points are selected, see *setPhysicalModelExecutor*. The state of
+    the algorithm can be saved at each iteration in order to resume it, see
+    *setCheckpoint* and *resume*.
 
     For advanced use, all parameters can be defined thanks to dedicated set 
     methods.
@@ -125,6 +137,18 @@ class AdaptiveSignalPOD(POD, KrigingBase):
         self._graphDirectory = None # graph directory for saving
         
         self._normalDist = ot.Normal()
+        self._krigingPredictor = None
+        self._podDistributionMethod = "sampling"
+        self._histogramResolution = 1000
+        self._commonRandomNumbers = False
+        self._samplingMethod = "MonteCarlo"
+        self._samplingReplicates = 10
+        self._krigingUpdateMethod = "rebuild"
+        self._criterionMethod = "sampling"
+        self._batchSize = 1
+        self._executor = None
+        self._checkpoint = None
+        self._resumeState = None
 
         if self._censored:
             logging.info('Censored data are not taken into account : the ' + \
@@ -160,8 +184,8 @@ class AdaptiveSignalPOD(POD, KrigingBase):
         Once the algorithm stops, it builds the POD models : conditional samples are 
         simulated for each defect size, then the distributions of the probability
         estimator (for MC simulation) are built. Eventually, a sample of this
-        distribution is used to compute the mean POD and the POD at the confidence
-        level.
+        distribution, or its closed form, is used to compute the mean POD and the
+        POD at the confidence level.
         """
 
         # Create an initial uniform distribution if not given
@@ -173,9 +197,15 @@ class AdaptiveSignalPOD(POD, KrigingBase):
             marginals = [ot.Uniform(inputMin[i], inputMax[i]) for i in range(self._dim)]
             self._distribution = ot.ComposedDistribution(marginals)
 
+        # state of the algorithm given by the method resume
+        state = self._resumeState
+        self._resumeState = None
+
         # Create the design of experiments of the candidate points where the
         # criterion is computed
-        if self._distribution.hasIndependentCopula():
+        if state is not None:
+            doeCandidate = ot.Sample(state['candidates'])
+        elif self._distribution.hasIndependentCopula():
             # without copula use low discrepancy experiment as first doe
             doeCandidate = ot.LowDiscrepancyExperiment(ot.SobolSequence(), 
                             self._distribution, self._candidateSize).generate()
@@ -193,9 +223,17 @@ class AdaptiveSignalPOD(POD, KrigingBase):
         llDim = algoKriging.getReducedLogLikelihoodFunction().getInputDimension()
         lowerBound = [0.001] * llDim
         upperBound = [50] * llDim
-        algoKriging = self._estimKrigingTheta(algoKriging,
-                                              lowerBound, upperBound,
-                                              self._initialStartSize)
+        if state is None:
+            algoKriging = self._estimKrigingTheta(algoKriging,
+                                                  lowerBound, upperBound,
+                                                  self._initialStartSize)
+        else:
+            # the initial kriging model is built with the saved parameters
+            self._covarianceModel.setFullParameter(
+                                        state['initialCovarianceParameter'])
+            algoKriging, transformation = self._buildKrigingAlgo(self._input,
+                                                                 self._signals)
+            algoKriging.setOptimizeParameters(False)
         algoKriging.run()
 
         # Get kriging results
@@ -203,18 +241,43 @@ class AdaptiveSignalPOD(POD, KrigingBase):
         self._covarianceModel = self._krigingResult.getCovarianceModel()
         self._basis = self._krigingResult.getBasisCollection()
         metamodel = ot.ComposedFunction(self._krigingResult.getMetaModel(), transformation)
+        # vectorized form of metamodel, used for the POD of the previous step
+        initialPredictor = KrigingPredictor(self._krigingResult)
+        initialTransformation = transformation
+
+        initialCovarianceParameter = self._covarianceModel.getFullParameter()
+
+        iteration = 0
+        if state is not None:
+            # the kriging model of the last completed iteration
+            iteration = int(state['iteration'])
+            self._input = ot.Sample(state['input'])
+            self._signals = ot.Sample(state['signals'])
+            self._covarianceModel.setFullParameter(state['covarianceParameter'])
+            algoKriging, transformation = self._buildKrigingAlgo(self._input,
+                                                                 self._signals)
+            algoKriging.setOptimizeParameters(False)
+            algoKriging.run()
+            self._krigingResult = algoKriging.getResult()
+            self._covarianceModel = self._krigingResult.getCovarianceModel()
+            self._basis = self._krigingResult.getBasisCollection()
+            restoreRandomState(state)
+            if self._verbose:
+                print('Resume the algorithm after iteration {}'.format(iteration))
 
         self._Q2 = self._computeQ2(self._input, self._signals, self._krigingResult, transformation)
         if self._verbose:
             print('Kriging validation Q2 (>0.9): {:0.4f}\n'.format(self._Q2))
 
         plt.ion()
-        # Start the improvment loop
-        iteration = 0
-        while iteration < self._nIteration:
+        # Start the improvment loop, the points are added by batch
+        iterationNumber = int(np.ceil(self._nIteration / float(self._batchSize)))
+        # batches evaluated by the physical model and not added to the DOE yet
+        pending = []
+        while iteration < iterationNumber:
             iteration += 1
             if self._verbose:
-                print('Iteration : {}/{}'.format(iteration, self._nIteration))
+                print('Iteration : {}/{}'.format(iteration, iterationNumber))
 
             # compute POD (ptrue = pn-1) for bias reducing in the criterion
             # Monte Carlo for all defect sizes in a vectorized way.
@@ -226,84 +289,68 @@ class AdaptiveSignalPOD(POD, KrigingBase):
             for i, defect in enumerate(self._defectSizes):
                 fullSamplePred[self._samplingSize*i:self._samplingSize*(i+1), :] = \
                                         self._mergeDefectInX(defect, samplePred)
-            meanPredictionSample = metamodel(fullSamplePred)
-            meanPredictionSample = np.reshape(meanPredictionSample, (self._samplingSize,
-                                                    self._defectNumber), 'F')
+            # the mean of the initial kriging model (metamodel) is computed on
+            # the grid of the defect sizes and the sample in the normalized space
+            fullSampleNormed = np.array(initialTransformation(fullSamplePred))
+            grid = (fullSampleNormed[::self._samplingSize, 0],
+                    fullSampleNormed[:self._samplingSize, 1:])
+            meanPredictionSample = initialPredictor.computeMeanGrid(*grid)
             # compute the POD for all defect sizes
             currentPOD = np.mean(meanPredictionSample > self._detectionBoxCox, axis=0)
 
-            # Compute criterion for all candidate in the candidate doe
-            criterion = 1000000000
-            for icand, candidate in enumerate(doeCandidate):
-
-                # add the current candidate to the kriging doe
-                inputAugmented = self._input[:]
-                inputAugmented.add(candidate)
-                signalsAugmented = self._signals[:]
-                # predict the signal value of the candidate using the current
-                # kriging model
-                signalsAugmented.add(metamodel(candidate))
-                # create a temporary kriging model with the new doe and without
-                # updating the covariance model parameters
-
-                # normalization
-                mean = inputAugmented.computeMean()
-                stddev = inputAugmented.computeStandardDeviationPerComponent()
-                linear = ot.SquareMatrix(self._dim)
-                for j in range(self._dim):
-                    linear[j, j] = 1.0 / stddev[j] if abs(stddev[j]) > 1e-12 else 1.0
-                zero = [0.0] * self._dim
-                transformation = ot.LinearFunction(mean, zero, linear)
-
-                algoKrigingTemp = ot.KrigingAlgorithm(transformation(inputAugmented), signalsAugmented,
-                                                      self._covarianceModel,
-                                                      self._basis)
-                optimizer = algoKrigingTemp.getOptimizationAlgorithm()
-                optimizer.setMaximumIterationNumber(0)
-                algoKrigingTemp.setOptimizationAlgorithm(optimizer)
-                algoKrigingTemp.run()
-                krigingResultTemp = algoKrigingTemp.getResult()
-
-                # compute the criterion for all defect size
-                crit = []
-                # save results, used to compute the PODModel et PODCLModel
-                PODPerDefect = ot.Sample(self._simulationSize *
-                                         self._samplingSize, self._defectNumber)
-                for idef, defect in enumerate(self._defectSizes):
-                    podSample = self._computePODSamplePerDefect(defect,
-                        self._detectionBoxCox, krigingResultTemp, transformation,
-                        self._distribution, self._simulationSize, self._samplingSize)
-                    PODPerDefect[:, idef] = podSample
-
-                    meanPOD = podSample.computeMean()[0]
-                    varPOD = podSample.computeVariance()[0]
-                    crit.append(varPOD + (meanPOD - currentPOD[idef])**2)
-                # compute the criterion aggregated for all defect sizes
-                newCriterion = np.sqrt(np.mean(crit))
-
-                # check if the result is better or not
-                if newCriterion < criterion:
-                    self._PODPerDefect = PODPerDefect
-                    criterion = newCriterion
-                    indexOpt = icand
-                
+            # select the points of the batch, the signal of the selected points
+            # being the prediction of the kriging model (kriging believer)
+            predictor = self._getKrigingPredictor(self._krigingResult)
+            batchSize = min(self._batchSize,
+                            self._nIteration - (iteration - 1) * self._batchSize)
+            batch = ot.Sample(0, self._dim)
+            inputBelieved = self._input[:]
+            signalsBelieved = self._signals[:]
+            # the points still evaluated by the physical model are also believed
+            for pendingBatch, future in pending:
+                for point in pendingBatch:
+                    pointNormed = transformation(point)
+                    signalBelieved = predictor.computeMean(pointNormed)[0]
+                    predictor = predictor.augment(pointNormed, signalBelieved)
+                    inputBelieved.add(point)
+                    signalsBelieved.add([signalBelieved])
+            for ibatch in range(batchSize):
+                indexOpt, criterion = self._selectCandidate(doeCandidate,
+                            inputBelieved, signalsBelieved, predictor,
+                            transformation, metamodel, fullSamplePred, currentPOD)
+                # get the best candidate
+                candidateOpt = doeCandidate[indexOpt]
+                candidateNormed = transformation(candidateOpt)
+                signalBelieved = predictor.computeMean(candidateNormed)[0]
+                predictor = predictor.augment(candidateNormed, signalBelieved)
+                inputBelieved.add(candidateOpt)
+                signalsBelieved.add([signalBelieved])
+                batch.add(candidateOpt)
+                # remove added candidate from the doeCandidate
+                doeCandidate.erase(indexOpt)
                 if self._verbose:
-                    updateProgress(icand, int(doeCandidate.getSize()), 'Computing criterion')
-
-            # get the best candidate
-            candidateOpt = doeCandidate[indexOpt]
-            # add new point to DOE
-            self._input.add(candidateOpt)
-            # add the signal computed by the physical model
-            if self._boxCox:
-                self._signals.add(self._boxCoxTransform(self._physicalModel(candidateOpt) + [self._shift]))
+                    print('Criterion value : {:0.4f}'.format(criterion))
+                    print('Added point : {}'.format(candidateOpt))
+
+            # compute the signals of the whole batch with the physical model
+            pending.append((batch, submitEvaluation(self._executor,
+                                                    self._physicalModel, batch)))
+            # the last batch is kept pending in order to select the next one
+            # while it is evaluated, except at the last iteration
+            if self._executor is None or iteration == iterationNumber:
+                completed, pending = pending, []
             else:
-                self._signals.add(self._physicalModel(candidateOpt))
-            # remove added candidate from the doeCandidate
-            doeCandidate.erase(indexOpt)
+                completed, pending = pending[:-1], pending[-1:]
+            if not completed:
+                continue
+            for pendingBatch, future in completed:
+                # add new points to DOE
+                self._input.add(pendingBatch)
+                if self._boxCox:
+                    self._signals.add(self._boxCoxTransform(future.result() + [self._shift]))
+                else:
+                    self._signals.add(future.result())
             if self._verbose:
-                print('Criterion value : {:0.4f}'.format(criterion))
-                print('Added point : {}'.format(candidateOpt))
                 print('Update the kriging model')
 
             # update the kriging model without optimization
@@ -348,18 +395,27 @@ class AdaptiveSignalPOD(POD, KrigingBase):
                     fig.savefig(os.path.join(self._graphDirectory, 'AdaptiveSignalPOD_')+str(iteration),
                                 bbox_inches='tight', transparent=True)
 
+            if self._checkpoint is not None:
+                # the pending points are selected again when the algorithm
+                # is resumed
+                candidates = ot.Sample(doeCandidate)
+                for pendingBatch, future in pending:
+                    candidates.add(pendingBatch)
+                saveCheckpoint(self._checkpoint,
+                    input=np.array(self._input), signals=np.array(self._signals),
+                    candidates=np.array(candidates),
+                    covarianceParameter=np.array(self._covarianceModel.getFullParameter()),
+                    initialCovarianceParameter=np.array(initialCovarianceParameter),
+                    iteration=iteration - len(pending))
+
         # Compute the final POD with the last updated kriging model
         if self._verbose:
                 print('\nStart computing the POD with the last updated kriging model')
-        # compute the sample containing the POD values for all defect 
-        self._PODPerDefect = ot.Sample(self._simulationSize *
-                                         self._samplingSize, self._defectNumber)
-        for i, defect in enumerate(self._defectSizes):
-            self._PODPerDefect[:, i] = self._computePODSamplePerDefect(defect,
-                self._detectionBoxCox, self._krigingResult, transformation,
-                self._distribution, self._simulationSize, self._samplingSize)
-            if self._verbose:
-                updateProgress(i, self._defectNumber, 'Computing POD per defect')
+        # compute the distribution of the POD estimator for all defect
+        self._PODPerDefect = self._computePODPerDefect(self._detectionBoxCox,
+                    self._getKrigingPredictor(self._krigingResult), transformation,
+                    self._distribution, self._simulationSize, self._samplingSize,
+                    self._verbose)
 
         # compute the mean POD 
         meanPOD = self._PODPerDefect.computeMean()
@@ -372,6 +428,119 @@ class AdaptiveSignalPOD(POD, KrigingBase):
         # remove the interactive plotting
         plt.ioff()
 
+    def _selectCandidate(self, doeCandidate, inputDOE, signals, predictor,
+                         transformation, metamodel, fullSamplePred, currentPOD):
+        """
+        Compute the criterion for all candidate points and return the index of
+        the best candidate with its criterion value.
+
+        inputDOE, signals : current design of experiments
+        predictor : KrigingPredictor of the current kriging model
+        """
+        if self._criterionMethod == "analytic":
+            # criterion of all candidates from the kriging mean and the
+            # kriging variance updated with each candidate
+            fullSampleNormed = np.array(transformation(fullSamplePred))
+            grid = (fullSampleNormed[::self._samplingSize, 0],
+                    fullSampleNormed[:self._samplingSize, 1:])
+            criteria = computeCriterion(predictor, fullSampleNormed,
+                                        transformation(doeCandidate),
+                                        self._detectionBoxCox, self._samplingSize,
+                                        currentPOD, grid=grid)
+            indexOpt = int(np.argmin(criteria))
+            criterion = criteria[indexOpt]
+            if self._graph:
+                candidateNormed = transformation(doeCandidate[indexOpt])
+                candidatePredictor = predictor.augment(candidateNormed,
+                                predictor.computeMean(candidateNormed)[0])
+                self._PODPerDefect = self._computePODPerDefect(
+                            self._detectionBoxCox, candidatePredictor, transformation,
+                            self._distribution, self._simulationSize,
+                            self._samplingSize)
+        else:
+            # Compute criterion for all candidate in the candidate doe
+            criterion = 1000000000
+            for icand, candidate in enumerate(doeCandidate):
+
+                if self._krigingUpdateMethod == "incremental":
+                    # add the candidate to the factorizations of the current
+                    # kriging model, its signal being predicted by the model
+                    candidateNormed = transformation(candidate)
+                    candidatePredictor = predictor.augment(candidateNormed,
+                                    predictor.computeMean(candidateNormed)[0])
+                    candidateTransformation = transformation
+                else:
+                    # add the current candidate to the kriging doe
+                    inputAugmented = inputDOE[:]
+                    inputAugmented.add(candidate)
+                    signalsAugmented = signals[:]
+                    # predict the signal value of the candidate using the current
+                    # kriging model
+                    signalsAugmented.add(metamodel(candidate))
+                    # create a temporary kriging model with the new doe and without
+                    # updating the covariance model parameters
+
+                    # normalization
+                    mean = inputAugmented.computeMean()
+                    stddev = inputAugmented.computeStandardDeviationPerComponent()
+                    linear = ot.SquareMatrix(self._dim)
+                    for j in range(self._dim):
+                        linear[j, j] = 1.0 / stddev[j] if abs(stddev[j]) > 1e-12 else 1.0
+                    zero = [0.0] * self._dim
+                    candidateTransformation = ot.LinearFunction(mean, zero, linear)
+
+                    algoKrigingTemp = ot.KrigingAlgorithm(candidateTransformation(inputAugmented), signalsAugmented,
+                                                          self._covarianceModel,
+                                                          self._basis)
+                    optimizer = algoKrigingTemp.getOptimizationAlgorithm()
+                    optimizer.setMaximumIterationNumber(0)
+                    algoKrigingTemp.setOptimizationAlgorithm(optimizer)
+                    algoKrigingTemp.run()
+                    candidatePredictor = KrigingPredictor(algoKrigingTemp.getResult())
+
+                # compute the criterion for all defect size
+                # save results, used to compute the PODModel et PODCLModel
+                PODPerDefect = self._computePODPerDefect(self._detectionBoxCox,
+                            candidatePredictor, candidateTransformation, self._distribution,
+                            self._simulationSize, self._samplingSize)
+                meanPOD = np.array(PODPerDefect.computeMean())
+                varPOD = np.array(PODPerDefect.computeVariance())
+                crit = varPOD + (meanPOD - currentPOD)**2
+                # compute the criterion aggregated for all defect sizes
+                newCriterion = np.sqrt(np.mean(crit))
+
+                # check if the result is better or not
+                if newCriterion < criterion:
+                    self._PODPerDefect = PODPerDefect
+                    criterion = newCriterion
+                    indexOpt = icand
+                
+                if self._verbose:
+                    updateProgress(icand, int(doeCandidate.getSize()), 'Computing criterion')
+
+        return indexOpt, criterion
+
+    def resume(self, path):
+        """
+        Resume the algorithm from a checkpoint file and build the POD models.
+
+        Parameters
+        ----------
+        path : string
+            The checkpoint file written by a previous run, see *setCheckpoint*.
+
+        Notes
+        -----
+        The object must be created and parametrized as for the interrupted
+        run. The design of experiments, the remaining candidate points, the
+        covariance model parameters and the state of the random generators are
+        loaded from the file, then the algorithm continues after the last
+        completed iteration without evaluating the physical model on the
+        points already added.
+        """
+        self._resumeState = loadCheckpoint(path)
+        self.run()
+
     def getOutputDOE(self):
         """
         Accessor to the final output values of the DOE.
@@ -410,6 +579,186 @@ class AdaptiveSignalPOD(POD, KrigingBase):
         """
         self._candidateSize = size
 
+    def getKrigingUpdateMethod(self):
+        """
+        Accessor to the method used to build the kriging model of a candidate.
+
+        Returns
+        -------
+        method : string
+            The method, "rebuild" or "incremental".
+        """
+        return self._krigingUpdateMethod
+
+    def setKrigingUpdateMethod(self, method):
+        """
+        Accessor to the method used to build the kriging model of a candidate.
+
+        Parameters
+        ----------
+        method : string
+            The method, "rebuild" or "incremental". Default is "rebuild".
+
+        Notes
+        -----
+        With "rebuild", a kriging model is built for each candidate point from
+        the augmented design of experiments, normalized again, and with the
+        same covariance model parameters.
+
+        With "incremental", the Cholesky and QR factorizations of the current
+        kriging model are updated with the candidate point, which costs O(n^2)
+        instead of O(n^3) per candidate. The normalization of the inputs is
+        the one of the current design of experiments, so the criterion values
+        slightly differ from the "rebuild" method.
+        """
+        if method not in ["rebuild", "incremental"]:
+            raise ValueError("Method must be 'rebuild' or 'incremental'.")
+        self._krigingUpdateMethod = method
+
+    def getBatchSize(self):
+        """
+        Accessor to the number of points added at each iteration.
+
+        Returns
+        -------
+        size : int
+            The number of points added to the design of experiments at each
+            iteration.
+        """
+        return self._batchSize
+
+    def setBatchSize(self, size):
+        """
+        Accessor to the number of points added at each iteration.
+
+        Parameters
+        ----------
+        size : positive int
+            The number of points added to the design of experiments at each
+            iteration. Default is 1.
+
+        Notes
+        -----
+        The points of a batch are selected one after the other with the
+        kriging believer heuristic : once a point is selected, its signal is
+        set to the prediction of the kriging model and the point is added to
+        the design of experiments used to select the next one. The physical
+        model is then called once with the whole batch as a sample, which can
+        be evaluated in parallel. The kriging model is updated after each batch.
+        The last batch is smaller if the number of points to add is not a
+        multiple of the batch size.
+        """
+        if type(size) is not int or size < 1:
+            raise ValueError("The batch size must be a positive integer.")
+        self._batchSize = size
+
+    def getCheckpoint(self):
+        """
+        Accessor to the checkpoint file.
+
+        Returns
+        -------
+        path : string
+            The file where the state of the algorithm is saved, None if no
+            checkpoint is written.
+        """
+        return self._checkpoint
+
+    def setCheckpoint(self, path):
+        """
+        Accessor to the checkpoint file.
+
+        Parameters
+        ----------
+        path : string
+            The file where the state of the algorithm is saved at the end of
+            each iteration, in the numpy *.npz* format. Default is None.
+
+        Notes
+        -----
+        The file contains the design of experiments, the remaining candidate
+        points, the covariance model parameters and the state of the random
+        generators. The algorithm can be continued using the method *resume*.
+        """
+        if type(path) is not str and path is not None:
+            raise TypeError("The parameter 'path' is not a string.")
+        self._checkpoint = path
+
+    def getPhysicalModelExecutor(self):
+        """
+        Accessor to the executor evaluating the physical model.
+
+        Returns
+        -------
+        executor : :py:class:`concurrent.futures.Executor`
+            The executor used to evaluate the physical model, None if the
+            physical model is evaluated at once.
+        """
+        return self._executor
+
+    def setPhysicalModelExecutor(self, executor):
+        """
+        Accessor to the executor evaluating the physical model.
+
+        Parameters
+        ----------
+        executor : :py:class:`concurrent.futures.Executor`
+            Any object with a *submit* method returning a future, for instance a
+            *ThreadPoolExecutor*. Default is None : the physical model is
+            evaluated at once.
+
+        Notes
+        -----
+        When an executor is given, the batch of points is submitted to the
+        executor and the batch of the next iteration is selected while it is
+        evaluated, the pending points being taken into account with their
+        kriging prediction. The signals are added to the design of experiments
+        and the kriging model is updated once the evaluation is completed. The
+        kriging model used to select a batch thus ignores the signals of the
+        previous batch, which may slightly change the selected points.
+
+        With a *ProcessPoolExecutor*, the physical model must be picklable.
+        """
+        if executor is not None and not hasattr(executor, 'submit'):
+            raise TypeError("The executor must have a 'submit' method.")
+        self._executor = executor
+
+    def getCriterionMethod(self):
+        """
+        Accessor to the method used to compute the enrichment criterion.
+
+        Returns
+        -------
+        method : string
+            The method, "sampling" or "analytic".
+        """
+        return self._criterionMethod
+
+    def setCriterionMethod(self, method):
+        """
+        Accessor to the method used to compute the enrichment criterion.
+
+        Parameters
+        ----------
+        method : string
+            The method, "sampling" or "analytic". Default is "sampling".
+
+        Notes
+        -----
+        With "sampling", the distribution of the POD estimator is computed for
+        each candidate point by simulating conditional predictions of the
+        kriging model including the candidate.
+
+        With "analytic", the signal of the candidate being the current
+        prediction, the kriging mean is unchanged and the kriging variance at
+        the Monte Carlo points is updated in closed form. The mean and variance
+        of the POD estimator are then computed without simulations, for all
+        candidates at once. The kriging update method is not used in this case.
+        """
+        if method not in ["sampling", "analytic"]:
+            raise ValueError("Method must be 'sampling' or 'analytic'.")
+        self._criterionMethod = method
+
     def getGraphActive(self):
         """
         Accessor to the graph verbosity.
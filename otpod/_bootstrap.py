@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# -*- Python -*-
+
+"""
+Tools for the bootstrap of the POD confidence intervals.
+
+The indices of all bootstrap samples are drawn at once before the refits,
+so the refits do not use the random generator and can be run in any order,
+possibly in parallel with the tools of _parallel.py. The indices are drawn
+with the same random numbers as successive calls to
+ot.BootstrapExperiment.generate.
+"""
+
+__all__ = []
+
+import openturns as ot
+import numpy as np
+
+def generateBootstrapIndices(size, simulationSize):
+    """
+    Draw the indices of simulationSize bootstrap samples of the given size.
+    The result is an array of size simulationSize x size.
+    """
+    indices = ot.RandomGenerator.IntegerGenerate(size * simulationSize, size)
+    return np.reshape(indices, (simulationSize, size))
+
+def computeLinearRegressionBatch(defects, signals, indices):
+    """
+    Compute the least squares linear regressions of the signals versus the
+    defects for all bootstrap samples at once.
+
+    Parameters
+    ----------
+    defects, signals : 1-d array
+        The data.
+    indices : 2-d array
+        The indices of the bootstrap samples, one sample per row.
+
+    Returns
+    -------
+    intercept, slope : 1-d array
+        The parameters of the linear regression of each bootstrap sample.
+    residuals : 2-d array
+        The residuals of each bootstrap sample, one sample per row.
+    """
+    defectsBoot = np.asarray(defects)[indices]
+    signalsBoot = np.asarray(signals)[indices]
+    defectsCentered = defectsBoot - defectsBoot.mean(axis=1, keepdims=True)
+    signalsMean = signalsBoot.mean(axis=1)
+    slope = np.sum(defectsCentered * signalsBoot, axis=1) / \
+            np.sum(defectsCentered**2, axis=1)
+    intercept = signalsMean - slope * defectsBoot.mean(axis=1)
+    residuals = signalsBoot - (intercept[:, np.newaxis] +
+                               slope[:, np.newaxis] * defectsBoot)
+    return intercept, slope, residuals
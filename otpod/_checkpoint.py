@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# -*- Python -*-
+
+"""
+Tools to save the state of the adaptive algorithms in a numpy .npz file and
+to load it in order to resume the algorithm.
+
+The state of the OpenTURNS and numpy random generators is saved with the
+given arrays, so a resumed run draws the same random numbers as an
+uninterrupted run.
+"""
+
+__all__ = []
+
+import os
+import numpy as np
+import openturns as ot
+
+def saveCheckpoint(path, **state):
+    """
+    Save the arrays and the state of the random generators in the file. The
+    file is first written in a temporary file so a crash while saving does not
+    corrupt the previous checkpoint.
+    """
+    randomState = ot.RandomGenerator.GetState()
+    numpyState = np.random.get_state()
+    state['randomBuffer'] = np.array(randomState.getBuffer(), dtype=np.uint64)
+    state['randomIndex'] = randomState.getIndex()
+    state['numpyKeys'] = numpyState[1]
+    state['numpyPosition'] = numpyState[2]
+    state['numpyHasGauss'] = numpyState[3]
+    state['numpyCachedGaussian'] = numpyState[4]
+    tmpPath = path + '.tmp'
+    with open(tmpPath, 'wb') as checkpointFile:
+        np.savez(checkpointFile, **state)
+    os.replace(tmpPath, path)
+
+def loadCheckpoint(path):
+    """
+    Load the arrays saved in the file.
+    """
+    with np.load(path) as checkpointFile:
+        state = dict(checkpointFile)
+    return state
+
+def restoreRandomState(state):
+    """
+    Restore the state of the random generators saved in the checkpoint.
+    """
+    ot.RandomGenerator.SetState(ot.RandomGeneratorState(
+                        ot.Indices([int(i) for i in state['randomBuffer']]),
+                        int(state['randomIndex'])))
+    np.random.set_state(('MT19937', state['numpyKeys'],
+                         int(state['numpyPosition']),
+                         int(state['numpyHasGauss']),
+                         float(state['numpyCachedGaussian'])))
@@ -7,7 +7,6 @@ import openturns as ot
 import numpy as np
 from ._pod import POD
 from scipy.interpolate import interp1d
-from ._progress_bar import updateProgress
 from ._kriging_tools import KrigingBase
 import logging
 
@@ -54,6 +53,11 @@ class KrigingPOD(POD, KrigingBase):
     are 20 defect sizes between the minimum and maximum value of the defect sample.
     The defect sizes can be changed using the method *setDefectSizes*.
 
+    By default, the distribution of the POD estimator is sampled to compute the
+    mean POD and the POD at the confidence level. It can be kept in closed form
+    using the method *setPODDistributionMethod*, which is faster and requires
+    much less memory.
+
     The default kriging model is built with a linear basis only for the defect
     size and constant otherwise. The covariance model is an anisotropic squared
     exponential model. Parameters are estimated using a Multi Start TNC
@@ -65,6 +69,16 @@ class KrigingPOD(POD, KrigingBase):
     it can be given as parameter using the method *setKrigingResult*,
     then the POD is computed based on this kriging result.
 
+    The computations for the defect sizes are independent and can be
+    run in parallel using the method *setParallelism*. Using the method
+    *setCommonRandomNumbers*, the same random numbers can be used for all
+    defect sizes : the POD curve is then smoother and the kriging model is
+    evaluated for all defect sizes at once.
+
+    The Monte Carlo samples can be replaced by Latin hypercube or randomized
+    quasi Monte Carlo designs using the method *setSamplingMethod*, the
+    variance of the POD estimator is then computed from independent replicates.
+
     A progress bar is shown if the verbosity is enabled. It can be disabled using
     the method *setVerbose*.
     """
@@ -100,6 +114,12 @@ class KrigingPOD(POD, KrigingBase):
         self._verbose = True
 
         self._normalDist = ot.Normal()
+        self._krigingPredictor = None
+        self._podDistributionMethod = "sampling"
+        self._histogramResolution = 1000
+        self._commonRandomNumbers = False
+        self._samplingMethod = "MonteCarlo"
+        self._samplingReplicates = 10
 
         if self._censored:
             logging.info('Censored data are not taken into account : the ' + \
@@ -132,8 +152,8 @@ class KrigingPOD(POD, KrigingBase):
         enabled. Then it builds the POD models : conditional samples are 
         simulated for each defect size, then the distributions of the probability
         estimator (for MC simulation) are built. Eventually, a sample of this
-        distribution is used to compute the mean POD and the POD at the confidence
-        level.
+        distribution, or its closed form, is used to compute the mean POD and the
+        POD at the confidence level.
         """
 
         # run the chaos algorithm and get result if not given
@@ -170,15 +190,11 @@ class KrigingPOD(POD, KrigingBase):
             marginals = [ot.Uniform(inputMin[i], inputMax[i]) for i in range(self._dim)]
             self._distribution = ot.ComposedDistribution(marginals)
 
-        # compute the sample containing the POD values for all defect 
-        self._PODPerDefect = ot.Sample(self._simulationSize *
-                                         self._samplingSize, self._defectNumber)
-        for i, defect in enumerate(self._defectSizes):
-            self._PODPerDefect[:, i] = self._computePODSamplePerDefect(defect,
-                self._detectionBoxCox, self._krigingResult, transformation, self._distribution,
-                self._simulationSize, self._samplingSize)
-            if self._verbose:
-                updateProgress(i, self._defectNumber, 'Computing POD per defect')
+        # compute the distribution of the POD estimator for all defect
+        self._PODPerDefect = self._computePODPerDefect(self._detectionBoxCox,
+                    self._getKrigingPredictor(self._krigingResult), transformation,
+                    self._distribution, self._simulationSize, self._samplingSize,
+                    self._verbose)
 
         # compute the mean POD 
         meanPOD = self._PODPerDefect.computeMean()
@@ -3,8 +3,14 @@
 
 import openturns as ot
 import numpy as np
+from copy import copy
 from scipy.interpolate import interp1d
+from scipy.linalg import cholesky, solve_triangular, qr
+from scipy.optimize import brentq
+from scipy.special import ndtr
 from ._decorator import DocInherit, keepingArgs
+from ._parallel import parallelMap, randomStream
+from ._sampling import drawSample, splitReplicates, checkSamplingMethod
 
 __all__ = []
 
@@ -344,6 +350,127 @@ class KrigingBase():
         else:
             self._verbose = verbose
 
+    def getPODDistributionMethod(self):
+        """
+        Accessor to the representation of the POD estimator distribution.
+
+        Returns
+        -------
+        method : string
+            Either "sampling", "analytic" or "histogram". Default is "sampling".
+        """
+        return self._podDistributionMethod
+
+    def setPODDistributionMethod(self, method):
+        """
+        Accessor to the representation of the POD estimator distribution.
+
+        Parameters
+        ----------
+        method : string
+            "sampling" : the mixture of the POD estimator distributions is
+            sampled (simulationSize * samplingSize values per defect size) and
+            the mean and quantiles are computed on this sample.
+            "analytic" : the mixture is kept in closed form, the mean is
+            computed exactly and the quantiles are found by root-finding on
+            the mixture CDF. This is faster and requires much less memory.
+            "histogram" : the mixture is sampled by chunks and only a histogram
+            of fixed resolution is stored for each defect size. The memory is
+            then independent of the simulation and sampling sizes.
+        """
+        if method not in ["sampling", "analytic", "histogram"]:
+            raise ValueError("Method must be 'sampling', 'analytic' or 'histogram'.")
+        else:
+            self._podDistributionMethod = method
+
+    def getCommonRandomNumbers(self):
+        """
+        Accessor to the sampling mode of the POD per defect size.
+
+        Returns
+        -------
+        common : bool
+            If True, the same random numbers are used for all defect sizes.
+        """
+        return self._commonRandomNumbers
+
+    def setCommonRandomNumbers(self, common):
+        """
+        Accessor to the sampling mode of the POD per defect size.
+
+        Parameters
+        ----------
+        common : bool
+            If True, the same sample of the other inputs and the same
+            conditional simulations are used for all defect sizes, and the
+            kriging model is evaluated for all defect sizes at once. The POD
+            curve is then smoother for a given sampling size. Otherwise new
+            random numbers are drawn for each defect size. Default is False.
+        """
+        if type(common) is not bool:
+            raise TypeError('The parameter is not a bool.')
+        else:
+            self._commonRandomNumbers = common
+
+    def getSamplingMethod(self):
+        """
+        Accessor to the sampling method of the Monte Carlo simulation.
+
+        Returns
+        -------
+        method : string
+            Either "MonteCarlo", "LHS" or "QMC".
+        replicates : int
+            The number of independent designs of the "LHS" and "QMC" methods.
+        """
+        return self._samplingMethod, self._samplingReplicates
+
+    def setSamplingMethod(self, method, replicates=10):
+        """
+        Accessor to the sampling method of the Monte Carlo simulation.
+
+        Parameters
+        ----------
+        method : string
+            "MonteCarlo" : the sample is drawn from the distribution.
+            "LHS" : the sample is made of Latin hypercube designs.
+            "QMC" : the sample is made of Sobol' sequences randomized with a
+            random shift.
+            Default is "MonteCarlo".
+        replicates : int
+            The number of independent designs of the "LHS" and "QMC" methods,
+            the sampling size is split between them. The variance of the Monte
+            Carlo estimator of the POD is then computed from the replicates
+            instead of the TCL. Default is 10.
+        """
+        checkSamplingMethod(method, replicates)
+        self._samplingMethod = method
+        self._samplingReplicates = replicates
+
+    def getHistogramResolution(self):
+        """
+        Accessor to the number of bins of the POD estimator histogram.
+
+        Returns
+        -------
+        resolution : int
+            The number of bins used for each defect size when the POD
+            distribution method is "histogram". Default is 1000.
+        """
+        return self._histogramResolution
+
+    def setHistogramResolution(self, resolution):
+        """
+        Accessor to the number of bins of the POD estimator histogram.
+
+        Parameters
+        ----------
+        resolution : int
+            The number of bins used for each defect size when the POD
+            distribution method is "histogram".
+        """
+        self._histogramResolution = resolution
+
 
     def _buildKrigingAlgo(self, inputSample, outputSample):
         """
@@ -377,60 +504,70 @@ class KrigingBase():
                                           self._covarianceModel, self._basis)
         return algoKriging, transformation
 
-    def _computePODSamplePerDefect(self, defect, detection, krigingResult, transformation,
-                                  distribution, simulationSize, samplingSize):
+    def _computePODPerDefect(self, detection, predictor, transformation,
+                             distribution, simulationSize, samplingSize,
+                             verbose=False):
         """
-        Compute the POD sample for a defect size.
-        """
-
-        dim = distribution.getDimension()
-        # create a distibution with a dirac distribution for the defect size
-        diracDist = [ot.Dirac(defect)]
-        diracDist += [distribution.getMarginal(i+1) for i in range(dim-1)]
-        distribution = ot.ComposedDistribution(diracDist)
-
-        # create a sample for the Monte Carlo simulation and confidence interval
-        MC_sample = distribution.getSample(samplingSize)
-        # Kriging_RV = ot.KrigingRandomVector(krigingResult, MC_sample)
-        # Y_sample = Kriging_RV.getSample(simulationSize)
-        Y_sample = self._randomVectorSampling(krigingResult, transformation(MC_sample),
-                                        simulationSize, samplingSize)
-
-        # compute the POD for all simulation size
-        POD_MCPG_a = np.mean(Y_sample > detection, axis=1)
-        # compute the variance of the MC simulation using TCL
-        VAR_TCL = np.array(POD_MCPG_a)*(1-np.array(POD_MCPG_a)) / Y_sample.shape[1]
-        # Create distribution of the POD estimator for all simulation 
-        POD_PG_dist = []
-        for i in range(simulationSize):
-            if VAR_TCL[i] > 0:
-                POD_PG_dist += [ot.Normal(POD_MCPG_a[i],np.sqrt(VAR_TCL[i]))]
-            else:
-                if POD_MCPG_a[i] < 1:
-                    POD_PG_dist += [ot.Dirac([0.])]
-                else:
-                    POD_PG_dist += [ot.Dirac([1.])]
-        POD_PG_alea = ot.Mixture(POD_PG_dist)
-        # get a sample of these distributions
-        POD_PG_sample = POD_PG_alea.getSample(simulationSize * samplingSize)
+        Compute the distribution of the POD estimator for all defect sizes.
 
-        return POD_PG_sample
+        The returned object provides *computeMean*, *computeVariance* and
+        *computeQuantilePerComponent*, each value corresponding to a defect size.
+        The defect sizes are computed in parallel if enabled. The kriging
+        model is given as a :class:`KrigingPredictor`.
+        """
+        # the generic Function interface can be sent to other processes
+        transformation = ot.Function(transformation)
+        if verbose:
+            message = 'Computing POD per defect'
+        else:
+            message = None
+        if self._commonRandomNumbers:
+            # the conditional simulations of all defect sizes are computed at
+            # once, then only the distributions of the POD estimator are
+            # built per defect size
+            PODMC = computePODMCGrid(self._defectSizes, detection, predictor,
+                                     transformation, distribution,
+                                     simulationSize, samplingSize,
+                                     self._samplingMethod,
+                                     self._samplingReplicates)
+            argsList = [(POD_MCPG_a, VAR_TCL, simulationSize, samplingSize,
+                         self._podDistributionMethod, self._histogramResolution)
+                         for POD_MCPG_a, VAR_TCL in PODMC]
+            results = parallelMap(computePODDistribution, argsList,
+                                  self._nJobs, self._backend, message)
+        else:
+            argsList = [(defect, detection, predictor, transformation,
+                         distribution, simulationSize, samplingSize,
+                         self._podDistributionMethod, self._histogramResolution,
+                         self._samplingMethod, self._samplingReplicates)
+                         for defect in self._defectSizes]
+            results = parallelMap(computePODDistributionPerDefect, argsList,
+                                  self._nJobs, self._backend, message)
+
+        if self._podDistributionMethod == "analytic":
+            PODPerDefect = PODMixture(simulationSize, self._defectNumber)
+            for i, (POD_MCPG_a, VAR_TCL) in enumerate(results):
+                PODPerDefect.setComponents(i, POD_MCPG_a, VAR_TCL)
+        elif self._podDistributionMethod == "histogram":
+            PODPerDefect = PODHistogram(self._defectNumber, self._histogramResolution)
+            for i, histogram in enumerate(results):
+                PODPerDefect.setMarginal(i, histogram)
+        else:
+            PODPerDefect = ot.Sample(simulationSize * samplingSize,
+                                     self._defectNumber)
+            for i, sample in enumerate(results):
+                PODPerDefect[:, i] = sample
+        return PODPerDefect
 
-    def _randomVectorSampling(self, krigingResult, sample, simulationSize, samplingSize):
+    def _getKrigingPredictor(self, krigingResult):
         """
-        Kriging Random vector perso
+        Return the vectorized predictor of the given kriging result. The last
+        one is kept so the Cholesky factor is computed once per kriging result.
         """
-        
-        # only compute the variance
-        variance = np.hstack([krigingResult.getConditionalCovariance(
-                            sample[i])[0,0] for i in range(samplingSize)])
-        pred = krigingResult.getConditionalMean(sample)
-
-        normalSample = ot.Normal().getSample(simulationSize)
-        # with numpy broadcasting
-        randomVector = np.array(normalSample)* np.sqrt(variance) + np.array(pred)
-        return randomVector
-
+        if self._krigingPredictor is None or \
+                self._krigingPredictor.getKrigingResult() is not krigingResult:
+            self._krigingPredictor = KrigingPredictor(krigingResult)
+        return self._krigingPredictor
 
     def _estimKrigingTheta(self, algoKriging, lowerBound, upperBound, size):
         """
@@ -501,3 +638,842 @@ class KrigingBase():
         delta = (np.hstack(outputSample) - y_loo)
         return 1 - np.mean(delta**2)/np.var(outputSample)
 
+
+def computePODDistributionPerDefect(seed, defect, detection, predictor,
+                                    transformation, distribution, simulationSize,
+                                    samplingSize, method, resolution,
+                                    samplingMethod="MonteCarlo", replicates=1):
+    """
+    Compute the distribution of the POD estimator for a defect size.
+
+    Depending on the method, it returns a sample of the POD estimator
+    ("sampling"), the means and variances of the mixture components ("analytic")
+    or the histogram of the POD estimator ("histogram").
+    """
+    POD_MCPG_a, VAR_TCL, mixtureSeed = computePODMCPerDefect(seed, defect,
+                            detection, predictor, transformation, distribution,
+                            simulationSize, samplingSize, samplingMethod,
+                            replicates)
+    return computePODDistribution(mixtureSeed, POD_MCPG_a, VAR_TCL,
+                                  simulationSize, samplingSize, method, resolution)
+
+def computePODDistribution(seed, POD_MCPG_a, VAR_TCL, simulationSize,
+                           samplingSize, method, resolution):
+    """
+    Compute the distribution of the POD estimator from the POD of each
+    conditional simulation and the variance of the Monte Carlo estimator.
+    """
+    if method == "analytic":
+        return POD_MCPG_a, VAR_TCL
+
+    with randomStream(seed):
+        if method == "histogram":
+            histogram = PODHistogram(1, resolution)
+            fillPODHistogram(histogram, 0, POD_MCPG_a, VAR_TCL,
+                             simulationSize * samplingSize)
+            return histogram
+        else:
+            return samplePODMixture(POD_MCPG_a, VAR_TCL,
+                                    simulationSize * samplingSize)
+
+def computePODMCPerDefect(seed, defect, detection, predictor, transformation,
+                          distribution, simulationSize, samplingSize,
+                          samplingMethod="MonteCarlo", replicates=1):
+    """
+    Compute the POD of each conditional simulation and the variance of the
+    Monte Carlo estimator for a defect size.
+
+    The seed of the next random numbers of the task is also returned, it is
+    None if the given seed is None.
+    """
+
+    dim = distribution.getDimension()
+    # create a distibution with a dirac distribution for the defect size
+    diracDist = [ot.Dirac(defect)]
+    diracDist += [distribution.getMarginal(i+1) for i in range(dim-1)]
+    distribution = ot.ComposedDistribution(diracDist)
+
+    with randomStream(seed):
+        # create a sample for the Monte Carlo simulation and confidence interval
+        MC_sample = drawSample(distribution, samplingSize, samplingMethod,
+                               replicates)
+        normalSample = ot.Normal().getSample(simulationSize)
+        if seed is None:
+            nextSeed = None
+        else:
+            nextSeed = int(ot.RandomGenerator.IntegerGenerate(1, 2**31 - 1)[0])
+    # compute the POD for all simulation size without building the
+    # simulationSize x samplingSize matrix of randomVectorSampling
+    MC_sample = transformation(MC_sample)
+    variance = predictor.computeVariance(MC_sample)
+    mean = predictor.computeMean(MC_sample)
+    POD_MCPG_a = computePODFromMoments(mean, variance, normalSample, detection)
+    # compute the variance of the MC simulation
+    VAR_TCL = computePODVariance(POD_MCPG_a, mean, variance, normalSample,
+                                 detection, samplingMethod, replicates)
+    return POD_MCPG_a, VAR_TCL, nextSeed
+
+def computePODMCGrid(defectSizes, detection, predictor, transformation,
+                     distribution, simulationSize, samplingSize,
+                     samplingMethod="MonteCarlo", replicates=1):
+    """
+    Compute the POD of each conditional simulation and the variance of the
+    Monte Carlo estimator for all defect sizes with common random numbers.
+
+    The same sample of the other inputs and the same normal variables are used
+    for all defect sizes, the kriging model is evaluated on the grid of the
+    defect sizes and the sample at once. The normalization of the inputs is
+    computed marginally.
+    """
+    defectSizes = np.ravel(defectSizes)
+    dim = distribution.getDimension()
+    # create a sample for the Monte Carlo simulation and confidence interval
+    sample = np.array(drawSample(distribution.getMarginal(list(range(1, dim))),
+                                 samplingSize, samplingMethod, replicates))
+    normalSample = ot.Normal().getSample(simulationSize)
+
+    # normalized defect sizes and sample
+    defectsNormed = np.array(transformation(np.hstack([defectSizes[:, None],
+                    np.repeat(sample[:1], defectSizes.size, axis=0)])))[:, 0]
+    sampleNormed = np.array(transformation(np.hstack([
+                    np.repeat(defectSizes[:1], samplingSize)[:, None], sample])))[:, 1:]
+    mean, variance = predictor.computeMeanVarianceGrid(defectsNormed, sampleNormed)
+
+    PODMC = []
+    for i in range(defectSizes.size):
+        POD_MCPG_a = computePODFromMoments(mean[:, i], variance[:, i],
+                                           normalSample, detection)
+        VAR_TCL = computePODVariance(POD_MCPG_a, mean[:, i], variance[:, i],
+                                     normalSample, detection, samplingMethod,
+                                     replicates)
+        PODMC.append((POD_MCPG_a, VAR_TCL))
+    return PODMC
+
+def computePODVariance(POD_MCPG_a, mean, variance, normalSample, detection,
+                       samplingMethod, replicates):
+    """
+    Compute the variance of the Monte Carlo estimator of the POD of each
+    conditional simulation.
+
+    With the "MonteCarlo" sampling method, the variance is given by the TCL.
+    Otherwise the POD of the conditional simulations is computed for each
+    replicate and the variance of the estimator is the variance of the
+    replicates divided by their number.
+    """
+    if samplingMethod == "MonteCarlo":
+        return np.array(POD_MCPG_a)*(1-np.array(POD_MCPG_a)) / mean.shape[0]
+    PODReplicates = [computePODFromMoments(mean[indices], variance[indices],
+                                           normalSample, detection)
+                     for indices in splitReplicates(mean.shape[0], replicates)]
+    return np.var(PODReplicates, axis=0, ddof=1) / replicates
+
+def computePODFromMoments(mean, variance, normalSample, detection):
+    """
+    Compute the POD of the conditional simulations given the kriging mean and
+    variance of the Monte Carlo sample.
+
+    The simulated signal of the point j is greater than the detection if the
+    normal variable is greater than the threshold (detection - mean_j) / std_j.
+    The thresholds are sorted once and the number of thresholds lower than
+    each normal variable is given by a binary search.
+    """
+    # the points with a null variance are detected or not for all simulations
+    positive = variance > 0
+    constant = np.sum((variance == 0) & (mean > detection))
+    threshold = np.sort((detection - mean[positive]) / np.sqrt(variance[positive]))
+    count = np.searchsorted(threshold, np.ravel(normalSample), side='left')
+    return (count + constant) / float(mean.shape[0])
+
+def randomVectorSampling(predictor, sample, normalSample):
+    """
+    Kriging Random vector perso
+    """
+
+    # only compute the variance, for the whole sample at once
+    variance = predictor.computeVariance(sample)
+    pred = predictor.computeMean(sample)
+
+    # with numpy broadcasting
+    randomVector = np.array(normalSample)* np.sqrt(variance) + pred
+    return randomVector
+
+def samplePODMixture(POD_MCPG_a, VAR_TCL, size):
+    """
+    Sample the mixture of the POD estimator distributions.
+    """
+    POD_PG_alea = buildPODMixture(POD_MCPG_a, VAR_TCL)
+    # get a sample of these distributions
+    POD_PG_sample = POD_PG_alea.getSample(size)
+
+    return POD_PG_sample
+
+def fillPODHistogram(histogram, index, POD_MCPG_a, VAR_TCL, size, chunkSize=100000):
+    """
+    Sample the mixture of the POD estimator distributions by chunks and
+    accumulate the values in the histogram of the given defect index.
+    """
+    std = np.sqrt(VAR_TCL)
+    histogram.setRange(index, np.min(POD_MCPG_a - 10 * std),
+                              np.max(POD_MCPG_a + 10 * std))
+    POD_PG_alea = buildPODMixture(POD_MCPG_a, VAR_TCL)
+    for start in range(0, size, chunkSize):
+        histogram.add(index, POD_PG_alea.getSample(min(chunkSize, size - start)))
+
+def buildPODMixture(POD_MCPG_a, VAR_TCL):
+    """
+    Build the mixture of the POD estimator distributions.
+    """
+    # Create distribution of the POD estimator for all simulation 
+    POD_PG_dist = []
+    for i in range(POD_MCPG_a.shape[0]):
+        if VAR_TCL[i] > 0:
+            POD_PG_dist += [ot.Normal(POD_MCPG_a[i],np.sqrt(VAR_TCL[i]))]
+        else:
+            if POD_MCPG_a[i] < 1:
+                POD_PG_dist += [ot.Dirac([0.])]
+            else:
+                POD_PG_dist += [ot.Dirac([1.])]
+    return ot.Mixture(POD_PG_dist)
+
+
+def computeCriterion(predictor, sample, candidates, detection, samplingSize,
+                     currentPOD, chunkSize=1000000, grid=None):
+    """
+    Compute the enrichment criterion of all candidate points in closed form.
+
+    The sample gathers the Monte Carlo points of all defect sizes, each block of
+    samplingSize points corresponding to a defect size. The signal of a
+    candidate being set to the current prediction, the kriging mean is not
+    modified by the candidate and the kriging variance is reduced by
+    c(x, x_c)^2 / s^2(x_c), with c the kriging covariance. The mean and
+    variance of the POD estimator are then computed from the mean and the
+    updated variance, the conditional simulations being obtained with a common
+    normal random variable as in *randomVectorSampling*. The bias is computed
+    with respect to currentPOD, the POD of each defect size at the previous
+    step.
+
+    The candidates are processed by chunks such that the number of computed
+    values in one chunk is lower than chunkSize. The whitened cross
+    covariances of the sample are computed once for all chunks.
+
+    If grid is given as (defects, points), the sample is made of all
+    combinations of the defect sizes and of the points and its mean and
+    variance are computed with *computeMeanVarianceGrid*.
+    """
+    if grid is None:
+        mean = predictor.computeMean(sample)
+        variance = predictor.computeVariance(sample)
+    else:
+        mean, variance = predictor.computeMeanVarianceGrid(*grid)
+        mean = mean.T.ravel()
+        variance = variance.T.ravel()
+    varianceCandidate = predictor.computeVariance(candidates)
+    defectNumber = mean.shape[0] // samplingSize
+    currentPOD = np.ravel(currentPOD)
+    sample = ot.Sample(np.atleast_2d(sample))
+    sampleFactors = predictor._computeWhitenedCovariance(sample)
+    # number of couples of simulated points whose maximum threshold has a given
+    # rank, used to compute the second order moment of the POD estimator
+    weights = (2 * np.arange(samplingSize) + 1.) / samplingSize**2
+
+    candidateNumber = candidates.getSize()
+    step = max(1, chunkSize // mean.shape[0])
+    criterion = np.zeros(candidateNumber)
+    for start in range(0, candidateNumber, step):
+        stop = min(start + step, candidateNumber)
+        covariance = predictor._computeCovariance(sample, sampleFactors,
+                                                  candidates[start:stop])
+        # variance reduction due to the candidates
+        reduction = np.zeros_like(covariance)
+        positive = varianceCandidate[start:stop] > 0
+        reduction[:, positive] = covariance[:, positive]**2 / \
+                                 varianceCandidate[start:stop][positive]
+        std = np.sqrt(np.maximum(variance[:, None] - reduction, 0.))
+        # the simulated signal is greater than the detection if the normal
+        # variable is greater than the threshold
+        with np.errstate(divide='ignore', invalid='ignore'):
+            threshold = (detection - mean[:, None]) / std
+        threshold[std == 0] = np.where(mean > detection, -np.inf,
+                                       np.inf)[np.nonzero(std == 0)[0]]
+        threshold = np.sort(np.reshape(threshold,
+                            (defectNumber, samplingSize, stop - start)), axis=1)
+        probability = ndtr(-threshold)
+        # first and second order moments of the POD over the simulations
+        meanPOD = np.mean(probability, axis=1)
+        moment2 = np.sum(probability * weights[None, :, None], axis=1)
+        # variance over the simulations and of the Monte Carlo estimator
+        varPOD = moment2 - meanPOD**2 + (meanPOD - moment2) / samplingSize
+        crit = varPOD + (meanPOD - currentPOD[:, None])**2
+        criterion[start:stop] = np.sqrt(np.mean(crit, axis=0))
+    return criterion
+
+
+class KrigingPredictor(object):
+    """
+    Vectorized kriging predictor computing the conditional mean and marginal
+    variance of a whole sample at once.
+
+    Parameters
+    ----------
+    krigingResult : :py:class:`openturns.KrigingResult`
+        The kriging result. The points given to the methods must be expressed
+        in the same (normalized) space as its input sample.
+
+    Notes
+    -----
+    The Cholesky factor of the covariance matrix of the training points and
+    the QR decomposition of the whitened trend matrix are computed once. The
+    variance of all points is then obtained with triangular solves and matrix
+    products instead of one *getConditionalCovariance* call per point.
+
+    The method *augment* returns the predictor of the kriging model where a
+    point is added to the training sample, with the same covariance model.
+    The factorizations are updated in O(n^2) instead of being recomputed.
+    """
+
+    def __init__(self, krigingResult):
+        self._krigingResult = krigingResult
+        self._covarianceModel = krigingResult.getCovarianceModel()
+        self._basis = krigingResult.getBasisCollection()[0]
+        self._inputSample = np.array(krigingResult.getInputSample())
+        # the mean is computed by OpenTURNS until a point is added
+        self._augmented = False
+
+        # factorize the covariance matrix of the training points
+        K = np.array(self._covarianceModel.discretize(self._inputSample))
+        self._choleskyFactor = cholesky(K, lower=True)
+
+        # QR decomposition of the whitened trend matrix augmented with the
+        # whitened output : it gives the R factor and the trend coefficients
+        F = self._computeTrendMatrix(self._inputSample)
+        self._phi = solve_triangular(self._choleskyFactor, F, lower=True)
+        self._whitenedOutput = solve_triangular(self._choleskyFactor,
+                        np.hstack(krigingResult.getOutputSample()), lower=True)
+        self._updateTrend(qr(np.column_stack((self._phi, self._whitenedOutput)),
+                             mode='r')[0])
+
+        # prior variance k(x, x), constant for a stationary covariance model
+        self._priorVariance = K[0, 0]
+
+    def getKrigingResult(self):
+        """
+        Accessor to the kriging result.
+
+        Returns
+        -------
+        result : :py:class:`openturns.KrigingResult`
+            The kriging result the predictor has been built from.
+        """
+        return self._krigingResult
+
+    def augment(self, point, value):
+        """
+        Add a point to the training sample.
+
+        Parameters
+        ----------
+        point : sequence of float
+            The new training point, in the normalized space.
+        value : float
+            The output value of the new training point.
+
+        Returns
+        -------
+        predictor : :class:`KrigingPredictor`
+            The predictor of the kriging model with the augmented training
+            sample and the same covariance model.
+        """
+        point = np.atleast_2d(point)
+        predictor = copy(self)
+        predictor._augmented = True
+
+        # new row of the Cholesky factor
+        r = np.array(self._covarianceModel.computeCrossCovariance(
+                                                self._inputSample, point))[:, 0]
+        l = solve_triangular(self._choleskyFactor, r, lower=True)
+        kxx = np.array(self._covarianceModel.discretize(point))[0, 0]
+        # avoid a null pivot if the point is already in the training sample
+        d = np.sqrt(max(kxx - np.dot(l, l), 1e-12 * kxx))
+        size = l.shape[0]
+        L = np.zeros((size + 1, size + 1))
+        L[:size, :size] = self._choleskyFactor
+        L[size, :size] = l
+        L[size, size] = d
+        predictor._choleskyFactor = L
+        predictor._inputSample = np.vstack((self._inputSample, point))
+
+        # new rows of the whitened trend matrix and output
+        phiRow = (self._computeTrendMatrix(point)[0] - np.dot(l, self._phi)) / d
+        outputRow = (value - np.dot(l, self._whitenedOutput)) / d
+        predictor._phi = np.vstack((self._phi, phiRow))
+        predictor._whitenedOutput = np.append(self._whitenedOutput, outputRow)
+        predictor._updateTrend(qr(np.vstack((self._RAugmented,
+                                             np.append(phiRow, outputRow))),
+                                  mode='r')[0])
+        return predictor
+
+    def computeMean(self, sample):
+        """
+        Compute the conditional mean.
+
+        Parameters
+        ----------
+        sample : 2-d sequence of float
+            The points where the mean is computed.
+
+        Returns
+        -------
+        mean : 1-d array of float
+            The kriging mean of each point.
+        """
+        if not self._augmented:
+            sample = ot.Sample(np.atleast_2d(sample))
+            return np.array(self._krigingResult.getConditionalMean(sample))[:, 0]
+        sample = np.atleast_2d(sample)
+        r = np.array(self._covarianceModel.computeCrossCovariance(
+                                                    self._inputSample, sample))
+        rho = solve_triangular(self._choleskyFactor, r, lower=True)
+        return np.dot(self._computeTrendMatrix(sample), self._trendCoefficients) + \
+               np.dot(self._whitenedResiduals, rho)
+
+    def computeVariance(self, sample):
+        """
+        Compute the conditional marginal variance.
+
+        Parameters
+        ----------
+        sample : 2-d sequence of float
+            The points where the variance is computed.
+
+        Returns
+        -------
+        variance : 1-d array of float
+            The kriging variance of each point, negative values due to round-off
+            errors are set to zero.
+        """
+        sample = ot.Sample(np.atleast_2d(sample))
+        rho, v = self._computeWhitenedCovariance(sample)
+        if self._covarianceModel.isStationary():
+            priorVariance = self._priorVariance
+        else:
+            priorVariance = np.array([self._covarianceModel.computeAsScalar(x, x)
+                                      for x in sample])
+        variance = priorVariance - np.sum(rho**2, axis=0) + np.sum(v**2, axis=0)
+        return np.maximum(variance, 0.)
+
+    def computeMeanGrid(self, defects, sample):
+        """
+        Compute the conditional mean of all combinations of the defect sizes
+        and of the points of the sample.
+
+        Parameters
+        ----------
+        defects : 1-d sequence of float
+            The defect sizes, first input of the kriging model, in the
+            normalized space.
+        sample : 2-d sequence of float
+            The values of the other inputs, in the normalized space.
+
+        Returns
+        -------
+        mean : 2-d array of float
+            The kriging mean of each combination, the rows corresponding with
+            the points of the sample and the columns with the defect sizes.
+
+        Notes
+        -----
+        See *computeMeanVarianceGrid*.
+        """
+        grid, trend, covarianceFactors = self._computeGridFactors(defects, sample)
+        if covarianceFactors is None:
+            return self.computeMean(grid).reshape(trend.shape[:2])
+        return self._computeMeanGrid(trend, *covarianceFactors)
+
+    def computeMeanVarianceGrid(self, defects, sample):
+        """
+        Compute the conditional mean and marginal variance of all combinations
+        of the defect sizes and of the points of the sample.
+
+        Parameters
+        ----------
+        defects : 1-d sequence of float
+            The defect sizes, first input of the kriging model, in the
+            normalized space.
+        sample : 2-d sequence of float
+            The values of the other inputs, in the normalized space.
+
+        Returns
+        -------
+        mean : 2-d array of float
+            The kriging mean of each combination, the rows corresponding with
+            the points of the sample and the columns with the defect sizes.
+        variance : 2-d array of float
+            The kriging variance of each combination, negative values due to
+            round-off errors are set to zero.
+
+        Notes
+        -----
+        With a squared exponential or an absolute exponential covariance model,
+        the covariance is the product of a covariance of the defect size and of
+        a covariance of the other inputs. The cross covariances with the
+        training points are then computed once for the defect sizes and once
+        for the sample, and combined with matrix products.
+        """
+        grid, trend, covarianceFactors = self._computeGridFactors(defects, sample)
+        if covarianceFactors is None:
+            return (self.computeMean(grid).reshape(trend.shape[:2]),
+                    self.computeVariance(grid).reshape(trend.shape[:2]))
+        rDefect, rOther = covarianceFactors
+        mean = self._computeMeanGrid(trend, rDefect, rOther)
+        variance = np.zeros(trend.shape[:2])
+        for j in range(rDefect.shape[1]):
+            rho = solve_triangular(self._choleskyFactor,
+                                   rDefect[:, j:j+1] * rOther, lower=True)
+            u = np.dot(self._phi.T, rho) - trend[:, j, :].T
+            v = solve_triangular(self._R, u, trans='T', lower=False)
+            variance[:, j] = self._priorVariance - np.sum(rho**2, axis=0) + \
+                             np.sum(v**2, axis=0)
+        return mean, np.maximum(variance, 0.)
+
+    def computeCovariance(self, sample, points):
+        """
+        Compute the conditional covariance between two samples.
+
+        Parameters
+        ----------
+        sample : 2-d sequence of float
+            The first sample of size n.
+        points : 2-d sequence of float
+            The second sample of size m.
+
+        Returns
+        -------
+        covariance : 2-d array of float
+            The n x m matrix of the kriging covariances.
+        """
+        sample = ot.Sample(np.atleast_2d(sample))
+        return self._computeCovariance(sample,
+                            self._computeWhitenedCovariance(sample), points)
+
+    def _computeCovariance(self, sample, sampleFactors, points):
+        """
+        Compute the conditional covariance between two samples, the whitened
+        cross covariance of the first sample being given by
+        *_computeWhitenedCovariance*.
+        """
+        rhoSample, vSample = sampleFactors
+        points = ot.Sample(np.atleast_2d(points))
+        rhoPoints, vPoints = self._computeWhitenedCovariance(points)
+        prior = np.array(self._covarianceModel.computeCrossCovariance(sample,
+                                                                      points))
+        return prior - np.dot(rhoSample.T, rhoPoints) + np.dot(vSample.T, vPoints)
+
+    def _computeWhitenedCovariance(self, sample):
+        """
+        Compute the whitened cross covariance between the training points and
+        the sample and the correction due to the estimation of the trend.
+        """
+        r = np.array(self._covarianceModel.computeCrossCovariance(
+                                                    self._inputSample, sample))
+        rho = solve_triangular(self._choleskyFactor, r, lower=True)
+        u = np.dot(self._phi.T, rho) - self._computeTrendMatrix(sample).T
+        v = solve_triangular(self._R, u, trans='T', lower=False)
+        return rho, v
+
+    def _computeGridFactors(self, defects, sample):
+        """
+        Build the grid of all combinations of the defect sizes and of the
+        sample, the defect sizes varying first, and its trend matrix. If the
+        covariance model is the product of a covariance of the defect size and
+        of a covariance of the other inputs, the cross covariances of the
+        training points with the defect sizes and with the sample are also
+        returned, otherwise None.
+        """
+        defects = np.ravel(defects)
+        sample = np.atleast_2d(sample)
+        grid = np.hstack([np.tile(defects, sample.shape[0])[:, None],
+                          sample.repeat(defects.size, axis=0)])
+        trend = self._computeTrendMatrix(grid).reshape(sample.shape[0],
+                                                       defects.size, -1)
+        name = self._covarianceModel.getImplementation().getClassName()
+        if name not in ['SquaredExponential', 'AbsoluteExponential'] or \
+           self._inputSample.shape[1] < 2:
+            return grid, trend, None
+        scale = list(self._covarianceModel.getScale())
+        amplitude = list(self._covarianceModel.getAmplitude())
+        defectModel = getattr(ot, name)(scale[:1], [1.])
+        otherModel = getattr(ot, name)(scale[1:], amplitude)
+        rDefect = np.array(defectModel.computeCrossCovariance(
+                                self._inputSample[:, :1], defects[:, None]))
+        rOther = np.array(otherModel.computeCrossCovariance(
+                                self._inputSample[:, 1:], sample))
+        return grid, trend, (rDefect, rOther)
+
+    def _computeMeanGrid(self, trend, rDefect, rOther):
+        """
+        Compute the mean of the grid as the trend plus the kriging weights
+        times the cross covariance, which is the product of the cross
+        covariances with the defect sizes and with the sample.
+        """
+        weights = solve_triangular(self._choleskyFactor, self._whitenedResiduals,
+                                   trans='T', lower=True)
+        return np.dot(trend, self._trendCoefficients) + \
+               np.dot(rOther.T, weights[:, None] * rDefect)
+
+    def _updateTrend(self, RAugmented):
+        """
+        Update the generalized least squares estimate of the trend given the
+        R factor of the whitened trend matrix augmented with the whitened output.
+        """
+        p = self._phi.shape[1]
+        self._RAugmented = RAugmented[:p + 1, :]
+        self._R = self._RAugmented[:p, :p]
+        self._trendCoefficients = solve_triangular(self._R, self._RAugmented[:p, p])
+        self._whitenedResiduals = self._whitenedOutput - \
+                                  np.dot(self._phi, self._trendCoefficients)
+
+    def _computeTrendMatrix(self, sample):
+        """
+        Evaluate all basis functions on the sample.
+        """
+        sample = ot.Sample(np.atleast_2d(sample))
+        return np.hstack([np.array(self._basis.build(i)(sample))
+                          for i in range(self._basis.getSize())])
+
+
+class PODMixture(object):
+    """
+    Closed form distribution of the POD estimator for several defect sizes.
+
+    Parameters
+    ----------
+    simulationSize : int
+        The number of components of the mixture for each defect size.
+    defectNumber : int
+        The number of defect sizes.
+
+    Notes
+    -----
+    For each defect size, the POD estimator follows an equally weighted
+    mixture of Normal distributions whose means are the POD of the conditional
+    simulations and whose variances are given by the TCL. A null variance
+    corresponds with a Dirac distribution. The mean and variance are computed
+    exactly and the quantiles are found by root-finding on the mixture CDF,
+    so that the mixture never needs to be sampled.
+    """
+
+    def __init__(self, simulationSize, defectNumber):
+        self._means = np.zeros((simulationSize, defectNumber))
+        self._variances = np.zeros((simulationSize, defectNumber))
+
+    def setComponents(self, index, means, variances):
+        """
+        Accessor to the mixture components of a defect size.
+
+        Parameters
+        ----------
+        index : int
+            The index of the defect size.
+        means : 1-d sequence of float
+            The means of the mixture components.
+        variances : 1-d sequence of float
+            The variances of the mixture components.
+        """
+        self._means[:, index] = means
+        self._variances[:, index] = variances
+
+    def getDimension(self):
+        """
+        Accessor to the number of defect sizes.
+        """
+        return self._means.shape[1]
+
+    def computeMean(self):
+        """
+        Compute the mean of the POD estimator for each defect size.
+
+        Returns
+        -------
+        mean : :py:class:`openturns.Point`
+            The mean value for each defect size.
+        """
+        return ot.Point(np.mean(self._means, axis=0))
+
+    def computeVariance(self):
+        """
+        Compute the variance of the POD estimator for each defect size.
+
+        Returns
+        -------
+        variance : :py:class:`openturns.Point`
+            The variance value for each defect size.
+        """
+        secondMoment = np.mean(self._variances + self._means**2, axis=0)
+        return ot.Point(secondMoment - np.mean(self._means, axis=0)**2)
+
+    def computeQuantilePerComponent(self, prob):
+        """
+        Compute the quantile of the POD estimator for each defect size.
+
+        Parameters
+        ----------
+        prob : float
+            The probability level of the quantile.
+
+        Returns
+        -------
+        quantile : :py:class:`openturns.Point`
+            The quantile value for each defect size.
+        """
+        quantile = ot.Point(self.getDimension())
+        for i in range(self.getDimension()):
+            means = self._means[:, i]
+            stds = np.sqrt(self._variances[:, i])
+            # bounds where the CDF is 0 and 1 up to round-off errors
+            lower = np.min(means - 10 * stds) - 1e-10
+            upper = np.max(means + 10 * stds) + 1e-10
+            quantile[i] = brentq(lambda x: self._computeCDF(x, means, stds) - prob,
+                                 lower, upper, xtol=1e-10)
+        return quantile
+
+    def _computeCDF(self, x, means, stds):
+        """
+        CDF of the mixture for one defect size.
+        """
+        cdf = np.where(stds > 0, ndtr((x - means) / np.where(stds > 0, stds, 1.)),
+                       x >= means)
+        return np.mean(cdf)
+
+
+class PODHistogram(object):
+    """
+    Histogram of the POD estimator samples for several defect sizes.
+
+    Parameters
+    ----------
+    defectNumber : int
+        The number of defect sizes.
+    resolution : int
+        The number of bins for each defect size.
+
+    Notes
+    -----
+    The samples of the POD estimator are added by chunks, only the bin counts
+    and the sums needed for the mean and variance are stored. The memory is
+    thus O(defectNumber * resolution) whatever the number of added values.
+    The quantiles are computed by linear interpolation of the histogram CDF.
+    """
+
+    def __init__(self, defectNumber, resolution):
+        self._resolution = resolution
+        self._edges = np.zeros((defectNumber, resolution + 1))
+        self._counts = np.zeros((defectNumber, resolution))
+        self._size = np.zeros(defectNumber)
+        self._sum = np.zeros(defectNumber)
+        self._sumSquares = np.zeros(defectNumber)
+
+    def setRange(self, index, lower, upper):
+        """
+        Accessor to the range of the histogram of a defect size.
+
+        Parameters
+        ----------
+        index : int
+            The index of the defect size.
+        lower, upper : float
+            The bounds of the histogram, values outside are put in the first
+            or last bin.
+        """
+        # avoid empty range when all values are identical
+        upper = max(upper, lower + 1e-10)
+        self._edges[index] = np.linspace(lower, upper, self._resolution + 1)
+
+    def add(self, index, sample):
+        """
+        Add values of the POD estimator for a defect size.
+
+        Parameters
+        ----------
+        index : int
+            The index of the defect size.
+        sample : 1-d sequence of float
+            The POD estimator values.
+        """
+        values = np.ravel(sample)
+        edges = self._edges[index]
+        self._counts[index] += np.histogram(np.clip(values, edges[0], edges[-1]),
+                                            bins=edges)[0]
+        self._size[index] += values.shape[0]
+        self._sum[index] += np.sum(values)
+        self._sumSquares[index] += np.sum(values**2)
+
+    def setMarginal(self, index, histogram):
+        """
+        Accessor to the histogram of a defect size.
+
+        Parameters
+        ----------
+        index : int
+            The index of the defect size.
+        histogram : :class:`PODHistogram`
+            The histogram of dimension 1 of the defect size.
+        """
+        self._edges[index] = histogram._edges[0]
+        self._counts[index] = histogram._counts[0]
+        self._size[index] = histogram._size[0]
+        self._sum[index] = histogram._sum[0]
+        self._sumSquares[index] = histogram._sumSquares[0]
+
+    def getDimension(self):
+        """
+        Accessor to the number of defect sizes.
+        """
+        return self._counts.shape[0]
+
+    def computeMean(self):
+        """
+        Compute the mean of the POD estimator for each defect size.
+
+        Returns
+        -------
+        mean : :py:class:`openturns.Point`
+            The mean value for each defect size.
+        """
+        return ot.Point(self._sum / self._size)
+
+    def computeVariance(self):
+        """
+        Compute the variance of the POD estimator for each defect size.
+
+        Returns
+        -------
+        variance : :py:class:`openturns.Point`
+            The unbiased variance value for each defect size.
+        """
+        mean = self._sum / self._size
+        return ot.Point((self._sumSquares - self._size * mean**2) / (self._size - 1))
+
+    def computeQuantilePerComponent(self, prob):
+        """
+        Compute the quantile of the POD estimator for each defect size.
+
+        Parameters
+        ----------
+        prob : float
+            The probability level of the quantile.
+
+        Returns
+        -------
+        quantile : :py:class:`openturns.Point`
+            The quantile value for each defect size.
+        """
+        quantile = ot.Point(self.getDimension())
+        for i in range(self.getDimension()):
+            cdf = np.concatenate(([0.], np.cumsum(self._counts[i]))) / self._size[i]
+            # first edge where the CDF reaches prob, then interpolate in the bin
+            j = max(np.searchsorted(cdf, prob, side='left'), 1)
+            width = cdf[j] - cdf[j-1]
+            ratio = (prob - cdf[j-1]) / width if width > 0 else 0.
+            quantile[i] = self._edges[i, j-1] + ratio * \
+                          (self._edges[i, j] - self._edges[i, j-1])
+        return quantile
@@ -4,9 +4,11 @@
 __all__ = ['DataHandling']
 
 import openturns as ot
-import math as m
 import numpy as np
-from scipy.optimize import fmin
+import hashlib
+from scipy.optimize import minimize, minimize_scalar
+from scipy.special import log_ndtr
+from scipy.integrate import quad
 from distutils.version import LooseVersion
 
 
@@ -30,45 +32,66 @@ class ReducedLogLikelihood(ot.OpenTURNSPythonFunction):
         super(ReducedLogLikelihood, self).__init__(1, 1)
         self.setInputDescription(['lambda'])
         self.setOutputDescription(['LogLikelihood'])
-        self.a_i_ = a_i
-        self.Y_i_ = Y_i
-        self.N_ = a_i.getSize()
-        self.sumLogY_i = ot.SymbolicFunction(["y"], ["log(y)"])(Y_i).computeMean()[0] * self.N_
-        
+        self.a_i_ = np.ravel(a_i)
+        self.Y_i_ = np.ravel(Y_i)
+
     def _exec(self, Lambda):
-        Y_lambda = ot.BoxCoxTransform(Lambda)(self.Y_i_)
-        algo = ot.LinearLeastSquares(self.a_i_, Y_lambda)
-        algo.run()
-        beta0 = algo.getConstant()[0]
-        beta1 = algo.getLinear()[0, 0]
-        sigma2 = (self.N_ - 1.0) / (self.N_ - 2.0) * (Y_lambda - (self.a_i_ * [beta1] + [beta0])).computeVariance()[0]
-        return [-0.5 * self.N_ * m.log(sigma2) + (Lambda[0] - 1) * self.sumLogY_i]
+        return computeReducedLogLikelihood(self.a_i_, self.Y_i_, Lambda)
+
+    def _exec_sample(self, Lambda):
+        return np.vstack(computeReducedLogLikelihood(self.a_i_, self.Y_i_,
+                                                     np.ravel(Lambda)))
+
+######### computeReducedLogLikelihood #########
+# This function computes the reduced log likelihood for several values of
+# lambda at once. The transformed signals are stored in a matrix with one row
+# per lambda and the least squares estimates of the linear regression model
+# are computed in closed form for all rows.
+def computeReducedLogLikelihood(a_i, Y_i, lambdas):
+    a_i = np.ravel(a_i)
+    logY_i = np.log(np.ravel(Y_i))
+    lambdas = np.atleast_1d(np.asarray(lambdas, dtype=float))
+    N = a_i.size
+    # Box Cox transformation, expm1 keeps the accuracy for lambda near 0
+    nonZero = lambdas != 0
+    Y_lambda = np.tile(logY_i, (lambdas.size, 1))
+    Y_lambda[nonZero] = np.expm1(lambdas[nonZero, np.newaxis] * logY_i) / \
+                        lambdas[nonZero, np.newaxis]
+    aCentered = a_i - a_i.mean()
+    Y_lambdaCentered = Y_lambda - Y_lambda.mean(axis=1, keepdims=True)
+    beta1 = np.dot(Y_lambdaCentered, aCentered) / np.dot(aCentered, aCentered)
+    residuals = Y_lambdaCentered - beta1[:, np.newaxis] * aCentered
+    sigma2 = np.sum(residuals**2, axis=1) / (N - 2.0)
+    return -0.5 * N * np.log(sigma2) + (lambdas - 1) * np.sum(logY_i)
 
 ######### LinearBoxCoxFactory #########
 # This class build the Box Cox optimal transformation corresponding with
 # Gaussian residuals once removes the linear trend.
 # Given data (a_i, Y_i), find the quadruplet (\lambda, \sigma, \beta_0, \beta_1
 # that maximize the log-likelihood function defined by ReducedLogLikelihood.
+# The log-likelihood is evaluated on a grid of lambda, then the maximum is
+# refined between the neighbours of the best grid point.
 class LinearBoxCoxFactory:
 
     def __init__(self, lambdaMin = -3, lambdaMax = 3):
         self.lambdaMin_ = lambdaMin
         self.lambdaMax_ = lambdaMax
-        ot.Log.Show(ot.Log.NONE)
         
     def build(self, dataX, dataY):
-        logLikelihood = ot.Function(ReducedLogLikelihood(dataX, dataY))
         xlb = np.linspace(self.lambdaMin_,self.lambdaMax_,num=500)
-        lambdax = [logLikelihood([x])[0] for x in xlb]
-        algo = ot.TNC(logLikelihood)
-        algo.setStartingPoint([xlb[np.array(lambdax).argmax()]])
-        algo.setBoundConstraints(ot.Interval(self.lambdaMin_, self.lambdaMax_))
-        algo.setOptimizationProblem(ot.BoundConstrainedAlgorithmImplementationResult.MAXIMIZATION)
-        algo.run()
-        optimalLambda = algo.getResult().getOptimizer()[0]
+        lambdax = computeReducedLogLikelihood(dataX, dataY, xlb)
+        iMax = lambdax.argmax()
+        bounds = (xlb[max(iMax - 1, 0)], xlb[min(iMax + 1, xlb.size - 1)])
+        func = lambda x: -computeReducedLogLikelihood(dataX, dataY, x)[0]
+        res = minimize_scalar(func, bounds=bounds, method='bounded',
+                              options={'xatol':1e-10})
+        optimalLambda = res.x
+        if -res.fun < lambdax[iMax]:
+            optimalLambda = xlb[iMax]
 
         # graph
-        optimalLogLikelihood = algo.getResult().getOptimalValue()
+        logLikelihood = ot.Function(ReducedLogLikelihood(dataX, dataY))
+        optimalLogLikelihood = logLikelihood([optimalLambda])[0]
         graph = logLikelihood.draw(0.01 * optimalLambda, 10.0 * optimalLambda)
         c = ot.Cloud([[optimalLambda, optimalLogLikelihood]])
         c.setColor("red")
@@ -79,18 +102,40 @@ class LinearBoxCoxFactory:
 
 ######### computeBoxCox #########
 # This function applies the Box Cox transformation on the data.
-def computeBoxCox(factors, valuesInit, shift):
-    # if no affine trend is considered
-    graph = ot.Graph()
-    myBoxCoxFactory = ot.BoxCoxFactory()
-    myModelTransform = myBoxCoxFactory.build(valuesInit, [shift], graph)
-    lambdaBoxCox = myModelTransform.getLambda()[0]
-
-    # if an affine trend is considered (more computing time required)
-    # works only in 1D
-    # myBoxCoxFactory = LinearBoxCoxFactory()
-    # myModelTransform, graph = myBoxCoxFactory.build(factors, valuesInit)
-    # lambdaBoxCox = myModelTransform.getLambda()[0]
+# If linearTrend is True, the Box Cox parameter is computed once the linear
+# trend versus the factors is removed, the factors must be of dimension 1.
+# If cache is True, the result is stored and given back for the same data and
+# shift without running the optimization again.
+_boxCoxCache = {}
+_boxCoxCacheSize = 100
+def computeBoxCox(factors, valuesInit, shift, linearTrend=False, cache=False):
+    if cache:
+        hashData = hashlib.sha1(np.ascontiguousarray(valuesInit,
+                                                     dtype=float).tobytes())
+        if linearTrend:
+            hashData.update(np.ascontiguousarray(factors, dtype=float).tobytes())
+        key = (hashData.hexdigest(), float(shift), linearTrend)
+        if key in _boxCoxCache:
+            return _boxCoxCache[key]
+
+    if not linearTrend:
+        # if no affine trend is considered
+        graph = ot.Graph()
+        myBoxCoxFactory = ot.BoxCoxFactory()
+        myModelTransform = myBoxCoxFactory.build(valuesInit, [shift], graph)
+        lambdaBoxCox = myModelTransform.getLambda()[0]
+    else:
+        # if an affine trend is considered, works only in 1D
+        myBoxCoxFactory = LinearBoxCoxFactory()
+        myModelTransform, graph = myBoxCoxFactory.build(factors,
+                                            np.array(valuesInit) + shift)
+        lambdaBoxCox = myModelTransform.getLambda()[0]
+
+    if cache:
+        # the oldest result is removed when the cache is full
+        if len(_boxCoxCache) >= _boxCoxCacheSize:
+            del _boxCoxCache[next(iter(_boxCoxCache))]
+        _boxCoxCache[key] = lambdaBoxCox, graph
     return lambdaBoxCox, graph
 
 
@@ -137,26 +182,49 @@ def computeBreuschPaganTest(x, residuals):
 
 ######### computeHarrisonMcCabeTest #########
 # This function tests if the residuals are homoskedastics
-def computeHarrisonMcCabeTest(residuals, breakRatio=0.5, simulationSize=1000):
+def computeHarrisonMcCabeTest(residuals, breakRatio=0.5, simulationSize=1000,
+                              method="simulation"):
     # Parameters:
     # breakPoint : ratio of point to define the break, must be 0 < breakRatio< 1
+    # method : "simulation" : the pvalue is computed by simulation
+    #          "exact" : the pvalue is computed with the Imhof formula
     nx = residuals.getSize()
     residuals = np.array(residuals)
     breakpoint = int(np.floor(breakRatio * nx))
     # statistic Harrison McCabe
     hmc = np.sum(residuals[:breakpoint]**2) /np.sum(residuals**2)
 
-    # pvalue computed by simulation
-    stat = np.zeros(simulationSize)
-    normalDist = ot.Normal()
-    for i in range(simulationSize):
-        xSampleNor = normalDist.getSample(nx)
-        xstand = np.array((xSampleNor - xSampleNor.computeMean()[0]) / \
-                  xSampleNor.computeStandardDeviation()[0, 0])
-        stat[i] = np.sum(xstand[:breakpoint]**2) / np.sum(xstand**2)
+    if method == "exact":
+        return _computeHarrisonMcCabeCDF(hmc, nx, breakpoint)
+    elif method != "simulation":
+        raise ValueError("The method must be 'simulation' or 'exact'.")
+
+    # pvalue computed by simulation, all normal samples are drawn at once. The
+    # statistic does not depend on the scale so the samples are only centered.
+    xSampleNor = np.reshape(ot.Normal().getSample(simulationSize * nx),
+                            (simulationSize, nx))
+    xcentered = xSampleNor - xSampleNor.mean(axis=1, keepdims=True)
+    stat = np.sum(xcentered[:, :breakpoint]**2, axis=1) / \
+           np.sum(xcentered**2, axis=1)
 
     return np.mean(stat <= hmc)
 
+def _computeHarrisonMcCabeCDF(hmc, nx, breakpoint):
+    # For centered normal samples, P(stat <= hmc) = P(Q <= 0) where Q is the
+    # quadratic form sum(lambda_j chi2(m_j)) with the eigenvalues
+    #  - 1 - hmc of multiplicity breakpoint - 1 (within the first part),
+    #  - -hmc of multiplicity nx - breakpoint - 1 (within the second part),
+    #  - 1 - hmc - breakpoint / nx of multiplicity 1 (between the parts).
+    # The CDF of Q is computed with the Imhof formula.
+    eigenValues = np.array([1. - hmc, -hmc, 1. - hmc - float(breakpoint) / nx])
+    multiplicity = np.array([breakpoint - 1, nx - breakpoint - 1, 1])
+    def integrand(u):
+        theta = 0.5 * np.sum(multiplicity * np.arctan(eigenValues * u))
+        rho = np.exp(0.25 * np.sum(multiplicity * np.log1p((eigenValues * u)**2)))
+        return np.sin(theta) / (u * rho)
+    integral = quad(integrand, 0., np.inf, limit=200)[0]
+    return min(max(0.5 - integral / np.pi, 0.), 1.)
+
 ######### computeDurbinWatsonTest #########
 # This function tests if the residuals have non autocorrelation
 def computeDurbinWatsonTest(x, residuals, hypothesis="Equal"):
@@ -273,7 +341,7 @@ class DataHandling(object):
 # This function compute the linear regression parameters with censored data
 # using the MLE function (from Berens 1988 article)
 def MLE(X, defects, defectsNoise, defectsSat, signals, noiseThres,
-        saturationThres):
+        saturationThres, gradient=False):
     '''
     Compute - log likelihood on censored data.
     Parameters:
@@ -285,28 +353,57 @@ def MLE(X, defects, defectsNoise, defectsSat, signals, noiseThres,
     signals : vector of the signals in the uncensored area
     noiseThres : noise threshold
     saturationThres : saturation threshold
+    gradient : if True, the gradient with respect to X is also returned
     '''
     b0 = X[0]
     b1 = X[1]
     s = X[2]
+    if not s > 0:
+        if gradient:
+            return np.inf, np.zeros(3)
+        return np.inf
+    defects = np.ravel(defects)
+    signals = np.ravel(signals)
+    # the thresholds are None when there are no censored data in the area
+    defectsNoise = np.ravel(defectsNoise).astype(float)
+    defectsSat = np.ravel(defectsSat).astype(float)
+    if defectsNoise.size == 0:
+        noiseThres = 0.
+    if defectsSat.size == 0:
+        saturationThres = 0.
 
     # uncensored area
+    residuals = signals - (b0 + b1 * defects)
     MLE = len(defects) * np.log(s * np.sqrt(2. * np.pi))
-    MLE += 1.0 / (2 * s**2) * np.sum((signals - (b0 + b1 * defects))**2)
+    MLE += 1.0 / (2 * s**2) * np.sum(residuals**2)
 
-    # noisy area
+    # noisy area : log of the normal CDF computed in a stable way
     Znoise = (noiseThres - (b0 + b1 * defectsNoise)) / s
-    cdfZnoise = np.array([ot.DistFunc.pNormal(Znoise[i][0]) for i in range(len(Znoise))])
-    MLE += - np.sum(np.log(cdfZnoise))
+    logCdfZnoise = log_ndtr(Znoise)
+    MLE += - np.sum(logCdfZnoise)
 
-    # saturation area
+    # saturation area : log(1 - CDF(z)) = log(CDF(-z))
     Zsat = (saturationThres - (b0 + b1 * defectsSat)) / s
-    cdfZsat = np.array([ot.DistFunc.pNormal(Zsat[i][0]) for i in range(len(Zsat))])
-    MLE += - np.sum(np.log(1. - cdfZsat))
+    logSfZsat = log_ndtr(-Zsat)
+    MLE += - np.sum(logSfZsat)
 
     if np.isnan(MLE):
         MLE = np.inf
-    return MLE
+    if not gradient:
+        return MLE
+
+    # ratios of the normal PDF by the normal CDF (or survival function)
+    logPdf = lambda z: -0.5 * z**2 - 0.5 * np.log(2. * np.pi)
+    ratioNoise = np.exp(logPdf(Znoise) - logCdfZnoise)
+    ratioSat = np.exp(logPdf(Zsat) - logSfZsat)
+
+    grad = np.zeros(3)
+    grad[0] = (- np.sum(residuals) / s + np.sum(ratioNoise) - np.sum(ratioSat)) / s
+    grad[1] = (- np.sum(residuals * defects) / s + np.sum(ratioNoise * defectsNoise)
+               - np.sum(ratioSat * defectsSat)) / s
+    grad[2] = (len(defects) - np.sum(residuals**2) / s**2 +
+               np.sum(ratioNoise * Znoise) - np.sum(ratioSat * Zsat)) / s
+    return MLE, grad
 
 def computeLinearParametersCensored(initialStartMLE, defects, defectsNoise,
                             defectsSat, signals, noiseThres, saturationThres):
@@ -333,9 +430,32 @@ def computeLinearParametersCensored(initialStartMLE, defects, defectsNoise,
         if iteration == 100:
             raise Exception('Maximum Likelihood optimization for censored '+\
                             'data : cannot find initial starting point.')
-    res = fmin(func, initialStartMLE, disp=0, full_output=1, maxiter=500)
-    if res[4] == 2:
+    # quasi Newton optimization using the analytical gradient. The logarithm
+    # of the standard deviation of the residuals is optimized so that no
+    # bound is needed.
+    def funcGradLog(y):
+        MLEValue, grad = MLE([y[0], y[1], np.exp(y[2])], defects, defectsNoise,
+                             defectsSat, signals, noiseThres, saturationThres,
+                             gradient=True)
+        grad[2] *= np.exp(y[2])
+        return MLEValue, grad
+    initialStartLog = [initialStartMLE[0], initialStartMLE[1],
+                       np.log(initialStartMLE[2])]
+    res = minimize(funcGradLog, initialStartLog, jac=True, method='BFGS',
+                   options={'maxiter':500, 'gtol':1e-6})
+    maxIterReached = res.nit >= 500
+    # the quasi Newton method may stop far from the optimum when the
+    # likelihood of the censored data is flat : the result is then polished
+    # with the Nelder Mead simplex
+    if not res.success or np.linalg.norm(funcGradLog(res.x)[1]) > 1e-4:
+        resNM = minimize(lambda y: funcGradLog(y)[0], res.x,
+                         method='Nelder-Mead', options={'maxiter':2000,
+                         'xatol':1e-8, 'fatol':1e-10})
+        maxIterReached = resNM.nit >= 2000
+        if resNM.fun <= res.fun:
+            res = resNM
+    if maxIterReached:
         ot.Log.Show(ot.Log.WARN)
         ot.Log.Warn('Maximum Likelihood optimization for censored data : '+\
                     'maximum number of iterations reached.')
-    return res[0]
+    return np.array([res.x[0], res.x[1], np.exp(res.x[2])])
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# -*- Python -*-
+
+"""
+Tools to spread independent iterations of the POD algorithms over several
+cores with reproducible random streams.
+
+usage:
+
+def task(seed, a, b):
+    with randomStream(seed):
+        x = ot.Normal().getSample(10)
+    return f(x, a, b)
+
+results = parallelMap(task, [(a1, b1), (a2, b2)], nJobs, backend)
+
+The seed of each task is drawn from the OpenTURNS random generator, so the
+results depend on the seed set by the user but neither on the number of jobs
+nor on the backend. If nJobs is None, the tasks are run in sequence with a
+seed equal to None : the random generator is then used as a single stream,
+which is the behavior of the serial algorithms.
+"""
+
+__all__ = []
+
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import openturns as ot
+from ._progress_bar import updateProgress
+
+# the OpenTURNS random generator is global : it is locked while a task is
+# drawing its random numbers with its own seed
+_randomLock = threading.Lock()
+
+@contextmanager
+def randomStream(seed=None):
+    """
+    Context where the OpenTURNS random generator is reseeded with the given
+    seed and cannot be used by another thread. Nothing is done if seed is None.
+    """
+    if seed is None:
+        yield
+    else:
+        with _randomLock:
+            ot.RandomGenerator.SetSeed(int(seed))
+            yield
+
+def parallelMap(function, argsList, nJobs=None, backend="process", message=None):
+    """
+    Apply the function on each tuple of arguments, the seed of the task being
+    given as first argument, and return the results in the same order. A
+    progress bar is shown if a message is given.
+    """
+    argsList = list(argsList)
+    nTasks = len(argsList)
+    if nJobs is None:
+        seeds = [None] * nTasks
+    else:
+        seeds = [int(seed) for seed in
+                 ot.RandomGenerator.IntegerGenerate(nTasks, 2**31 - 1)]
+        # the state after the call must not depend on the execution order
+        state = ot.RandomGenerator.GetState()
+
+    if nJobs is None or nJobs == 1:
+        executor = None
+        iterResults = (function(seed, *args) for seed, args in zip(seeds, argsList))
+    else:
+        if backend == "process":
+            executor = ProcessPoolExecutor(max_workers=nJobs)
+            # send the tasks by chunks to limit the communication overhead
+            chunkSize = max(1, nTasks // (4 * nJobs))
+        else:
+            executor = ThreadPoolExecutor(max_workers=nJobs)
+            chunkSize = 1
+        iterResults = executor.map(function, seeds, *zip(*argsList),
+                                   chunksize=chunkSize)
+
+    results = []
+    try:
+        for i, result in enumerate(iterResults):
+            results.append(result)
+            if message is not None:
+                updateProgress(i, nTasks, message)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if nJobs is not None:
+        ot.RandomGenerator.SetState(state)
+    return results
+
+def submitEvaluation(executor, function, sample):
+    """
+    Submit the evaluation of the function on the sample to the executor and
+    return the future. If the executor is None, the function is evaluated at
+    once and the returned future is already completed.
+    """
+    if executor is None:
+        future = Future()
+        future.set_result(function(sample))
+        return future
+    return executor.submit(function, sample)
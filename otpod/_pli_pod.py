@@ -5,6 +5,7 @@ import numpy as np
 import openturns as ot
 import matplotlib.pyplot as plt
 from ._pli import PLIMeanBase, PLIVarianceBase
+from ._sampling import checkSamplingMethod
 import logging
 from distutils.version import LooseVersion
 
@@ -44,6 +45,8 @@ class PLIBase():
         self._defectNumber = self._defectSizes.shape[0]
         self._detectionBoxCox = POD._detectionBoxCox
         self._samplingSize = 10000
+        self._samplingMethod = "MonteCarlo"
+        self._samplingReplicates = 10
 
         # the distribution of the parameters without the one of the defects.
         tmpDistribution = POD.getDistribution()
@@ -83,8 +86,20 @@ class PLIBase():
             event = ot.ThresholdEvent(output, ot.Greater(), self._detectionBoxCox)
 
         ##### Monte Carlo ########
-        algo_MC = ot.ProbabilitySimulationAlgorithm(event)
-        algo_MC.setMaximumOuterSampling(self._samplingSize)
+        if self._samplingMethod == "MonteCarlo":
+            algo_MC = ot.ProbabilitySimulationAlgorithm(event)
+            algo_MC.setMaximumOuterSampling(self._samplingSize)
+        else:
+            # each block is a randomized design
+            if self._samplingMethod == "LHS":
+                experiment = ot.LHSExperiment()
+                experiment.setAlwaysShuffle(True)
+            else:
+                experiment = ot.LowDiscrepancyExperiment()
+                experiment.setRandomize(True)
+            algo_MC = ot.ProbabilitySimulationAlgorithm(event, experiment)
+            algo_MC.setBlockSize(max(1, self._samplingSize // self._samplingReplicates))
+            algo_MC.setMaximumOuterSampling(self._samplingReplicates)
         # set negative coef of variation to be sure the stopping criterion is the sampling size
         algo_MC.setMaximumCoefficientOfVariation(-1)
         algo_MC.run()
@@ -190,6 +205,44 @@ class PLIBase():
         """
         self._samplingSize = size
 
+    def getSamplingMethod(self):
+        """
+        Accessor to the sampling method of the Monte Carlo simulation.
+
+        Returns
+        -------
+        method : string
+            Either "MonteCarlo", "LHS" or "QMC".
+        replicates : int
+            The number of independent designs of the "LHS" and "QMC" methods.
+        """
+        return self._samplingMethod, self._samplingReplicates
+
+    def setSamplingMethod(self, method, replicates=10):
+        """
+        Accessor to the sampling method of the Monte Carlo simulation.
+
+        Parameters
+        ----------
+        method : string
+            "MonteCarlo" : the sample is drawn from the distribution.
+            "LHS" : the sample is made of Latin hypercube designs.
+            "QMC" : the sample is made of Sobol' sequences randomized with a
+            random shift.
+            Default is "MonteCarlo".
+        replicates : int
+            The number of independent designs of the "LHS" and "QMC" methods,
+            the sampling size is split between them. Default is 10.
+            With these methods, each design is a block of the probability
+            simulation algorithm : all designs have the same size, which is the
+            sampling size divided by the number of replicates and rounded down.
+            A sampling size that is not a multiple of the number of
+            replicates is therefore reduced to the nearest multiple.
+        """
+        checkSamplingMethod(method, replicates)
+        self._samplingMethod = method
+        self._samplingReplicates = replicates
+
     def setDistribution(self, distribution):
         """
         Accessor to the parameters distribution. 
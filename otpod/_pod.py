@@ -18,7 +18,10 @@ class POD(object):
                  saturationThres, boxCox):
 
         self._simulationSize = 1000
-
+        # number of jobs and backend of the parallel computation, the random
+        # generator is used as a single stream if nJobs is None
+        self._nJobs = None
+        self._backend = "process"
 
         # inherited attributes
         self._inputSample = ot.Sample(np.vstack(inputSample))
@@ -75,6 +78,50 @@ class POD(object):
         """
         self._simulationSize = size
 
+    def getParallelism(self):
+        """
+        Accessor to the parallel computation parameters.
+
+        Returns
+        -------
+        nJobs : int
+            The number of jobs, None if the parallel computation is disabled.
+        backend : string
+            Either "process" or "thread".
+        """
+        return self._nJobs, self._backend
+
+    def setParallelism(self, nJobs, backend="process"):
+        """
+        Accessor to the parallel computation parameters.
+
+        Parameters
+        ----------
+        nJobs : int
+            The number of jobs running the independent iterations of the POD
+            computation. If None, the parallel computation is disabled.
+        backend : string
+            "process" : the iterations are run in a pool of processes.
+            "thread" : the iterations are run in a pool of threads, only the
+            computations releasing the GIL are then performed in parallel.
+            Default is "process".
+
+        Notes
+        -----
+        When enabled, each iteration uses its own random stream whose seed is
+        drawn from the OpenTURNS random generator. The results then depend on
+        the seed set by the user but neither on the number of jobs nor on the
+        backend. They are different from those obtained when the parallel
+        computation is disabled because the random numbers are not drawn in a
+        single stream.
+        """
+        if nJobs is not None and (type(nJobs) is not int or nJobs < 1):
+            raise ValueError("The number of jobs must be a positive int or None.")
+        if backend != "process" and backend != "thread":
+            raise ValueError("Backend must be 'process' or 'thread'.")
+        self._nJobs = nJobs
+        self._backend = backend
+
 ################################################################################
 ################ Common methods called inside subclass #########################
 ################################################################################
@@ -231,41 +278,13 @@ class POD(object):
         """
         Run common preliminary analysis to all methods to build POD. 
         """
-         #################### Filter censored data ##############################
-        if censored:
-            # Filter censored data
-            inputSample, inputSampleNoise, inputSampleSat, signals = \
-                DataHandling.filterCensoredData(inputSample, outputSample,
-                              noiseThres, saturationThres)
-        else:
-            inputSample, signals = inputSample, outputSample
-            inputSampleNoise, inputSampleSat = None, None
-
-        ###################### Box Cox transformation ##########################
-        # Compute Box Cox if enabled
-        shift = 0.
+        result = runPreliminaryAnalysis(inputSample, outputSample, detection,
+                                        noiseThres, saturationThres, boxCox,
+                                        censored, cache=True)
+        self._lambdaBoxCox = result['lambdaBoxCox']
         if boxCox:
-            if signals.getMin()[0] < 0:
-                shift = - signals.getMin()[0] + 100
-            # optimization required, get optimal lambda without graph
-            self._lambdaBoxCox, self._graphBoxCox = computeBoxCox(inputSample, signals, shift)
-
-            # Transformation of data
-            boxCoxTransform = ot.BoxCoxTransform([self._lambdaBoxCox])
-            signals = boxCoxTransform(signals + shift)
-            if censored:
-                if noiseThres is not None:
-                    noiseThres = boxCoxTransform([noiseThres + shift])[0]
-                if saturationThres is not None:
-                    saturationThres = boxCoxTransform([saturationThres + shift])[0]
-            detectionBoxCox = boxCoxTransform([detection + shift])[0]
-        else:
-            detectionBoxCox = detection
-            self._lambdaBoxCox = None
-            boxCoxTransform = None
-
-        return {'inputSample':inputSample, 'signals':signals, 'shift':shift,
-                'detectionBoxCox':detectionBoxCox, 'boxCoxTransform':boxCoxTransform}
+            self._graphBoxCox = result['graphBoxCox']
+        return result
 
     def drawBoxCoxLikelihood(self, name=None):
         """
@@ -316,4 +335,59 @@ class POD(object):
             The Box Cox parameter used to transform the data. If the transformation
             is not enabled None is returned. 
         """
-        return self._lambdaBoxCox
\ No newline at end of file
+        return self._lambdaBoxCox
+
+
+def runPreliminaryAnalysis(inputSample, outputSample, detection, noiseThres,
+                           saturationThres, boxCox, censored, lambdaBoxCox=None,
+                           shift=None, cache=False):
+    """
+    Filter the censored data and perform the Box Cox transformation if enabled.
+    It is defined as a simple function because it is also run in the bootstrap
+    loops, possibly in other processes. If lambdaBoxCox and shift are given,
+    they are used instead of being estimated on the data. If cache is True,
+    the estimated Box Cox parameter is cached for the same data.
+    """
+    #################### Filter censored data ##############################
+    if censored:
+        # Filter censored data
+        inputSample, inputSampleNoise, inputSampleSat, signals = \
+            DataHandling.filterCensoredData(inputSample, outputSample,
+                          noiseThres, saturationThres)
+    else:
+        inputSample, signals = inputSample, outputSample
+        inputSampleNoise, inputSampleSat = None, None
+
+    ###################### Box Cox transformation ##########################
+    # Compute Box Cox if enabled
+    if boxCox:
+        if shift is None:
+            shift = 0.
+            if signals.getMin()[0] < 0:
+                shift = - signals.getMin()[0] + 100
+        if lambdaBoxCox is None:
+            # optimization required, get optimal lambda without graph
+            lambdaBoxCox, graphBoxCox = computeBoxCox(inputSample, signals,
+                                                      shift, cache=cache)
+        else:
+            graphBoxCox = None
+
+        # Transformation of data
+        boxCoxTransform = ot.BoxCoxTransform([lambdaBoxCox])
+        signals = boxCoxTransform(signals + shift)
+        if censored:
+            if noiseThres is not None:
+                noiseThres = boxCoxTransform([noiseThres + shift])[0]
+            if saturationThres is not None:
+                saturationThres = boxCoxTransform([saturationThres + shift])[0]
+        detectionBoxCox = boxCoxTransform([detection + shift])[0]
+    else:
+        shift = 0.
+        detectionBoxCox = detection
+        lambdaBoxCox = None
+        graphBoxCox = None
+        boxCoxTransform = None
+
+    return {'inputSample':inputSample, 'signals':signals, 'shift':shift,
+            'detectionBoxCox':detectionBoxCox, 'boxCoxTransform':boxCoxTransform,
+            'lambdaBoxCox':lambdaBoxCox, 'graphBoxCox':graphBoxCox}
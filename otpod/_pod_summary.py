@@ -59,6 +59,10 @@ class PODSummary():
     Each method can be deactivated using the method *setMethodActive* and using
     the key corresponding to the method.
 
+    The bootstrap and Monte Carlo simulations of the methods can be run in
+    parallel using the method *setParallelism*. The Box Cox parameter is
+    estimated once on the data and shared by all methods.
+
     All results can be displayed and saved thanks to the methods *printResults*, 
     *saveResults* and *saveGraphs*. For each method, the probability level and
     confidence level can be specified in order to compute the defect size to 
@@ -91,6 +95,9 @@ class PODSummary():
         self._verbose = True
         self._simulationSize = 1000
         self._samplingSize = 5000
+        self._nJobs = None
+        self._backend = "process"
+        self._boxCoxRefit = True
 
         self._PODgauss = None
         self._PODbin = None
@@ -126,6 +133,7 @@ class PODSummary():
                                                 ot.NormalFactory(), self._boxCox)
             self._PODgauss.setVerbose(self._verbose)
             self._PODgauss.setSimulationSize(self._simulationSize)
+            self._PODgauss.setParallelism(self._nJobs, self._backend)
             self._PODgauss.run()
 
 
@@ -150,6 +158,8 @@ class PODSummary():
                                                 ot.KernelSmoothing(), self._boxCox)
             self._PODks.setVerbose(self._verbose)
             self._PODks.setSimulationSize(self._simulationSize)
+            self._PODks.setParallelism(self._nJobs, self._backend)
+            self._PODks.setBoxCoxRefit(self._boxCoxRefit)
             self._PODks.run()
 
         # run the quantile regression 
@@ -161,6 +171,8 @@ class PODSummary():
                                                 self._saturationThres, self._boxCox)
             self._PODqr.setVerbose(self._verbose)
             self._PODqr.setSimulationSize(self._simulationSize)
+            self._PODqr.setParallelism(self._nJobs, self._backend)
+            self._PODqr.setBoxCoxRefit(self._boxCoxRefit)
             self._PODqr.run()
 
 
@@ -173,6 +185,7 @@ class PODSummary():
                                        self._saturationThres, self._boxCox)
             self._PODchaos.setVerbose(self._verbose)
             self._PODchaos.setSimulationSize(self._simulationSize)
+            self._PODchaos.setParallelism(self._nJobs, self._backend)
             self._PODchaos.setSamplingSize(self._samplingSize)
             self._PODchaos.run()
 
@@ -185,6 +198,7 @@ class PODSummary():
                                self._saturationThres, self._boxCox)
             self._PODkriging.setVerbose(self._verbose)
             self._PODkriging.setSimulationSize(self._simulationSize)
+            self._PODkriging.setParallelism(self._nJobs, self._backend)
             self._PODkriging.setSamplingSize(self._samplingSize)
             self._PODkriging.run()
 
@@ -394,6 +408,71 @@ class PODSummary():
         """
         self._samplingSize = size
 
+    def getParallelism(self):
+        """
+        Accessor to the parallel computation parameters.
+
+        Returns
+        -------
+        nJobs : int
+            The number of jobs, None if the parallel computation is disabled.
+        backend : string
+            Either "process" or "thread".
+        """
+        return self._nJobs, self._backend
+
+    def setParallelism(self, nJobs, backend="process"):
+        """
+        Accessor to the parallel computation parameters.
+
+        Parameters
+        ----------
+        nJobs : int
+            The number of jobs running the bootstrap and the Monte Carlo
+            simulations of each method. If None, the parallel computation is
+            disabled.
+        backend : string
+            "process" or "thread". Default is "process".
+
+        Notes
+        -----
+        See the method *setParallelism* of the POD classes.
+        """
+        if nJobs is not None and (type(nJobs) is not int or nJobs < 1):
+            raise ValueError("The number of jobs must be a positive int or None.")
+        if backend != "process" and backend != "thread":
+            raise ValueError("Backend must be 'process' or 'thread'.")
+        self._nJobs = nJobs
+        self._backend = backend
+
+    def getBoxCoxRefit(self):
+        """
+        Accessor to the Box Cox estimation on the bootstrap samples.
+
+        Returns
+        -------
+        refit : bool
+            True if the Box Cox parameter is estimated on each bootstrap sample.
+        """
+        return self._boxCoxRefit
+
+    def setBoxCoxRefit(self, refit):
+        """
+        Accessor to the Box Cox estimation on the bootstrap samples.
+
+        Parameters
+        ----------
+        refit : bool
+            If True, the Box Cox parameter is estimated on each bootstrap
+            sample of the linear model with kernel smoothing and of the
+            quantile regression. If False, the Box Cox parameter estimated on
+            the data is used for all bootstrap samples. Default is True.
+        """
+        if type(refit) is not bool:
+            raise TypeError('The parameter is not a bool.')
+        else:
+            self._boxCoxRefit = refit
+
     def getResults(self, probabilityLevel=0.9, confidenceLevel=0.95):
         """
         Print all results in the terminal.
@@ -10,6 +10,8 @@ from scipy.interpolate import interp1d
 from ._decorator import DocInherit, keepingArgs
 from ._progress_bar import updateProgress
 from ._math_tools import computeR2
+from ._parallel import parallelMap, randomStream
+from ._sampling import drawSample, checkSamplingMethod
 import matplotlib.pyplot as plt
 import logging
 
@@ -64,6 +66,19 @@ class PolynomialChaosPOD(POD):
     it can be given as parameter using the method *setPolynomialChaosResult*,
     then the POD is computed based on this polynomial chaos result.
 
+    The computations for the random coefficients of the polynomial chaos are
+    independent and can be run in parallel using the method *setParallelism*.
+    Without parallelism, the random coefficients are processed by blocks : the
+    reduced basis is evaluated once on the input samples of the whole block.
+
+    By default, a new input sample is drawn for each random coefficient vector.
+    Using the method *setSharedSampling*, one input sample can be shared by
+    all coefficient vectors : the reduced basis is then evaluated only once and
+    all POD curves are computed with a matrix product.
+
+    The Monte Carlo samples can be replaced by Latin hypercube or randomized
+    quasi Monte Carlo designs using the method *setSamplingMethod*.
+
     A progress bar is shown if the verbosity is enabled. It can be disabled using
     the method *setVerbose*.
     """
@@ -96,6 +111,11 @@ class PolynomialChaosPOD(POD):
         self._degree = 3
         self._defectSizes = None
         self._verbose = True
+        self._sharedSampling = False
+        self._samplingMethod = "MonteCarlo"
+        self._samplingReplicates = 10
+        # maximum number of values computed at once by the Monte Carlo
+        self._blockSize = 10000000
 
         self._normalDist = ot.Normal()
 
@@ -152,6 +172,9 @@ class PolynomialChaosPOD(POD):
         self._transformation = self._chaosResult.getTransformation()
         self._basisFunction = ot.ComposedFunction(ot.AggregatedFunction(
                                 self._reducedBasis), self._transformation)
+        # evaluation of the basis on the grid of the defect sizes and the
+        # samples of the other inputs
+        self._gridBasis = ChaosGridBasis(self._chaosResult)
 
         # compute the residuals and stderr
         inputSize = self._input.getSize()
@@ -178,13 +201,34 @@ class PolynomialChaosPOD(POD):
         gramBasis = ot.Matrix(self._basisFunction(self._input)).computeGram()
         covMatrix = gramBasis.solveLinearSystem(ot.IdentityMatrix(basisSize)) * varEpsilon
         self._coefsDist = ot.Normal(np.hstack(self._chaosCoefs), ot.CovarianceMatrix(covMatrix.getImplementation()))
-        coefsRandom = self._coefsDist.getSample(self._simulationSize)
+        coefsRandom = np.array(self._coefsDist.getSample(self._simulationSize))
 
-        self._PODPerDefect = ot.Sample(self._simulationSize, self._defectNumber)
-        for i, coefs in enumerate(coefsRandom):
-            self._PODPerDefect[i, :] = self._computePOD(self._defectSizes, coefs)
-            if self._verbose:
-                updateProgress(i, self._simulationSize, 'Computing POD per defect')
+        if self._verbose:
+            message = 'Computing POD per defect'
+        else:
+            message = None
+        if self._sharedSampling:
+            self._PODPerDefect = ot.Sample(computeSharedPOD(self._defectSizes,
+                                coefsRandom, self._distribution,
+                                self._samplingSize, self._gridBasis,
+                                self._stderr, self._detectionBoxCox,
+                                self._blockSize, message, self._samplingMethod,
+                                self._samplingReplicates))
+        else:
+            # the POD curves of all coefficients are computed in parallel if
+            # enabled, else the coefficients are processed by blocks
+            if self._nJobs is None:
+                chunkSize = max(1, self._blockSize // (self._samplingSize *
+                                len(self._defectSizes) * basisSize))
+            else:
+                chunkSize = 1
+            argsList = [(self._defectSizes, coefsRandom[i:i+chunkSize],
+                         self._distribution, self._samplingSize,
+                         self._gridBasis, self._stderr, self._detectionBoxCox,
+                         self._samplingMethod, self._samplingReplicates)
+                        for i in range(0, self._simulationSize, chunkSize)]
+            self._PODPerDefect = ot.Sample(np.vstack(parallelMap(computePOD,
+                                    argsList, self._nJobs, self._backend, message)))
 
 
     def getPODModel(self):
@@ -592,6 +636,66 @@ class PolynomialChaosPOD(POD):
         else:
             self._verbose = verbose
 
+    def getSharedSampling(self):
+        """
+        Accessor to the sampling mode of the confidence interval.
+
+        Returns
+        -------
+        shared : bool
+            If True, the input sample is shared by all random coefficients.
+        """
+        return self._sharedSampling
+
+    def setSharedSampling(self, shared):
+        """
+        Accessor to the sampling mode of the confidence interval.
+
+        Parameters
+        ----------
+        shared : bool
+            If True, one input sample is shared by all random coefficients of
+            the polynomial chaos, otherwise a new input sample is drawn for each
+            of them. Default is False.
+        """
+        if type(shared) is not bool:
+            raise TypeError('The parameter is not a bool.')
+        else:
+            self._sharedSampling = shared
+
+    def getSamplingMethod(self):
+        """
+        Accessor to the sampling method of the Monte Carlo simulation.
+
+        Returns
+        -------
+        method : string
+            Either "MonteCarlo", "LHS" or "QMC".
+        replicates : int
+            The number of independent designs of the "LHS" and "QMC" methods.
+        """
+        return self._samplingMethod, self._samplingReplicates
+
+    def setSamplingMethod(self, method, replicates=10):
+        """
+        Accessor to the sampling method of the Monte Carlo simulation.
+
+        Parameters
+        ----------
+        method : string
+            "MonteCarlo" : the sample is drawn from the distribution.
+            "LHS" : the sample is made of Latin hypercube designs.
+            "QMC" : the sample is made of Sobol' sequences randomized with a
+            random shift.
+            Default is "MonteCarlo".
+        replicates : int
+            The number of independent designs of the "LHS" and "QMC" methods,
+            the sampling size is split between them. Default is 10.
+        """
+        checkSamplingMethod(method, replicates)
+        self._samplingMethod = method
+        self._samplingReplicates = replicates
+
     def getCoefficientDistribution(self):
         """
         Accessor to the distribution of the polynomial chaos coefficients.
@@ -648,52 +752,262 @@ class PolynomialChaosPOD(POD):
                 self._distribution, self._adaptiveStrategy, self._projectionStrategy)
 
 
-    def _mergeDefectInX(self, defect, X):
+    def _computePOD(self, defectSizes, coefs):
         """
-        defect : scalar of the defect value
-        X : sample without the defect column
+        Compute the POD for all defect sizes in a vectorized way.
         """
-        size = X.getSize()
-        dim = X.getDimension() + 1
-        samplePred = ot.Sample(size, dim)
-        samplePred[:, 0] = ot.Sample(size, [defect])
-        samplePred[:, 1:] = X
-        return samplePred
+        return computePOD(None, defectSizes, np.hstack(coefs), self._distribution,
+                          self._samplingSize, self._gridBasis, self._stderr,
+                          self._detectionBoxCox, self._samplingMethod,
+                          self._samplingReplicates)
 
 
-    def _buildChaosFunction(self, reducedBasis, transformation, coefs):
-        """
-        Build the chaos metamodel with given coefficients.
-        """
-        standardChaosFunction = ot.LinearCombinationFunction(reducedBasis, np.hstack(coefs))
-        chaosFunction = ot.ComposedFunction(standardChaosFunction, transformation)
-        return chaosFunction
+def computePOD(seed, defectSizes, coefs, distribution, samplingSize, gridBasis,
+               stderr, detection, samplingMethod="MonteCarlo", replicates=1):
+    """
+    Compute the POD for all defect sizes in a vectorized way with the given
+    chaos coefficients.
 
+    If coefs is a block of coefficient vectors, a new input sample is drawn for
+    each of them and the POD curves are returned in a 2-d array. The basis is
+    evaluated once on the input samples of the whole block.
+    """
+    coefs = np.array(coefs)
+    coefsBlock = np.atleast_2d(coefs)
+    blockSize = coefsBlock.shape[0]
+    defectNumber = len(defectSizes)
+    size = samplingSize * defectNumber
+    samplePred = []
+    residualsSample = np.zeros((blockSize, size))
+    with randomStream(seed):
+        for k in range(blockSize):
+            # create the input sample that must be computed by the metamodels
+            samplePred.append(np.array(drawSample(distribution, samplingSize,
+                                        samplingMethod, replicates))[:,1:])
+            # randomness from the residuals
+            residualsSample[k] = np.array(ot.Normal().getSample(size))[:,0]
+
+    # chaos values of each coefficient vector on its own input sample, with
+    # the randomness from the residuals
+    chaosRandomSample = gridBasis.computeValues(defectSizes, np.array(samplePred),
+                                                coefsBlock) + \
+                residualsSample.reshape(blockSize, defectNumber, samplingSize) * stderr
+
+    # compute the POD for all defect sizes
+    POD = np.mean(chaosRandomSample > detection, axis=2)
+    if coefs.ndim == 1:
+        return POD[0]
+    return POD
+
+def computeSharedPOD(defectSizes, coefsRandom, distribution, samplingSize,
+                     gridBasis, stderr, detection, blockSize=10000000,
+                     message=None, samplingMethod="MonteCarlo", replicates=1):
+    """
+    Compute the POD curves of all coefficient vectors with one input sample
+    shared by all of them.
 
-    def _computePOD(self, defectSizes, coefs):
+    The basis is evaluated once on the input sample, then the chaos values of
+    a block of coefficient vectors are obtained with matrix products. The
+    blocks are sized so that at most blockSize values are computed at once.
+    """
+    coefsRandom = np.atleast_2d(coefsRandom)
+    simulationSize = coefsRandom.shape[0]
+    defectNumber = len(defectSizes)
+    size = samplingSize * defectNumber
+    samplePred = np.array(drawSample(distribution, samplingSize,
+                                     samplingMethod, replicates))[:,1:]
+    factors = gridBasis.computeFactors(defectSizes, samplePred)
+
+    chunkSize = max(1, blockSize // size)
+    POD = np.zeros((simulationSize, defectNumber))
+    for start in range(0, simulationSize, chunkSize):
+        coefsBlock = coefsRandom[start:start+chunkSize]
+        nBlock = coefsBlock.shape[0]
+        # randomness from the residuals, drawn for each coefficient vector
+        residualsSample = np.reshape(ot.Normal().getSample(nBlock * size),
+                                     (nBlock, defectNumber, samplingSize))
+        chaosRandomSample = gridBasis.combineFactors(factors, coefsBlock) + \
+                            residualsSample * stderr
+        POD[start:start+nBlock] = np.mean(chaosRandomSample > detection, axis=2)
+        if message is not None:
+            updateProgress(min(start + chunkSize, simulationSize) - 1,
+                           simulationSize, message)
+    return POD
+
+def mergeDefectsInX(defectSizes, X):
+    """
+    Build the sample where X is repeated for each defect size, the defect
+    being the first column. The rows of the first defect size come first.
+    """
+    X = np.array(X)
+    size = X.shape[0]
+    return np.hstack([np.repeat(defectSizes, size)[:, np.newaxis],
+                      np.tile(X, (len(defectSizes), 1))])
+
+def computeDesignMatrix(reducedBasis, transformation, sample):
+    """
+    Evaluate all functions of the reduced basis on the transformed sample.
+
+    The chaos values of several coefficient vectors are then obtained with one
+    matrix product.
+    """
+    standardSample = transformation(ot.Sample(np.atleast_2d(sample)))
+    if isinstance(reducedBasis, ot.Basis):
+        reducedBasis = [reducedBasis.build(i) for i in range(reducedBasis.getSize())]
+    return np.hstack([np.array(function(standardSample))
+                      for function in reducedBasis])
+
+
+
+class ChaosGridBasis(object):
+    """
+    Evaluate the reduced basis of a polynomial chaos on the grid of all
+    combinations of defect sizes with a sample of the other inputs.
+
+    Parameters
+    ----------
+    chaosResult : :py:class:`openturns.FunctionalChaosResult`
+        The result of the polynomial chaos algorithm.
+
+    Notes
+    -----
+    When the input distribution has an independent copula and the basis is
+    an :py:class:`openturns.OrthogonalProductPolynomialFactory`, each function
+    of the reduced basis is the product of a polynomial of the defect size and
+    of a polynomial of the other inputs. Both parts are then evaluated
+    separately with the recurrence of the univariate polynomial families and
+    the chaos values on the grid are obtained with matrix products. Otherwise
+    the basis is evaluated on the whole grid.
+    """
+
+    def __init__(self, chaosResult):
+        self._transformation = chaosResult.getTransformation()
+        self._reducedBasis = ot.Basis(chaosResult.getReducedBasis())
+        basis = chaosResult.getOrthogonalBasis().getImplementation()
+        self._separable = (basis.getClassName() == 'OrthogonalProductPolynomialFactory'
+                           and chaosResult.getDistribution().hasIndependentCopula())
+        if self._separable:
+            factory = ot.OrthogonalProductPolynomialFactory(basis)
+            enumerateFunction = factory.getEnumerateFunction()
+            # degree of each univariate polynomial for each basis function
+            self._multiIndices = np.array([enumerateFunction(int(index))
+                                           for index in chaosResult.getIndices()],
+                                           dtype=int, ndmin=2)
+            families = factory.getPolynomialFamilyCollection()
+            self._recurrenceCoefficients = []
+            for j in range(self._multiIndices.shape[1]):
+                degree = max(self._multiIndices[:, j].max(), 1)
+                self._recurrenceCoefficients.append(np.array(
+                    [families[j].getRecurrenceCoefficients(n) for n in range(degree)]))
+
+    def computeFactors(self, defectSizes, sample):
+        """
+        Compute the factors of the basis for the defect sizes and the sample.
+
+        Parameters
+        ----------
+        defectSizes : 1-d sequence of float
+            The defect sizes.
+        sample : 2-d sequence of float
+            The values of the other inputs.
+
+        Returns
+        -------
+        factors : tuple of 2-d arrays
+            If the basis is separable, the values of the basis functions for
+            the defect sizes and for the sample, with shapes (defectNumber,
+            basisSize) and (samplingSize, basisSize). Otherwise the design
+            matrix of the whole grid with shape (defectNumber, samplingSize,
+            basisSize).
+        """
+        defectSizes = np.ravel(defectSizes)
+        sample = np.array(sample, ndmin=2)
+        if not self._separable:
+            designMatrix = computeDesignMatrix(self._reducedBasis,
+                        self._transformation, mergeDefectsInX(defectSizes, sample))
+            return (designMatrix.reshape(len(defectSizes), sample.shape[0], -1),)
+
+        # the transformation is computed marginally : the defect sizes are
+        # transformed with any value of the other inputs and reciprocally
+        standardDefects = np.array(self._transformation(
+                    mergeDefectsInX(defectSizes, sample[:1])))[:, 0]
+        standardSample = np.array(self._transformation(
+                    mergeDefectsInX(defectSizes[:1], sample)))[:, 1:]
+        defectFactors = self._computeMarginalValues(0, standardDefects)
+        otherFactors = np.ones((sample.shape[0], self._multiIndices.shape[0]))
+        for j in range(1, self._multiIndices.shape[1]):
+            otherFactors *= self._computeMarginalValues(j, standardSample[:, j-1])
+        return defectFactors, otherFactors
+
+    def combineFactors(self, factors, coefs):
+        """
+        Compute the chaos values on the grid from the factors of the basis.
+
+        Parameters
+        ----------
+        factors : tuple of 2-d arrays
+            The factors given by *computeFactors*.
+        coefs : 2-d sequence of float
+            The coefficient vectors of the chaos.
+
+        Returns
+        -------
+        values : 3-d array of float
+            The chaos values with shape (nCoefs, defectNumber, samplingSize).
         """
-        Compute the POD for all defect sizes in a vectorized way.
+        coefs = np.atleast_2d(coefs)
+        if len(factors) == 1:
+            return np.einsum('isk,bk->bis', factors[0], coefs)
+        defectFactors, otherFactors = factors
+        return np.matmul(defectFactors * coefs[:, None, :], otherFactors.T)
+
+    def computeValues(self, defectSizes, sample, coefs):
         """
-        # create the input sample that must be computed by the metamodels
-        samplePred = self._distribution.getSample(self._samplingSize)[:,1:]
-        fullSamplePred = ot.Sample(self._samplingSize * self._defectNumber,
-                                                                    self._dim)
-        for i, defect in enumerate(defectSizes):
-            fullSamplePred[self._samplingSize*i:self._samplingSize*(i+1), :] = \
-                                    self._mergeDefectInX(defect, samplePred)
-
-        # create the chaos function for user defined coefs
-        chaosFunction = self._buildChaosFunction(self._reducedBasis,
-                                        self._transformation, coefs)
-
-        # add the randomness from the residuals
-        residualsSample = self._normalDist.getSample(self._samplingSize * \
-                                             self._defectNumber) * self._stderr
-        chaosRandomSample = chaosFunction(fullSamplePred) + residualsSample
-        chaosRandomSample = np.reshape(chaosRandomSample, (self._samplingSize,
-                                       self._defectNumber), 'F')
-
-        # compute the POD for all defect sizes
-        POD = np.mean(chaosRandomSample > self._detectionBoxCox, axis=0)
-
-        return POD
+        Compute the chaos values on the grid of the defect sizes and the sample.
+
+        Parameters
+        ----------
+        defectSizes : 1-d sequence of float
+            The defect sizes.
+        sample : 2-d or 3-d sequence of float
+            The values of the other inputs, either shared by all coefficient
+            vectors or one sample per coefficient vector.
+        coefs : 2-d sequence of float
+            The coefficient vectors of the chaos.
+
+        Returns
+        -------
+        values : 3-d array of float
+            The chaos values with shape (nCoefs, defectNumber, samplingSize).
+        """
+        sample = np.array(sample)
+        if sample.ndim < 3:
+            return self.combineFactors(self.computeFactors(defectSizes, sample),
+                                       coefs)
+        # the basis is evaluated once on the samples of all coefficients
+        coefs = np.atleast_2d(coefs)
+        nCoefs, samplingSize = sample.shape[:2]
+        factors = self.computeFactors(defectSizes,
+                                      sample.reshape(nCoefs * samplingSize, -1))
+        if len(factors) == 1:
+            designMatrix = factors[0].reshape(len(defectSizes), nCoefs,
+                                              samplingSize, -1)
+            return np.einsum('ibsk,bk->bis', designMatrix, coefs)
+        defectFactors, otherFactors = factors
+        otherFactors = otherFactors.reshape(nCoefs, samplingSize, -1)
+        return np.matmul(defectFactors * coefs[:, None, :],
+                         otherFactors.transpose(0, 2, 1))
+
+    def _computeMarginalValues(self, marginal, x):
+        """
+        Compute the univariate polynomials of the marginal for the degrees of
+        all basis functions with the three terms recurrence.
+        """
+        multiIndices = self._multiIndices[:, marginal]
+        coefficients = self._recurrenceCoefficients[marginal]
+        polynomials = np.ones((max(multiIndices.max(), 1) + 1, x.size))
+        polynomials[1] = coefficients[0, 0] * x + coefficients[0, 1]
+        for n in range(1, multiIndices.max()):
+            polynomials[n+1] = (coefficients[n, 0] * x + coefficients[n, 1]) * \
+                                polynomials[n] + coefficients[n, 2] * polynomials[n-1]
+        return polynomials[multiIndices].T
@@ -5,12 +5,15 @@ __all__ = ['QuantileRegressionPOD']
 
 import openturns as ot
 import numpy as np
-from ._pod import POD
+from ._pod import POD, runPreliminaryAnalysis
 from statsmodels.regression.quantile_regression import QuantReg
+from statsmodels.tools.sm_exceptions import IterationLimitWarning
 from scipy.interpolate import interp1d
 from ._decorator import DocInherit, keepingArgs
-from ._progress_bar import updateProgress
+from ._parallel import parallelMap
+from ._bootstrap import generateBootstrapIndices
 import matplotlib.pyplot as plt
+import warnings
 import logging
 
 
@@ -49,7 +52,11 @@ class QuantileRegressionPOD(POD):
 
     The confidence level is computed by bootstrap. The POD model at the given
     confidence level is also an interpolate function based on the defect quantile
-    value computed at the given confidence level.
+    value computed at the given confidence level. The quantile regressions of
+    the bootstrap samples can be run in parallel using the method
+    *setParallelism*. When the Box Cox transformation is enabled, the Box Cox
+    parameter estimated on the data can be used for all bootstrap samples
+    instead of being estimated again, see the method *setBoxCoxRefit*.
 
     The computeDetectionSize method calls the real quantile regression
     at the given probability level.
@@ -63,6 +70,7 @@ class QuantileRegressionPOD(POD):
 
         self._quantile = np.linspace(0.05, 0.98, 21)
         self._verbose = True
+        self._boxCoxRefit = True
 
         # initialize the POD class
         super(QuantileRegressionPOD, self).__init__(inputSample, outputSample,
@@ -110,6 +118,10 @@ class QuantileRegressionPOD(POD):
         self._defects = result['inputSample']
         self._signals = result['signals']
         self._detectionBoxCox = result['detectionBoxCox']
+        if self._boxCoxRefit:
+            lambdaBoxCox, shift = None, None
+        else:
+            lambdaBoxCox, shift = result['lambdaBoxCox'], result['shift']
 
         defectsSize = self._defects.getSize()
 
@@ -118,16 +130,14 @@ class QuantileRegressionPOD(POD):
         X[:, 1] = self._defects
         self._algoQuantReg = QuantReg(np.array(self._signals), np.array(X))
 
-        # Compute the defect quantile
+        # Compute the defect quantile : the quantile regressions are fitted
+        # for all levels at once and the linear models are equal to
+        # detectionBoxCox for defects in [0, defectMax]
         defectMax = self._defects.getMax()[0]
-        defectList = []
-        for probLevel in self._quantile:
-            # fit the quantile regression and return the NMF
-            model = self._buildModel(1. - probLevel)
-            # Solve the model == detectionBoxCox with defects 
-            # boundaries = [0, defectMax]
-            defectList.append(ot.Brent().solve(model, self._detectionBoxCox,
-                                               0, defectMax))
+        intercept, slope = computeQuantileRegressionBatch(self._defects,
+                                            self._signals, 1. - self._quantile)
+        defectList = computeDefectCrossing(intercept, slope,
+                                           self._detectionBoxCox, 0, defectMax)
         # create support of the interpolating function including
         # point (0, 0) and point (defectMax, max(quantile))
         xvalue = np.hstack([0, defectList, defectMax])
@@ -137,55 +147,25 @@ class QuantileRegressionPOD(POD):
 
 
         ############ Confidence interval with bootstrap ########################
-        # Compute a NsimulationSize defect sizes for all quantiles
-        data = ot.Sample(self._size, 2)
-        data[:, 0] = self._inputSample
-        data[:, 1] = self._outputSample
-        # bootstrap of the data
-        bootstrapExp = ot.BootstrapExperiment(data)
+        # Compute a NsimulationSize defect sizes for all quantiles : the
+        # indices of all bootstrap samples of the data are drawn first
+        indices = generateBootstrapIndices(self._size, self._simulationSize)
+        inputSample = np.array(self._inputSample)
+        outputSample = np.array(self._outputSample)
+        if self._verbose:
+            message = 'Computing defect quantile'
+        else:
+            message = None
+        # the fits of the bootstrap samples are run in parallel if enabled
+        argsList = [(inputSample[index], outputSample[index], self._detection,
+                     self._noiseThres, self._saturationThres, self._boxCox,
+                     self._censored, self._quantile, lambdaBoxCox, shift)
+                    for index in indices]
         # create a numerical sample which contains for all simulations the 
         # defect quantile value. The goal is to compute the QuantilePerComponent
         # of the simulation for each defect quantile (columns)
-        self._defectsPerQuantile = ot.Sample(self._simulationSize, self._quantile.size)
-        for i in range(self._simulationSize):
-            # generate a sample with replacement within data of the same size
-            bootstrapData = bootstrapExp.generate()
-            # run the preliminary analysis : censore checking and box cox
-            result = self._run(bootstrapData[:,0], bootstrapData[:,1], self._detection,
-                               self._noiseThres, self._saturationThres,
-                               self._boxCox, self._censored)
-
-            # get some results
-            defects = result['inputSample']
-            signals = result['signals']
-            detectionBoxCox = result['detectionBoxCox']
-            defectsSize = defects.getSize()
-
-            # new quantile regression algorithm
-            X = ot.Sample(defectsSize, [1, 0])
-            X[:, 1] = defects
-            algoQuantReg = QuantReg(np.array(signals), np.array(X))
-
-            # compute the quantile defects
-            defectMax = defects.getMax()[0]
-            defectList = []
-            for probLevel in self._quantile:
-                fit = algoQuantReg.fit(1. - probLevel, max_iter=300, p_tol=1e-2)
-                def model(x):
-                    X = ot.Point([1, x[0]])
-                    return ot.Point(fit.predict(X))
-                model = ot.PythonFunction(1, 1, model)
-                # Solve the model == detectionBoxCox with defects 
-                # boundaries = [-infinity, defectMax] : it allows negative defects
-                # when for small prob level, there is no intersection with
-                # the detection threshold for positive defects
-                defectList.append(ot.Brent().solve(model, detectionBoxCox,
-                                                   -ot.SpecFunc.MaxScalar,
-                                                   defectMax))
-            # add the quantile in the numerical sample as the ith simulation
-            self._defectsPerQuantile[i, :] = defectList
-            if self._verbose:
-                updateProgress(i, self._simulationSize, 'Computing defect quantile')
+        self._defectsPerQuantile = ot.Sample(parallelMap(computeDefectQuantile,
+                                    argsList, self._nJobs, self._backend, message))
 
     def getPODModel(self):
         """
@@ -270,10 +250,11 @@ class QuantileRegressionPOD(POD):
         defectMin = self._defects.getMin()[0]
         defectMax = self._defects.getMax()[0]
         # compute 'a90'
-        model = self._buildModel(1. - probabilityLevel)
+        intercept, slope = computeQuantileRegressionBatch(self._defects,
+                                        self._signals, [1. - probabilityLevel])
         try:
-            detectionSize = ot.PointWithDescription(1, ot.Brent().solve(
-                                        model, self._detectionBoxCox, defectMin, defectMax))
+            detectionSize = ot.PointWithDescription(1, computeDefectCrossing(
+                    intercept, slope, self._detectionBoxCox, defectMin, defectMax)[0])
         except:
             raise Exception('The POD model does not contain, for the given ' + \
                              'defect interval, the wanted probability level.')
@@ -401,14 +382,113 @@ class QuantileRegressionPOD(POD):
         else:
             self._verbose = verbose
 
-    def _buildModel(self, probabilityLevel):
+    def getBoxCoxRefit(self):
+        """
+        Accessor to the Box Cox estimation on the bootstrap samples.
+
+        Returns
+        -------
+        refit : bool
+            True if the Box Cox parameter is estimated on each bootstrap sample.
         """
-        Build the Function at the given probabilityLevel. It is
-        used in the run and in computeDetectionSize in order to do not use the
-        interpolate function.
+        return self._boxCoxRefit
+
+    def setBoxCoxRefit(self, refit):
+        """
+        Accessor to the Box Cox estimation on the bootstrap samples.
+
+        Parameters
+        ----------
+        refit : bool
+            If True, the Box Cox parameter is estimated on each bootstrap
+            sample. If False, the Box Cox parameter estimated on the data is
+            used for all bootstrap samples, which is faster. Default is True.
         """
-        fit = self._algoQuantReg.fit(probabilityLevel, max_iter=300, p_tol=1e-2)
-        def model(x):
-            X = ot.Point([1, x[0]])
-            return ot.Point(fit.predict(X))
-        return ot.PythonFunction(1, 1, model)
\ No newline at end of file
+        if type(refit) is not bool:
+            raise TypeError('The parameter is not a bool.')
+        else:
+            self._boxCoxRefit = refit
+
+
+def computeDefectQuantile(seed, inputSample, outputSample, detection, noiseThres,
+                          saturationThres, boxCox, censored, quantile,
+                          lambdaBoxCox=None, shift=None):
+    """
+    Fit the quantile regressions on one bootstrap sample and return the defect
+    sizes for all quantiles.
+
+    The fit draws no random numbers : the seed is not used and the random
+    generator is not locked, so the tasks can run concurrently in threads.
+    """
+    # run the preliminary analysis : censore checking and box cox
+    result = runPreliminaryAnalysis(ot.Sample(inputSample),
+                                    ot.Sample(outputSample), detection,
+                                    noiseThres, saturationThres, boxCox,
+                                    censored, lambdaBoxCox, shift)
+
+    # get some results
+    defects = result['inputSample']
+    signals = result['signals']
+    detectionBoxCox = result['detectionBoxCox']
+
+    # compute the quantile defects for all levels at once
+    defectMax = defects.getMax()[0]
+    intercept, slope = computeQuantileRegressionBatch(defects, signals,
+                                                      1. - np.array(quantile))
+    # boundaries = [-infinity, defectMax] : it allows negative defects
+    # when for small prob level, there is no intersection with
+    # the detection threshold for positive defects
+    return list(computeDefectCrossing(intercept, slope, detectionBoxCox,
+                                      -np.inf, defectMax))
+
+def computeQuantileRegressionBatch(defects, signals, levels, maxIter=300,
+                                   pTol=1e-2):
+    """
+    Fit the linear quantile regressions of the signals versus the defects for
+    all levels at once. The iteratively reweighted least squares of the method
+    fit of QuantReg are run together, each level stopping when its own
+    convergence criterion is reached. Return the intercepts and the slopes.
+    """
+    defects = np.ravel(defects)
+    signals = np.ravel(signals)
+    levels = np.ravel(levels)[:, np.newaxis]
+    X = np.vstack([np.ones(defects.size), defects]).T
+    beta = np.ones((levels.size, 2))
+    resid = np.ones((levels.size, defects.size))
+    active = np.ones(levels.size, dtype=bool)
+    nIter = 0
+    while nIter < maxIter and active.any():
+        nIter += 1
+        # weighted least squares of the levels not converged yet
+        xstar = X / resid[active][:, :, np.newaxis]
+        xtx = np.matmul(np.transpose(xstar, (0, 2, 1)), X)
+        xty = np.matmul(np.transpose(xstar, (0, 2, 1)), signals)
+        betaActive = np.matmul(np.linalg.pinv(xtx), xty[:, :, np.newaxis])[:, :, 0]
+        residActive = signals - np.dot(betaActive, X.T)
+        mask = np.abs(residActive) < 0.000001
+        residActive[mask] = ((residActive[mask] >= 0) * 2 - 1) * 0.000001
+        residActive = np.abs(np.where(residActive < 0,
+                                      levels[active] * residActive,
+                                      (1 - levels[active]) * residActive))
+        diff = np.max(np.abs(betaActive - beta[active]), axis=1)
+        beta[active] = betaActive
+        resid[active] = residActive
+        active[np.flatnonzero(active)[diff <= pTol]] = False
+
+    if nIter == maxIter:
+        warnings.warn("Maximum number of iterations (" + str(maxIter) + \
+                      ") reached.", IterationLimitWarning)
+    return beta[:, 0], beta[:, 1]
+
+def computeDefectCrossing(intercept, slope, detection, defectMin, defectMax):
+    """
+    Compute the defects for which the linear models are equal to the detection
+    value. An exception is raised if one of the defects is not in
+    [defectMin, defectMax].
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        defects = (detection - np.asarray(intercept)) / np.asarray(slope)
+    if not np.all((defects >= defectMin) & (defects <= defectMax)):
+        raise Exception('The quantile regression model does not reach the ' + \
+                        'detection value in the defect interval.')
+    return defects
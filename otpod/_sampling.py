@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# -*- Python -*-
+
+"""
+Sampling strategies of the Monte Carlo simulations used to compute the POD.
+
+usage:
+
+sample = drawSample(distribution, size, method, replicates)
+for indices in splitReplicates(size, replicates):
+    estimate = f(sample[indices])
+
+With the "MonteCarlo" method, the sample is drawn directly from the
+distribution. With the "LHS" and "QMC" methods, the sample is made of
+independent randomized designs, the replicates, whose estimates give the
+variance of the estimator. All random numbers come from the OpenTURNS random
+generator, so the samples can be drawn in a random stream of the parallel
+computation.
+"""
+
+__all__ = []
+
+import openturns as ot
+import numpy as np
+
+SAMPLING_METHODS = ["MonteCarlo", "LHS", "QMC"]
+
+def drawSample(distribution, size, method="MonteCarlo", replicates=1):
+    """
+    Draw a sample of the distribution with the given sampling method.
+
+    For "LHS", each replicate is a Latin hypercube sample with its own
+    permutations and random shifts. For "QMC", each replicate is a Sobol'
+    sequence randomized with its own random shift. The replicates are stacked
+    in the order given by *splitReplicates*.
+    """
+    if method == "MonteCarlo":
+        return distribution.getSample(size)
+
+    if method == "LHS":
+        experiment = ot.LHSExperiment(distribution, size, True, True)
+    else:
+        experiment = ot.LowDiscrepancyExperiment(ot.SobolSequence(),
+                                                 distribution, size, True)
+        experiment.setRandomize(True)
+    sample = ot.Sample(0, distribution.getDimension())
+    for indices in splitReplicates(size, replicates):
+        experiment.setSize(indices.stop - indices.start)
+        sample.add(experiment.generate())
+    return sample
+
+def splitReplicates(size, replicates):
+    """
+    Return the slices of the replicates of a sample, their sizes differ by one
+    at most.
+    """
+    bounds = np.linspace(0, size, replicates + 1).astype(int).tolist()
+    return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+def checkSamplingMethod(method, replicates):
+    """
+    Check the sampling method and the number of replicates given to the
+    accessors. The replicates are only used by the "LHS" and "QMC" methods.
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError("Sampling method must be 'MonteCarlo', 'LHS' or 'QMC'.")
+    if method != "MonteCarlo" and (type(replicates) is not int or replicates < 2):
+        raise ValueError("The number of replicates must be an int greater than 1.")
@@ -8,6 +8,9 @@ from openturns.viewer import View
 import matplotlib.pyplot as plt
 import numpy as np
 import logging
+from scipy.special import ndtr
+from ._kriging_tools import KrigingPredictor
+from ._polynomial_chaos_pod import ChaosGridBasis
 
 class SobolIndices():
     """
@@ -435,38 +438,36 @@ class PODaggrKriging(ot.OpenTURNSPythonFunction):
 
         super(PODaggrKriging, self).__init__(dim, defectSizes.shape[0])
         self.krigingResult = krigingPOD.getKrigingResult()
+        self.predictor = KrigingPredictor(self.krigingResult)
         self.defectNumber = len(defectSizes)
         self.defectSizes = defectSizes
         self.detection = detection
-    
+        # maximum number of points given to the predictor at once
+        self.blockSize = 100000
+
     def _exec(self, X):
-        # create sample combining all defect size with the given X
-        x = np.array(X, ndmin=2)
-        x = x.repeat(self.defectNumber, axis=0)
-        xWitha = np.concatenate((np.vstack(self.defectSizes), x), axis=1)
-
-        # compute the kriging mean and variance
-        mean = np.array(self.krigingResult.getConditionalMean(xWitha))
-
-        # Two solutions to compute the variance, the second seems a bit faster
-        #var = np.diag(self.krigingResult.getConditionalCovariance(xWitha))
-        var = np.array([self.krigingResult.getConditionalCovariance(p)[0, 0] for p in xWitha])
-
-        # check if the variance is positive of not, accept negative values
-        # if they are > -1e-2, else raise an error. 
-        if (var < 0).all():
-            logging.warning("Warning : some variance values are negatives, " + \
-                         "the kriging model may not be accurate enough.")
-
-            if (var[var<0] < 1e-2).all():
-                raise ValueError("Variance values are lower than -1e-2. Please " +\
-                    "check the validity of the kriging model.")
-            else:
-                var = np.abs(var)
-
-        # compute the quantile
-        quantile = np.vstack((self.detection - mean) / np.sqrt(var))
-        prob = 1. - np.array([ot.DistFunc.pNormal(q[0]) for q in quantile])
+        return self._exec_sample([X])[0]
+
+    # vectorial way to compute the POD
+    def _exec_sample(self, X):
+        X = np.array(X, ndmin=2)
+        samplingSize = X.shape[0]
+        prob = np.zeros((samplingSize, self.defectNumber))
+        step = max(1, self.blockSize // self.defectNumber)
+        for start in range(0, samplingSize, step):
+            x = X[start:start+step]
+            # compute the kriging mean and variance of all combinations of
+            # the defect sizes with x
+            mean, variance = self.predictor.computeMeanVarianceGrid(
+                                                        self.defectSizes, x)
+            std = np.sqrt(variance)
+
+            # probability that the signal is greater than the detection
+            with np.errstate(divide='ignore', invalid='ignore'):
+                quantile = (mean - self.detection) / std
+            quantile[std == 0] = np.where(mean > self.detection, np.inf,
+                                          -np.inf)[std == 0]
+            prob[start:start+step] = ndtr(quantile)
         return prob
 
 
@@ -502,55 +503,35 @@ class PODaggrChaos(ot.OpenTURNSPythonFunction):
         # used to compute the POD for a given point
         sampleCoefs = chaosPOD.getCoefficientDistribution().getSample(simulationSize)
 
-        # get some result from the polynomial chaos to build a vectoriel
-        # chaos function that return the signal values for all chaos with
-        # different coefficients for one specific point
-        chaosResult = chaosPOD.getPolynomialChaosResult()
-        reducedBasis = chaosResult.getReducedBasis()
-        transformation = chaosResult.getTransformation()
-        chaosFunctionCol = []
-        for i, coefs in enumerate(sampleCoefs):
-            standardChaosFunction = ot.LinearCombinationFunction(reducedBasis, coefs)
-            chaosFunctionCol.append(ot.ComposedFunction(standardChaosFunction, transformation))
-        self.chaosFunction = ot.AggregatedFunction(chaosFunctionCol)
+        # the signal values of all chaos with different coefficients are
+        # computed from the basis evaluated on the grid of the defect sizes
+        # and the points
+        self.gridBasis = ChaosGridBasis(chaosPOD.getPolynomialChaosResult())
+        self.coefs = np.array(sampleCoefs)
+        # maximum number of signal values computed at once
+        self.blockSize = 10000000
 
     def _exec(self, X):
-        # create sample combining all defect size with the given X
-        x = np.array(X, ndmin=2)
-        x = x.repeat(self.defectNumber, axis=0)
-        xWitha = np.concatenate((np.vstack(self.chaosPOD._defectSizes), x), axis=1)
-        # add randomness from the residual, identical for all defect size
-        residualsSample = np.hstack(self.chaosPOD._normalDist.getSample(self.simulationSize) * self.chaosPOD._stderr)
-        # compute the signal for all chaos
-        Y = self.chaosFunction(xWitha)
-        # compute the POD for all defect size
-        return np.mean((np.array(Y) + residualsSample) > self.detection, axis=1)
+        return self._exec_sample([X])[0]
 
     # vectorial way to compute the POD
     def _exec_sample(self, X):
-        samplingSize = ot.Sample(X).getSize()
-
-        # create sample containing all input combined with all defect sizes
-        fullX = ot.Sample(samplingSize * self.defectNumber,self.dim+1)
-        for i, x in enumerate(X):
-            x = np.array(x, ndmin=2)
-            x = x.repeat(self.defectNumber, axis=0)
-            xWitha = np.concatenate((np.vstack(self.defectSizes), x), axis=1)
-            fullX[self.defectNumber*i:self.defectNumber*(i+1), :] = xWitha
-
-        # add randomness from the residual, identical for all defect size
-        residualsSample = ot.Normal(samplingSize).getSample(self.simulationSize) * self.chaosPOD._stderr
-        fullRes = ot.Sample(self.simulationSize, samplingSize * self.defectNumber)
-        for i in range(samplingSize):
-            fullRes[:, self.defectNumber*i:self.defectNumber*(i+1)] = np.repeat(residualsSample[:, i], self.defectNumber, axis=1)
-        fullRes = np.transpose(fullRes)
-
-        # compute the signal
-        Y = np.array(self.chaosFunction(fullX))
-
-        # compute the POD
-        prob = np.mean((Y + fullRes) > self.detection, axis=1)
-        prob = prob.reshape(samplingSize, self.defectNumber)
+        X = np.array(X, ndmin=2)
+        samplingSize = X.shape[0]
+        prob = np.zeros((samplingSize, self.defectNumber))
+        step = max(1, self.blockSize // (self.defectNumber * self.simulationSize))
+        for start in range(0, samplingSize, step):
+            x = X[start:start+step]
+            size = x.shape[0]
+            # compute the signal for all chaos on the grid of the defect
+            # sizes and x
+            Y = self.gridBasis.computeValues(self.defectSizes, x, self.coefs)
+
+            # add randomness from the residual, identical for all defect size
+            residualsSample = np.array(ot.Normal().getSample(
+                    self.simulationSize * size)).reshape(self.simulationSize, size)
+            Y += residualsSample[:, None, :] * self.chaosPOD._stderr
+
+            # compute the POD
+            prob[start:start+step] = np.mean(Y > self.detection, axis=0).T
         return prob
-
-            
@@ -192,7 +192,8 @@ class UnivariateLinearModelAnalysis():
 
             if self._lambdaBoxCox is None:
                 # optimization required, get optimal lambda and graph
-                self._lambdaBoxCox, self._graphBoxCox = computeBoxCox(defects, signals, shift)
+                self._lambdaBoxCox, self._graphBoxCox = computeBoxCox(defects, signals,
+                                                              shift, cache=True)
 
             # Transformation of data
             boxCoxTransform = ot.BoxCoxTransform([self._lambdaBoxCox])
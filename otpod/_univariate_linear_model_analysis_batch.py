@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+# -*- Python -*-
+
+__all__ = ['UnivariateLinearModelAnalysisBatch']
+
+import openturns as ot
+import numpy as np
+from scipy.special import stdtr, chdtrc, ndtr
+from ._math_tools import computeBoxCox, computeLinearParametersCensored
+from ._parallel import parallelMap
+
+class UnivariateLinearModelAnalysisBatch():
+
+    """
+    Linear regression analysis with residuals hypothesis tests of many datasets.
+
+    **Available constructor:**
+
+    UnivariateLinearModelAnalysisBatch(*inputSamples, outputSamples, noiseThres,
+    saturationThres, resDistFact, boxCox*)
+
+    Parameters
+    ----------
+    inputSamples : sequence of 1-d sequences of float
+        The defect sizes of each dataset. The datasets can have different sizes.
+    outputSamples : sequence of 1-d sequences of float
+        The signals of each dataset.
+    noiseThres : float
+        Value for low censored data. Default is None.
+    saturationThres : float
+        Value for high censored data. Default is None.
+    resDistFact : :py:class:`openturns.DistributionFactory`
+        Distribution hypothesis followed by the residuals. Default is
+        :py:class:`openturns.NormalFactory`.
+    boxCox : bool or float
+        Enable or not the Box Cox transformation. If boxCox is a float, the Box
+        Cox transformation is enabled with the given value. Default is False.
+
+    Notes
+    -----
+    This class runs the analysis of :class:`UnivariateLinearModelAnalysis` on
+    each dataset, with the same thresholds and hypothesis, and gathers the
+    results in a table with one row per dataset. The table is given by the
+    method *getResultTable* once the method *run* is launched.
+
+    The least squares regressions and the R2, zero residual mean, Breusch Pagan,
+    Harrison McCabe and Durbin Watson tests are computed for all datasets at
+    once. The Box Cox parameters, the censored regressions and the tests
+    depending on the residuals distribution are computed for each dataset,
+    possibly in parallel using the method *setParallelism*.
+
+    The p-values of the Harrison McCabe test are computed with one simulation
+    shared by all datasets of the same size, thus they may slightly differ
+    from those of :class:`UnivariateLinearModelAnalysis`.
+
+    Examples
+    --------
+    >>> import openturns as ot
+    >>> import otpod
+    >>> ot.RandomGenerator.SetSeed(0)
+    >>> defects = [ot.Uniform(0.1, 0.6).getSample(N) for N in [50, 100]]
+    >>> signals = [d * 43. + ot.Normal(0, 1.9).getSample(d.getSize()) + 2.5
+    ...            for d in defects]
+    >>> batch = otpod.UnivariateLinearModelAnalysisBatch(defects, signals)
+    >>> batch.setVerbose(False)
+    >>> batch.run()
+    >>> table = batch.getResultTable()
+    >>> print(table.getMarginal(['Intercept', 'Slope']))
+        [ Intercept Slope     ]
+    0 : [  2.88272  41.5026   ]
+    1 : [  2.15675  43.4572   ]
+    """
+
+    def __init__(self, inputSamples, outputSamples, noiseThres=None,
+                 saturationThres=None, resDistFact=None, boxCox=False):
+
+        self._inputSamples = [np.ravel(np.array(inputSample, dtype=float))
+                              for inputSample in inputSamples]
+        self._outputSamples = [np.ravel(np.array(outputSample, dtype=float))
+                               for outputSample in outputSamples]
+        self._noiseThres = noiseThres
+        self._saturationThres = saturationThres
+        # Add flag to tell if censored data must taken into account or not.
+        if noiseThres is not None or saturationThres is not None:
+            self._censored = True
+        else:
+            self._censored = False
+
+        if resDistFact is None:
+            # default is NormalFactory
+            self._resDistFact = ot.NormalFactory()
+        else:
+            self._resDistFact = resDistFact
+
+        # if Box Cox is a float the transformation is enabled with the given value
+        if type(boxCox) is float:
+            self._lambdaBoxCox = boxCox
+            self._boxCox = True
+        else:
+            self._lambdaBoxCox = None
+            self._boxCox = boxCox
+
+        self._simulationSize = 1000
+        self._nJobs = None
+        self._backend = "process"
+        self._verbose = True
+        self._resultTable = None
+
+        # Assertions on parameters
+        assert (len(self._inputSamples) == len(self._outputSamples)), \
+                "The number of input samples and output samples must be equal."
+        for inputSample, outputSample in zip(self._inputSamples, self._outputSamples):
+            assert (inputSample.size >=3), "Not enough observations."
+            assert (inputSample.size == outputSample.size), \
+                "InputSample and outputSample must have the same size."
+
+    def run(self):
+        """
+        Run the analysis of all datasets.
+        """
+        nDatasets = len(self._inputSamples)
+        if self._verbose:
+            message = 'Computing linear analysis'
+        else:
+            message = None
+
+        #################### Filter censored data ##############################
+        noise = self._noiseThres
+        if noise is None:
+            noise = -np.inf
+        saturation = self._saturationThres
+        if saturation is None:
+            saturation = np.inf
+        defects, signals, defectsNoise, defectsSat = [], [], [], []
+        for inputSample, outputSample in zip(self._inputSamples, self._outputSamples):
+            uncensored = np.logical_and(outputSample > noise,
+                                        outputSample < saturation)
+            defects.append(inputSample[uncensored])
+            signals.append(outputSample[uncensored])
+            defectsNoise.append(inputSample[outputSample <= noise])
+            defectsSat.append(inputSample[outputSample >= saturation])
+        noiseThres = [self._noiseThres] * nDatasets
+        saturationThres = [self._saturationThres] * nDatasets
+
+        ###################### Box Cox transformation ##########################
+        columns = []
+        descriptions = []
+        if self._boxCox:
+            shifts = [- np.min(signal) + 100 if np.min(signal) < 0 else 0.
+                      for signal in signals]
+            if self._lambdaBoxCox is None:
+                # optimization required for each dataset
+                lambdaBoxCox = parallelMap(computeBoxCoxParameter,
+                                           zip(signals, shifts), self._nJobs,
+                                           self._backend, message)
+            else:
+                lambdaBoxCox = [self._lambdaBoxCox] * nDatasets
+            for i in range(nDatasets):
+                boxCoxTransform = ot.BoxCoxTransform([lambdaBoxCox[i]])
+                signals[i] = np.array(boxCoxTransform(
+                                    np.vstack(signals[i] + shifts[i])))[:, 0]
+                if self._noiseThres is not None:
+                    noiseThres[i] = boxCoxTransform([self._noiseThres + shifts[i]])[0]
+                if self._saturationThres is not None:
+                    saturationThres[i] = boxCoxTransform([self._saturationThres + shifts[i]])[0]
+            columns.append(lambdaBoxCox)
+            descriptions.append('BoxCox')
+
+        ######################### Linear Regression model ######################
+        # all datasets are concatenated, segment gives the dataset of each value
+        sizes = np.array([defect.size for defect in defects])
+        segment = np.repeat(np.arange(nDatasets), sizes)
+        defectsAll = np.hstack(defects)
+        signalsAll = np.hstack(signals)
+
+        intercept, slope, stderr = _computeSegmentRegression(defectsAll,
+                                                    signalsAll, segment, sizes)
+        residuals = signalsAll - (intercept[segment] + slope[segment] * defectsAll)
+        testResults = self._computeTests(defectsAll, signalsAll, residuals,
+                                         segment, sizes, message)
+        columns.extend([intercept, slope, stderr])
+        descriptions.extend(['Intercept', 'Slope', 'StandardError'])
+        columns.extend(testResults.values())
+        descriptions.extend(testResults.keys())
+
+        if self._censored:
+            # MLE optimization for each dataset
+            argsList = [(defects[i], defectsNoise[i], defectsSat[i], signals[i],
+                         noiseThres[i], saturationThres[i],
+                         [intercept[i], slope[i], stderr[i]])
+                        for i in range(nDatasets)]
+            res = np.array(parallelMap(computeCensoredParameters, argsList,
+                                       self._nJobs, self._backend, message))
+            residuals = signalsAll - (res[segment, 0] + res[segment, 1] * defectsAll)
+            testResults = self._computeTests(defectsAll, signalsAll, residuals,
+                                             segment, sizes, message)
+            columns.extend(res.T)
+            descriptions.extend(['CensoredIntercept', 'CensoredSlope',
+                                 'CensoredStandardError'])
+            columns.extend(testResults.values())
+            descriptions.extend(['Censored' + key for key in testResults.keys()])
+
+        self._resultTable = ot.Sample(np.vstack(columns).T)
+        self._resultTable.setDescription(descriptions)
+
+    def getResultTable(self):
+        """
+        Accessor to the results of all datasets.
+
+        Returns
+        -------
+        table : :py:class:`openturns.Sample`
+            The results with one row per dataset. The description gives the
+            name of each column : the Box Cox parameter if enabled, the
+            intercept, the slope, the standard error, the R2 and the p-values
+            of the tests. If censored data are taken into account, the same
+            columns prefixed by 'Censored' are added for the censored case.
+        """
+        if self._resultTable is None:
+            raise Exception('The run method must be launched.')
+        return self._resultTable
+
+    def getSimulationSize(self):
+        """
+        Accessor to the simulation size of the Harrison McCabe test.
+
+        Returns
+        -------
+        size : int
+            The size of the simulation used to compute the p-values of the
+            Harrison McCabe test.
+        """
+        return self._simulationSize
+
+    def setSimulationSize(self, size):
+        """
+        Accessor to the simulation size of the Harrison McCabe test.
+
+        Parameters
+        ----------
+        size : int
+            The size of the simulation used to compute the p-values of the
+            Harrison McCabe test. Default is 1000.
+        """
+        self._simulationSize = size
+
+    def getParallelism(self):
+        """
+        Accessor to the parallel computation parameters.
+
+        Returns
+        -------
+        nJobs : int
+            The number of jobs, None if the parallel computation is disabled.
+        backend : string
+            Either "process" or "thread".
+        """
+        return self._nJobs, self._backend
+
+    def setParallelism(self, nJobs, backend="process"):
+        """
+        Accessor to the parallel computation parameters.
+
+        Parameters
+        ----------
+        nJobs : int
+            The number of jobs running the computations made for each dataset.
+            If None, the parallel computation is disabled.
+        backend : string
+            "process" or "thread". Default is "process".
+        """
+        if nJobs is not None and (type(nJobs) is not int or nJobs < 1):
+            raise ValueError("The number of jobs must be a positive int or None.")
+        if backend != "process" and backend != "thread":
+            raise ValueError("Backend must be 'process' or 'thread'.")
+        self._nJobs = nJobs
+        self._backend = backend
+
+    def getVerbose(self):
+        """
+        Accessor to the verbosity.
+
+        Returns
+        -------
+        verbose : bool
+            Enable or disable the verbosity. Default is True.
+        """
+        return self._verbose
+
+    def setVerbose(self, verbose):
+        """
+        Accessor to the verbosity.
+
+        Parameters
+        ----------
+        verbose : bool
+            Enable or disable the verbosity.
+        """
+        if type(verbose) is not bool:
+            raise TypeError('The parameter is not a bool.')
+        else:
+            self._verbose = verbose
+
+    def _computeTests(self, defects, signals, residuals, segment, sizes, message):
+        """
+        Compute the R2 and the p-values of the tests for all datasets.
+        """
+        nDatasets = sizes.size
+        segmentSum = lambda values: np.bincount(segment, weights=values,
+                                                minlength=nDatasets)
+        testResults = {}
+
+        # compute R2
+        signalsMean = segmentSum(signals) / sizes
+        sumSquares = segmentSum(residuals**2)
+        residualsMean = segmentSum(residuals) / sizes
+        residualsVar = sumSquares - sizes * residualsMean**2
+        testResults['R2'] = 1 - residualsVar / segmentSum(
+                                        (signals - signalsMean[segment])**2)
+
+        # tests depending on the residuals distribution, run for each dataset
+        argsList = [(residualsDataset, self._resDistFact) for residualsDataset
+                    in np.split(residuals, np.cumsum(sizes)[:-1])]
+        distributionTests = np.array(parallelMap(computeDistributionTests,
+                                argsList, self._nJobs, self._backend, message))
+        testResults['AndersonDarling'] = distributionTests[:, 0]
+        testResults['CramerVonMises'] = distributionTests[:, 1]
+
+        # compute zero residual mean test : Student test
+        statistic = residualsMean / np.sqrt(residualsVar / (sizes - 1) / sizes)
+        testResults['ZeroMean'] = 2 * stdtr(sizes - 1, -np.abs(statistic))
+
+        testResults['Kolmogorov'] = distributionTests[:, 2]
+
+        # compute Breusch Pagan test : the centered squared residuals are
+        # regressed on the defects
+        w = residuals**2 - (sumSquares / sizes)[segment]
+        defectsCentered = defects - (segmentSum(defects) / sizes)[segment]
+        slopeW = segmentSum(defectsCentered * w) / segmentSum(defectsCentered**2)
+        bp = sizes * slopeW**2 * segmentSum(defectsCentered**2) / segmentSum(w**2)
+        testResults['BreuschPagan'] = chdtrc(1, bp)
+
+        # compute Harrison McCabe test : the simulated statistics are shared
+        # by the datasets of the same size
+        breakpoint = np.floor(0.5 * sizes).astype(int)
+        first = np.arange(segment.size) - np.repeat(np.cumsum(sizes) - sizes,
+                                                    sizes) < breakpoint[segment]
+        hmc = segmentSum(residuals**2 * first) / sumSquares
+        pValueHMC = np.zeros(nDatasets)
+        for size in np.unique(sizes).tolist():
+            normalSample = np.reshape(np.array(ot.Normal().getSample(
+                        self._simulationSize * size)), (self._simulationSize, size))
+            normalSample -= normalSample.mean(axis=1, keepdims=True)
+            stat = np.sort(np.sum(normalSample[:, :size // 2]**2, axis=1) /
+                           np.sum(normalSample**2, axis=1))
+            sameSize = sizes == size
+            pValueHMC[sameSize] = np.searchsorted(stat, hmc[sameSize],
+                                        side='right') / float(self._simulationSize)
+        testResults['HarrisonMcCabe'] = pValueHMC
+
+        # compute Durbin Watson test with the normal approximation
+        hasPrevious = np.ones(segment.size, dtype=bool)
+        hasPrevious[np.cumsum(sizes) - sizes] = False
+        hasNext = np.roll(hasPrevious, -1)
+        dw = segmentSum(hasPrevious * (residuals - np.roll(residuals, 1))**2) / sumSquares
+        b = hasPrevious * (defects - np.roll(defects, 1)) + \
+            hasNext * (defects - np.roll(defects, -1))
+        # (X^T X)^-1 with X = [1, defects], only the second column is needed
+        # since the first column of the matrix B = [0, b] is null
+        sumDefects = segmentSum(defects)
+        det = sizes * segmentSum(defects**2) - sumDefects**2
+        inv01 = - sumDefects / det
+        inv11 = sizes / det
+        traceXBQt = inv01 * segmentSum(b) + inv11 * segmentSum(b * defects)
+        P = 2 * (sizes - 1) - traceXBQt
+        Q = 2 * (3 * sizes - 4) - 2 * inv11 * segmentSum(b**2) + traceXBQt**2
+        dmean = P / (sizes - 2)
+        dvar = 2.0 / ((sizes - 2) * sizes) * (Q - P * dmean)
+        testResults['DurbinWatson'] = 2 * ndtr(- np.abs(dw - dmean) / np.sqrt(dvar))
+
+        return testResults
+
+
+def _computeSegmentRegression(defects, signals, segment, sizes):
+    """
+    Compute the least squares linear regressions of all datasets at once.
+    """
+    nDatasets = sizes.size
+    segmentSum = lambda values: np.bincount(segment, weights=values,
+                                            minlength=nDatasets)
+    defectsMean = segmentSum(defects) / sizes
+    signalsMean = segmentSum(signals) / sizes
+    defectsCentered = defects - defectsMean[segment]
+    slope = segmentSum(defectsCentered * signals) / segmentSum(defectsCentered**2)
+    intercept = signalsMean - slope * defectsMean
+    residuals = signals - (intercept[segment] + slope[segment] * defects)
+    stderr = np.sqrt(segmentSum(residuals**2) / (sizes - 2))
+    return intercept, slope, stderr
+
+def computeBoxCoxParameter(seed, signals, shift):
+    """
+    Compute the Box Cox parameter of one dataset.
+
+    The tasks of the datasets draw no random numbers : the seed is not used and
+    the random generator is not locked, so they can run concurrently in threads.
+    """
+    return computeBoxCox(None, ot.Sample(np.vstack(signals)), shift)[0]
+
+def computeCensoredParameters(seed, defects, defectsNoise, defectsSat, signals,
+                              noiseThres, saturationThres, initialStartMLE):
+    """
+    Compute the linear regression parameters of one dataset taking into account
+    the censored data. The seed is not used, see *computeBoxCoxParameter*.
+    """
+    return computeLinearParametersCensored(initialStartMLE,
+                    np.reshape(defects, (-1, 1)),
+                    np.reshape(defectsNoise, (-1, 1)),
+                    np.reshape(defectsSat, (-1, 1)),
+                    np.reshape(signals, (-1, 1)), noiseThres, saturationThres)
+
+def computeDistributionTests(seed, residuals, resDistFact):
+    """
+    Compute the p-values of the Anderson Darling, Cramer Von Mises and
+    Kolmogorov tests of the residuals of one dataset. The seed is not used, see
+    *computeBoxCoxParameter*.
+    """
+    residuals = ot.Sample(np.vstack(residuals))
+    resDist = resDistFact.build(residuals)
+    return [ot.NormalityTest.AndersonDarlingNormal(residuals).getPValue(),
+            ot.NormalityTest.CramerVonMisesNormal(residuals).getPValue(),
+            ot.FittingTest.Kolmogorov(residuals, resDist, 0.05).getPValue()]
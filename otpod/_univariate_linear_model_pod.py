@@ -10,9 +10,10 @@ from ._math_tools import computeBoxCox, DataHandling, computeLinearParametersCen
                          computeR2
 from statsmodels.regression.linear_model import OLS
 import numpy as np
+from scipy.special import ndtr
 from ._decorator import DocInherit, keepingArgs
-from ._progress_bar import updateProgress
-from distutils.version import LooseVersion
+from ._parallel import parallelMap
+from ._bootstrap import generateBootstrapIndices, computeLinearRegressionBatch
 
 
 class UnivariateLinearModelPOD(POD):
@@ -68,6 +69,13 @@ class UnivariateLinearModelPOD(POD):
       :py:class:`openturns.WeibullMinFactory`, ...}, the confidence interval is
       built by bootstrap.
 
+    The bootstrap samples are independent and their linear models can be built
+    in parallel using the method *setParallelism*. Without censored data and
+    Box Cox transformation, the least squares regressions of all bootstrap
+    samples are solved at once. When the Box Cox transformation is enabled, the
+    Box Cox parameter estimated on the data can be used for all bootstrap
+    samples instead of being estimated again, see the method *setBoxCoxRefit*.
+
     If bootstrap is used, a progress bar is shown if the verbosity is enabled.
     It can be disabled using the method *setVerbose*.
     """
@@ -103,6 +111,7 @@ class UnivariateLinearModelPOD(POD):
             self._resDistFact = resDistFact
 
         self._verbose = True
+        self._boxCoxRefit = True
 
         # initialize the POD class
         super(UnivariateLinearModelPOD, self).__init__(inputSample, outputSample,
@@ -140,7 +149,7 @@ class UnivariateLinearModelPOD(POD):
         results = _computeLinearModel(self._inputSample, self._outputSample,
                                       self._detection, self._noiseThres,
                                       self._saturationThres, self._boxCox,
-                                      self._censored)
+                                      self._censored, cache=True)
         # get results
         self._defects = results['defects']
         self._signals = results['signals']
@@ -150,6 +159,7 @@ class UnivariateLinearModelPOD(POD):
         self._residuals = results['residuals']
         self._lambdaBoxCox = results['lambdaBoxCox']
         self._graphBoxCox = results['graphBoxCox']
+        self._shiftBoxCox = results['shift']
         # return the box cox detection even if box cox was not enabled. In this
         # case detection = detectionBoxCox
         self._detectionBoxCox = results['detection']
@@ -166,33 +176,37 @@ class UnivariateLinearModelPOD(POD):
             # Berens Binomial
             PODfunction = self._PODbinomialModel(self._residuals,
                                                  self._linearModel)
+            self._PODmodel = ot.PythonFunction(1, 1, PODfunction)
         elif self._resDistFact.getClassName() == 'NormalFactory':
-            PODfunction = self._PODgaussModel(self._defects,
-                                              self._stderr,
-                                              self._linearModel)
+            PODfunction, PODfunctionSample = self._PODgaussModel(self._defects,
+                                                    self._stderr,
+                                                    self._linearModel)
+            self._PODmodel = ot.PythonFunction(1, 1, PODfunction,
+                                               func_sample=PODfunctionSample)
         else:
             # Linear regression model + bootstrap
-            PODfunction = self._PODbootstrapModel(self._residuals,
-                                                  self._linearModel)
-
-        self._PODmodel = ot.PythonFunction(1, 1, PODfunction)
+            PODfunction, PODfunctionSample = self._PODbootstrapModel(
+                                            self._residuals, self._linearModel)
+            self._PODmodel = ot.PythonFunction(1, 1, PODfunction,
+                                               func_sample=PODfunctionSample)
 
 
         ############## build PODModel function with conf interval ##############
         # Berens binomial : build directly in the get method
         if self._resDistFact is not None:
             if self._resDistFact.getClassName() == 'NormalFactory':
-                # Linear regression with gaussian residuals hypothesis : build POD 
-                # collection function.
+                # Linear regression with gaussian residuals hypothesis : simulate
+                # the parameters of the linear model.
                 # The final PODmodelCl is built in the get method.
-                self._PODcollDict= self._PODgaussModelCl(self._defects,
+                self._PODcollParameters = self._PODgaussModelCl(self._defects,
                                     self._intercept, self._slope,
                                     self._stderr, self._detectionBoxCox)
             else:
                 # Linear regression model + bootstrap : build the collection of 
-                # functions which is time consuming.
+                # linear models which is time consuming.
                 # The final PODmodelCl is built in the get method.
-                self._PODcollDict = self._PODbootstrapModelCl()
+                self._PODcollParameters, self._PODcollResDist = \
+                                                self._PODbootstrapModelCl()
 
     def getPODModel(self):
         """
@@ -228,15 +242,19 @@ class UnivariateLinearModelPOD(POD):
             PODfunction = self._PODbinomialModelCl(self._residuals,
                                                    self._linearModel,
                                                    confidenceLevel)
+            PODmodelCl = ot.PythonFunction(1, 1, PODfunction)
         else:
-            # Linear regression model + gaussian residuals or + bootstrap
+            # Linear regression model + gaussian residuals or + bootstrap :
+            # quantile of the simulated POD for all defects at once
+            def PODfunctionSample(X):
+                PODcoll = self._computePODcoll(np.array(X)[:, 0])
+                PODQuantile = ot.Sample(PODcoll).computeQuantilePerComponent(
+                                                        1. - confidenceLevel)
+                return np.vstack(PODQuantile)
             def PODfunction(x):
-                samplePODDef = ot.Sample(self._simulationSize, 1)
-                for i in range(self._simulationSize):
-                    samplePODDef[i] = [self._PODcollDict[i](x[0])]
-                return samplePODDef.computeQuantilePerComponent(1. - confidenceLevel)
-
-        PODmodelCl = ot.PythonFunction(1, 1, PODfunction)
+                return PODfunctionSample([x])[0]
+            PODmodelCl = ot.PythonFunction(1, 1, PODfunction,
+                                           func_sample=PODfunctionSample)
 
         return PODmodelCl
 
@@ -312,6 +330,33 @@ class UnivariateLinearModelPOD(POD):
         else:
             self._verbose = verbose
 
+    def getBoxCoxRefit(self):
+        """
+        Accessor to the Box Cox estimation on the bootstrap samples.
+
+        Returns
+        -------
+        refit : bool
+            True if the Box Cox parameter is estimated on each bootstrap sample.
+        """
+        return self._boxCoxRefit
+
+    def setBoxCoxRefit(self, refit):
+        """
+        Accessor to the Box Cox estimation on the bootstrap samples.
+
+        Parameters
+        ----------
+        refit : bool
+            If True, the Box Cox parameter is estimated on each bootstrap
+            sample. If False, the Box Cox parameter estimated on the data is
+            used for all bootstrap samples, which is faster. Default is True.
+        """
+        if type(refit) is not bool:
+            raise TypeError('The parameter is not a bool.')
+        else:
+            self._boxCoxRefit = refit
+
 
 ################################################################################
 ####################### Linear regression Binomial #############################
@@ -347,40 +392,30 @@ class UnivariateLinearModelPOD(POD):
 ################################################################################
 
     def _PODgaussModel(self, defects, stderr, linearModel):
-        X = ot.Sample(defects.getSize(), [1, 0])
-        X[:, 1] = defects
-        X = ot.Matrix(X)
+        X = np.hstack([np.ones((defects.getSize(), 1)), np.array(defects)])
+        # the gram matrix is inverted once for all defects
+        gramInverse = np.linalg.inv(np.dot(X.T, X))
         # compute the prediction variance of the linear regression model
         def predictionVariance(x):
-            Y = ot.Point([1.0, x])
-            gramX = X.computeGram()
-            if LooseVersion(ot.__version__) < "1.14":
-                prod = ot.dot(Y, gramX.solveLinearSystem(Y))
-            else:
-                prod = Y.dot(gramX.solveLinearSystem(Y))
+            Y = np.vstack([np.ones(x.size), x])
+            prod = np.sum(Y * np.dot(gramInverse, Y), axis=0)
             return stderr**2 * (1. + prod)
-        # function to compute the POD(defect)
+        # function to compute the POD(defects)
+        def PODmodelSample(X):
+            x = np.array(X)[:, 0]
+            t = (self._detectionBoxCox - linearModel(x)) / np.sqrt(predictionVariance(x))
+            # complementary CDF of the Normal(0,1)
+            return np.vstack(ndtr(-t))
         def PODmodel(x):
-            t = (self._detectionBoxCox - linearModel(x[0])) / np.sqrt(predictionVariance(x[0]))
-            # DistFunc.pNormal(t,True) = complementary CDF of the Normal(0,1)
-            return [ot.DistFunc.pNormal(t,True)]
-        return PODmodel
+            return PODmodelSample([x])[0]
+        return PODmodel, PODmodelSample
 
     def _PODgaussModelCl(self, defects, intercept, slope, stderr, detection):
-
-        class buildPODModel():
-            def __init__(self, intercept, slope, sigmaEpsilon, detection):
-
-                self.intercept = intercept
-                self.slope = slope
-                self.sigmaEpsilon = sigmaEpsilon
-                self.detection = detection
-
-            def PODmodel(self, x):
-                t = (self.detection - (self.intercept + 
-                              self.slope * x)) / self.sigmaEpsilon
-                return ot.DistFunc.pNormal(t,True)
-
+        """
+        Simulate the parameters of the linear model. Return an array whose
+        columns are the intercept, the slope, the detection and the standard
+        deviation of the residuals of each simulation.
+        """
         N = defects.getSize()
         X = ot.Sample(N, [1, 0])
         X[:, 1] = defects
@@ -391,14 +426,12 @@ class UnivariateLinearModelPOD(POD):
         sampleSigmaEpsilon = (ot.Chi(N-2).inverse()*np.sqrt(N-2)*stderr).getSample(
                                                             self._simulationSize)
 
-        PODcoll = []
-        for i in range(self._simulationSize):
-            sigmaEpsilon = sampleSigmaEpsilon[i][0]
-            interceptSimu = sampleNormal[i][0] * sigmaEpsilon + intercept
-            slopeSimu = sampleNormal[i][1] * sigmaEpsilon + slope
-            PODcoll.append(buildPODModel(interceptSimu, slopeSimu, sigmaEpsilon,
-                                         detection).PODmodel)
-        return PODcoll
+        sigmaEpsilon = np.array(sampleSigmaEpsilon)[:, 0]
+        sampleNormal = np.array(sampleNormal)
+        interceptSimu = sampleNormal[:, 0] * sigmaEpsilon + intercept
+        slopeSimu = sampleNormal[:, 1] * sigmaEpsilon + slope
+        detectionSimu = np.full(self._simulationSize, detection)
+        return np.vstack([interceptSimu, slopeSimu, detectionSimu, sigmaEpsilon]).T
 
 ################################################################################
 ####################### Linear regression bootstrap ############################
@@ -407,64 +440,96 @@ class UnivariateLinearModelPOD(POD):
     def _PODbootstrapModel(self, residuals, linearModel):
         empiricalDist = self._resDistFact.build(residuals)
         # function to compute the POD(defects)
-        def PODmodel(x):
-            def_threshold = self._detectionBoxCox - linearModel(x[0])
+        def PODmodelSample(X):
+            def_threshold = self._detectionBoxCox - linearModel(np.array(X)[:, 0])
             # Nb of residuals > threshold(defect) / N
-            return [empiricalDist.computeComplementaryCDF(def_threshold)]
-        return PODmodel
+            return empiricalDist.computeComplementaryCDF(np.vstack(def_threshold))
+        def PODmodel(x):
+            return PODmodelSample([x])[0]
+        return PODmodel, PODmodelSample
 
     def _PODbootstrapModelCl(self):
-
-        class buildPODModel():
-            def __init__(self, inputSample, outputSample, detection, noiseThres,
-                            saturationThres, resDistFact, boxCox, censored):
-
-                results = _computeLinearModel(inputSample, outputSample, detection,
-                                        noiseThres, saturationThres, boxCox, censored)
-
-                self.intercept = results['intercept']
-                self.slope = results['slope']
-                self.residuals = results['residuals']
-                self.detectionBoxCox = results['detection']
-                self.resDist = resDistFact.build(self.residuals)
-
-            def PODmodel(self, x):
-                defectThres = self.detectionBoxCox - (self.intercept + 
-                              self.slope * x)
-                return self.resDist.computeComplementaryCDF(defectThres)
-
-
-        data = ot.Sample(self._size, 2)
-        data[:, 0] = self._inputSample
-        data[:, 1] = self._outputSample
-        # bootstrap of the data
-        bootstrapExp = ot.BootstrapExperiment(data)
-        PODcoll = []
-        for i in range(self._simulationSize):
-        # generate a sample with replacement within data of the same size
-            bootstrapData = bootstrapExp.generate()
-            # compute the linear models
-            model = buildPODModel(bootstrapData[:,0], bootstrapData[:,1],
-                                  self._detection, self._noiseThres,
-                                  self._saturationThres, self._resDistFact,
-                                  self._boxCox, self._censored)
-
-            PODcoll.append(model.PODmodel)
-            if self._verbose:
-                updateProgress(i, self._simulationSize, 'Computing POD (bootstrap)')
-
-        return PODcoll
+        """
+        Build the linear models on the bootstrap samples. Return an array whose
+        columns are the intercept, the slope and the detection of each linear
+        model, and the list of the residuals distributions.
+        """
+        # indices of all bootstrap samples of the data
+        indices = generateBootstrapIndices(self._size, self._simulationSize)
+        inputSample = np.array(self._inputSample)
+        outputSample = np.array(self._outputSample)
+        if self._verbose:
+            message = 'Computing POD (bootstrap)'
+        else:
+            message = None
+
+        if not self._censored and (not self._boxCox or not self._boxCoxRefit):
+            # the least squares regressions are solved at once, only the
+            # residuals distributions are built for each bootstrap sample.
+            # With a fixed Box Cox parameter, the signals and the detection
+            # are transformed once as for the data.
+            signals = np.array(self._signals)
+            intercept, slope, residuals = computeLinearRegressionBatch(
+                                inputSample[:, 0], signals[:, 0], indices)
+            parameters = np.vstack([intercept, slope, np.full(
+                                self._simulationSize, self._detectionBoxCox)]).T
+            argsList = [(self._resDistFact, residualsBoot) for residualsBoot
+                        in residuals]
+            resDistColl = parallelMap(buildResidualsDistribution, argsList,
+                                      self._nJobs, self._backend, message)
+        else:
+            # the nonlinear fits (censored data, Box Cox estimation) are run
+            # in parallel if enabled
+            if self._boxCoxRefit:
+                lambdaBoxCox, shift = None, None
+            else:
+                lambdaBoxCox, shift = self._lambdaBoxCox, self._shiftBoxCox
+            argsList = [(inputSample[index], outputSample[index],
+                         self._detection, self._noiseThres,
+                         self._saturationThres, self._resDistFact,
+                         self._boxCox, self._censored, lambdaBoxCox, shift)
+                        for index in indices]
+            results = parallelMap(computeBootstrapLinearModel, argsList,
+                                  self._nJobs, self._backend, message)
+            parameters = np.array([result[0] for result in results])
+            resDistColl = [result[1] for result in results]
+
+        return parameters, resDistColl
+
+    def _computePODcoll(self, defects):
+        """
+        Compute the POD of all simulated linear models for the given defects.
+        The result is an array of size simulationSize x number of defects.
+        """
+        intercept, slope, detection = self._PODcollParameters[:, :3].T
+        defectThres = detection[:, np.newaxis] - (intercept[:, np.newaxis] +
+                                    slope[:, np.newaxis] * defects[np.newaxis, :])
+        if self._resDistFact.getClassName() == 'NormalFactory':
+            sigmaEpsilon = self._PODcollParameters[:, 3]
+            return ndtr(-defectThres / sigmaEpsilon[:, np.newaxis])
+        elif defects.size == 1:
+            # the Brent solver evaluates one defect at a time
+            return np.vstack([resDist.computeComplementaryCDF(threshold[0])
+                              for resDist, threshold
+                              in zip(self._PODcollResDist, defectThres)])
+        else:
+            return np.vstack([np.array(resDist.computeComplementaryCDF(
+                              np.vstack(threshold)))[:, 0] for resDist, threshold
+                              in zip(self._PODcollResDist, defectThres)])
 
 ################################################################################
 ####################### Compute linear regression  #############################
 ################################################################################
 
 def _computeLinearModel(inputSample, outputSample, detection, noiseThres,
-                        saturationThres, boxCox, censored):
+                        saturationThres, boxCox, censored, lambdaBoxCox=None,
+                        shift=None, cache=False):
     """
     Run filerCensoredData and build the linear regression model.
     It is defined as a simple function because it is also needed in a loop for
-    the bootstrap based POD.
+    the bootstrap based POD. If lambdaBoxCox and shift are given, they are used
+    instead of being estimated on the data. If cache is True, the estimated
+    Box Cox parameter is cached for the same data.
     """
 
     #################### Filter censored data ##############################
@@ -481,13 +546,18 @@ def _computeLinearModel(inputSample, outputSample, detection, noiseThres,
     ###################### Box Cox transformation ##########################
     # Compute Box Cox if enabled
     if boxCox:
-        if signals.getMin()[0] < 0:
-            shift = - signals.getMin()[0] + 100
-        else:
-            shift = 0.
+        if shift is None:
+            if signals.getMin()[0] < 0:
+                shift = - signals.getMin()[0] + 100
+            else:
+                shift = 0.
 
-        # optimization required, get optimal lambda without graph
-        lambdaBoxCox, graphBoxCox = computeBoxCox(defects, signals, shift)
+        if lambdaBoxCox is None:
+            # optimization required, get optimal lambda without graph
+            lambdaBoxCox, graphBoxCox = computeBoxCox(defects, signals, shift,
+                                                      cache=cache)
+        else:
+            graphBoxCox = None
 
         # Transformation of data
         boxCoxTransform = ot.BoxCoxTransform([lambdaBoxCox])
@@ -499,6 +569,7 @@ def _computeLinearModel(inputSample, outputSample, detection, noiseThres,
                 saturationThres = boxCoxTransform([saturationThres + shift])[0]
         detectionBoxCox = boxCoxTransform([detection + shift])[0]
     else:
+        shift = 0.
         detectionBoxCox = detection
         lambdaBoxCox = None
         graphBoxCox = None
@@ -531,4 +602,29 @@ def _computeLinearModel(inputSample, outputSample, detection, noiseThres,
     return {'defects':defects, 'signals':signals, 'intercept':intercept,
             'slope':slope, 'stderr':stderr, 'residuals':residuals,
             'detection':detectionBoxCox, 'lambdaBoxCox':lambdaBoxCox,
-            'graphBoxCox':graphBoxCox}
+            'graphBoxCox':graphBoxCox, 'shift':shift}
+
+def computeBootstrapLinearModel(seed, inputSample, outputSample, detection,
+                                noiseThres, saturationThres, resDistFact,
+                                boxCox, censored, lambdaBoxCox=None, shift=None):
+    """
+    Build the linear model and the residuals distribution of one bootstrap
+    sample. Return the intercept, the slope and the detection of the linear
+    model and the residuals distribution.
+
+    The fit draws no random numbers : the seed is not used and the random
+    generator is not locked, so the tasks can run concurrently in threads.
+    """
+    results = _computeLinearModel(ot.Sample(inputSample),
+                                  ot.Sample(outputSample), detection,
+                                  noiseThres, saturationThres, boxCox,
+                                  censored, lambdaBoxCox, shift)
+    resDist = resDistFact.build(results['residuals'])
+    return [results['intercept'], results['slope'], results['detection']], resDist
+
+def buildResidualsDistribution(seed, resDistFact, residuals):
+    """
+    Build the residuals distribution of one bootstrap sample. The seed is not
+    used, see *computeBootstrapLinearModel*.
+    """
+    return resDistFact.build(ot.Sample(np.vstack(residuals)))
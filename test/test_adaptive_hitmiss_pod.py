@@ -2,6 +2,9 @@ import numpy as np
 import openturns as ot
 ot.TBB.Disable()
 import otpod
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
 
 inputSample = ot.Sample(
     [[4.59626812e+00, 7.46143339e-02, 1.02231538e+00, 8.60042277e+01],
@@ -86,3 +89,68 @@ detectionSize2 = POD2.computeDetectionSize(0.5, 0.95)
 #     np.testing.assert_almost_equal(detectionSize2[1], 4.473170408027023, decimal=5)
 # def test_2_confusion_matrix():
 #     np.testing.assert_almost_equal(POD2.getConfusionMatrix(), [[ 0.83333333,  0.24175824], [ 0.16666667,  0.75824176]], decimal=5)
+
+# Test hitmiss with an asynchronous evaluation of the physical model
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+ot.RandomGenerator.SetState(ot.RandomGeneratorState(ot.Indices([0]*768), 0))
+POD3 = otpod.AdaptiveHitMissPOD(inputDOE, outputDOE, physicalModel, 20, detection)
+POD3.setPhysicalModelExecutor(ThreadPoolExecutor(1))
+POD3.run()
+def test_3_doe_size():
+    assert(POD3.getInputDOE().getSize() == POD1.getInputDOE().getSize())
+
+# Test hitmiss resumed after an interruption of the physical model
+class InterruptedModel(ot.OpenTURNSPythonFunction):
+    # physical model raising an error after a given number of evaluations
+    def __init__(self, model, evaluationNumber):
+        super(InterruptedModel, self).__init__(model.getInputDimension(),
+                                               model.getOutputDimension())
+        self._model = model
+        self._evaluationNumber = evaluationNumber
+    def _exec_sample(self, X):
+        self._evaluationNumber -= len(X)
+        if self._evaluationNumber < 0:
+            raise RuntimeError('The physical model is interrupted.')
+        return self._model(X)
+    def _exec(self, X):
+        return self._exec_sample([X])[0]
+
+checkpoint = os.path.join(tempfile.mkdtemp(), 'checkpoint.npz')
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+ot.RandomGenerator.SetState(ot.RandomGeneratorState(ot.Indices([0]*768), 0))
+POD4 = otpod.AdaptiveHitMissPOD(inputDOE, outputDOE,
+                ot.Function(InterruptedModel(physicalModel, 10)), 20, detection)
+POD4.setCheckpoint(checkpoint)
+try:
+    POD4.run()
+    interrupted4 = False
+except Exception:
+    interrupted4 = True
+POD5 = otpod.AdaptiveHitMissPOD(inputDOE, outputDOE, physicalModel, 20, detection)
+POD5.resume(checkpoint)
+detectionSize5 = POD5.computeDetectionSize(0.9, 0.95)
+def test_5_interrupted():
+    # the checkpoint of the second iteration is resumed
+    assert(interrupted4)
+    assert(np.load(checkpoint)['input'].shape[0] == inputDOE.getSize() + 10)
+def test_5_doe():
+    np.testing.assert_array_equal(np.array(POD5.getInputDOE()), np.array(POD1.getInputDOE()))
+def test_5_a90():
+    np.testing.assert_almost_equal(detectionSize5[0], detectionSize1[0], decimal=5)
+def test_5_a95():
+    np.testing.assert_almost_equal(detectionSize5[1], detectionSize1[1], decimal=5)
+
+# Test hitmiss with the POD computed on Latin hypercube designs
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+ot.RandomGenerator.SetState(ot.RandomGeneratorState(ot.Indices([0]*768), 0))
+POD6 = otpod.AdaptiveHitMissPOD(inputDOE, outputDOE, physicalModel, 20, detection)
+POD6.setSamplingMethod("LHS", 10)
+POD6.run()
+detectionSize6 = POD6.computeDetectionSize(0.9, 0.95)
+def test_6_doe():
+    np.testing.assert_array_equal(np.array(POD6.getInputDOE()), np.array(POD1.getInputDOE()))
+def test_6_a90():
+    np.testing.assert_almost_equal(detectionSize6[0], detectionSize1[0], decimal=1)
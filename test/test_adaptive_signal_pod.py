@@ -1,6 +1,9 @@
 import openturns as ot
 ot.TBB.Disable()
 import otpod
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
 import numpy as np
 ot.Log.Show(ot.Log.NONE)
 
@@ -148,3 +151,142 @@ def test_4_a95():
     np.testing.assert_almost_equal(detectionSize4[1], 4.65919, decimal=1)
 def test_4_Q2_90():
     assert(POD4.getQ2() > 0.89) # idem, should be 0.95
+
+# Test kriging with the incremental update of the candidate kriging models
+POD5 = otpod.AdaptiveSignalPOD(inputDOE, outputDOE, physicalModel, nIteration, detection)
+POD5.setDefectSizes([4.2, 4.35, 4.5, 4.6, 4.7, 4.8])
+POD5.setCandidateSize(10)
+POD5.setSamplingSize(50)
+POD5.setSimulationSize(10)
+POD5.setCovarianceModel(ot.SquaredExponential([3.03338162, 5.84920629, 22.28954134, 50.], [6.08656776]))
+POD5.setInitialStartSize(0)
+POD5.setKrigingUpdateMethod("incremental")
+POD5.run()
+detectionSize5 = POD5.computeDetectionSize(0.9, 0.95)
+def test_5_a90():
+    np.testing.assert_almost_equal(detectionSize5[0], detectionSize1[0], decimal=1)
+def test_5_a95():
+    np.testing.assert_almost_equal(detectionSize5[1], detectionSize1[1], decimal=1)
+
+# Test kriging with the closed form criterion
+POD6 = otpod.AdaptiveSignalPOD(inputDOE, outputDOE, physicalModel, nIteration, detection)
+POD6.setDefectSizes([4.2, 4.35, 4.5, 4.6, 4.7, 4.8])
+POD6.setCandidateSize(10)
+POD6.setSamplingSize(50)
+POD6.setSimulationSize(10)
+POD6.setCovarianceModel(ot.SquaredExponential([3.03338162, 5.84920629, 22.28954134, 50.], [6.08656776]))
+POD6.setInitialStartSize(0)
+POD6.setCriterionMethod("analytic")
+POD6.run()
+detectionSize6 = POD6.computeDetectionSize(0.9, 0.95)
+def test_6_a90():
+    np.testing.assert_almost_equal(detectionSize6[0], detectionSize1[0], decimal=1)
+def test_6_a95():
+    np.testing.assert_almost_equal(detectionSize6[1], detectionSize1[1], decimal=1)
+
+# Test kriging with a batch of points added at each iteration
+POD7 = otpod.AdaptiveSignalPOD(inputDOE, outputDOE, physicalModel, 3, detection)
+POD7.setDefectSizes([4.2, 4.35, 4.5, 4.6, 4.7, 4.8])
+POD7.setCandidateSize(10)
+POD7.setSamplingSize(50)
+POD7.setSimulationSize(10)
+POD7.setCovarianceModel(ot.SquaredExponential([3.03338162, 5.84920629, 22.28954134, 50.], [6.08656776]))
+POD7.setInitialStartSize(0)
+POD7.setBatchSize(2)
+POD7.run()
+detectionSize7 = POD7.computeDetectionSize(0.9, 0.95)
+def test_7_doe_size():
+    assert(POD7.getInputDOE().getSize() == POD1.getInputDOE().getSize() + 3 - nIteration)
+def test_7_a90():
+    np.testing.assert_almost_equal(detectionSize7[0], detectionSize1[0], decimal=1)
+
+# Test kriging with an asynchronous evaluation of the physical model
+POD8 = otpod.AdaptiveSignalPOD(inputDOE, outputDOE, physicalModel, 3, detection)
+POD8.setDefectSizes([4.2, 4.35, 4.5, 4.6, 4.7, 4.8])
+POD8.setCandidateSize(10)
+POD8.setSamplingSize(50)
+POD8.setSimulationSize(10)
+POD8.setCovarianceModel(ot.SquaredExponential([3.03338162, 5.84920629, 22.28954134, 50.], [6.08656776]))
+POD8.setInitialStartSize(0)
+POD8.setPhysicalModelExecutor(ThreadPoolExecutor(1))
+POD8.run()
+detectionSize8 = POD8.computeDetectionSize(0.9, 0.95)
+def test_8_doe_size():
+    assert(POD8.getInputDOE().getSize() == POD7.getInputDOE().getSize())
+def test_8_a90():
+    np.testing.assert_almost_equal(detectionSize8[0], detectionSize1[0], decimal=1)
+
+# Test kriging resumed from a checkpoint
+checkpoint = os.path.join(tempfile.mkdtemp(), 'checkpoint.npz')
+ot.RandomGenerator.SetSeed(0)
+POD9 = otpod.AdaptiveSignalPOD(inputDOE, outputDOE, physicalModel, 2, detection)
+POD9.setDefectSizes([4.2, 4.35, 4.5, 4.6, 4.7, 4.8])
+POD9.setCandidateSize(10)
+POD9.setSamplingSize(50)
+POD9.setSimulationSize(10)
+POD9.setInitialStartSize(0)
+POD9.setCheckpoint(checkpoint)
+POD9.run()
+detectionSize9 = POD9.computeDetectionSize(0.9, 0.95)
+POD10 = otpod.AdaptiveSignalPOD(inputDOE, outputDOE, physicalModel, 2, detection)
+POD10.setDefectSizes([4.2, 4.35, 4.5, 4.6, 4.7, 4.8])
+POD10.setCandidateSize(10)
+POD10.setSamplingSize(50)
+POD10.setSimulationSize(10)
+POD10.setInitialStartSize(0)
+POD10.resume(checkpoint)
+detectionSize10 = POD10.computeDetectionSize(0.9, 0.95)
+def test_10_doe():
+    np.testing.assert_array_equal(np.array(POD10.getInputDOE()), np.array(POD9.getInputDOE()))
+def test_10_a90():
+    np.testing.assert_almost_equal(detectionSize10[0], detectionSize9[0], decimal=4)
+
+# Test kriging resumed after an interruption of the physical model
+class InterruptedModel(ot.OpenTURNSPythonFunction):
+    # physical model raising an error after a given number of evaluations
+    def __init__(self, model, evaluationNumber):
+        super(InterruptedModel, self).__init__(model.getInputDimension(),
+                                               model.getOutputDimension())
+        self._model = model
+        self._evaluationNumber = evaluationNumber
+    def _exec_sample(self, X):
+        self._evaluationNumber -= len(X)
+        if self._evaluationNumber < 0:
+            raise RuntimeError('The physical model is interrupted.')
+        return self._model(X)
+    def _exec(self, X):
+        return self._exec_sample([X])[0]
+
+checkpoint11 = os.path.join(tempfile.mkdtemp(), 'checkpoint.npz')
+ot.RandomGenerator.SetSeed(0)
+POD11 = otpod.AdaptiveSignalPOD(inputDOE, outputDOE,
+                ot.Function(InterruptedModel(physicalModel, 1)), 2, detection)
+POD11.setDefectSizes([4.2, 4.35, 4.5, 4.6, 4.7, 4.8])
+POD11.setCandidateSize(10)
+POD11.setSamplingSize(50)
+POD11.setSimulationSize(10)
+POD11.setInitialStartSize(0)
+POD11.setCheckpoint(checkpoint11)
+try:
+    POD11.run()
+    interrupted11 = False
+except Exception:
+    interrupted11 = True
+POD12 = otpod.AdaptiveSignalPOD(inputDOE, outputDOE, physicalModel, 2, detection)
+POD12.setDefectSizes([4.2, 4.35, 4.5, 4.6, 4.7, 4.8])
+POD12.setCandidateSize(10)
+POD12.setSamplingSize(50)
+POD12.setSimulationSize(10)
+POD12.setInitialStartSize(0)
+POD12.resume(checkpoint11)
+detectionSize12 = POD12.computeDetectionSize(0.9, 0.95)
+def test_12_interrupted():
+    # the checkpoint of the first iteration is resumed
+    assert(interrupted11)
+    assert(np.load(checkpoint11)['input'].shape[0] == inputDOE.getSize() + 1)
+def test_12_doe():
+    np.testing.assert_array_equal(np.array(POD12.getInputDOE()), np.array(POD9.getInputDOE()))
+def test_12_a90():
+    np.testing.assert_almost_equal(detectionSize12[0], detectionSize9[0], decimal=4)
+def test_12_a95():
+    np.testing.assert_almost_equal(detectionSize12[1], detectionSize9[1], decimal=4)
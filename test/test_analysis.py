@@ -635,3 +635,127 @@ def test_16_warnings():
     msg = analysis16._printWarnings()
     assert msg == ['', 'Some hypothesis tests failed : you may consider to use quantile regression or kriging (if input dimension > 1) to build POD.', 'Confidence interval, Normality tests and zero residual mean test are given assuming the residuals follow a Normal distribution.']
 
+
+# Test the exact Harrison McCabe p-value versus the simulated one
+from otpod._math_tools import computeHarrisonMcCabeTest
+def test_17_harrison_exact():
+    residuals = analysis1.getResiduals()
+    np.testing.assert_almost_equal(computeHarrisonMcCabeTest(residuals, method="exact"),
+                                   analysis1.getHarrisonMcCabePValue()[0], decimal=1)
+def test_17_harrison_exact_simulation():
+    # the simulated p-values of 200000 samples have a standard deviation
+    # lower than 1.2e-3
+    ot.RandomGenerator.SetSeed(0)
+    residuals = np.array(analysis1.getResiduals())
+    for residualsSample in [residuals, residuals[::-1]]:
+        residualsSample = ot.Sample(residualsSample)
+        for breakRatio in [0.3, 0.5, 0.8]:
+            pValueSimulation = np.mean([computeHarrisonMcCabeTest(
+                    residualsSample, breakRatio, 20000) for i in range(10)])
+            np.testing.assert_allclose(computeHarrisonMcCabeTest(residualsSample,
+                    breakRatio, method="exact"), pValueSimulation, atol=4e-3)
+
+
+# Test the batch analysis versus the analysis of each dataset
+ot.RandomGenerator.SetSeed(0)
+batch = otpod.UnivariateLinearModelAnalysisBatch([defects, defects[:50]],
+                        [signals, signals[:50]], noiseThres, saturationThres, boxCox=True)
+batch.setVerbose(False)
+batch.run()
+table = batch.getResultTable()
+ot.RandomGenerator.SetSeed(0)
+analysis18 = otpod.UnivariateLinearModelAnalysis(defects[:50], signals[:50], noiseThres, saturationThres, boxCox=True)
+# values of the analysis of each column of the batch table, except the
+# Harrison McCabe test whose p-values are simulated
+def analysisColumns(analysis, boxCox=True):
+    columns = {}
+    if boxCox:
+        columns['BoxCox'] = analysis.getBoxCoxParameter()
+    getters = {'Intercept': analysis.getIntercept,
+               'Slope': analysis.getSlope,
+               'StandardError': analysis.getStandardError,
+               'R2': analysis.getR2,
+               'AndersonDarling': analysis.getAndersonDarlingPValue,
+               'CramerVonMises': analysis.getCramerVonMisesPValue,
+               'ZeroMean': analysis.getZeroMeanPValue,
+               'Kolmogorov': analysis.getKolmogorovPValue,
+               'BreuschPagan': analysis.getBreuschPaganPValue,
+               'DurbinWatson': analysis.getDurbinWatsonPValue}
+    for name, getter in getters.items():
+        columns[name] = getter()[0]
+        columns['Censored' + name] = getter()[1]
+    return columns
+def test_18_batch():
+    for i, analysis in enumerate([analysis6, analysis18]):
+        columns = analysisColumns(analysis)
+        np.testing.assert_almost_equal(table.getMarginal(list(columns.keys()))[i],
+                                       list(columns.values()), decimal=5)
+def test_18_harrison():
+    np.testing.assert_almost_equal(table.getMarginal(['HarrisonMcCabe'])[0, 0],
+                                   analysis6.getHarrisonMcCabePValue()[0], decimal=1)
+
+# Test the batch analysis with a given Box Cox parameter
+ot.RandomGenerator.SetSeed(0)
+batchLambda = otpod.UnivariateLinearModelAnalysisBatch([defects, defects[:50]],
+                        [signals, signals[:50]], noiseThres, saturationThres, boxCox=0.3)
+batchLambda.setVerbose(False)
+batchLambda.run()
+tableLambda = batchLambda.getResultTable()
+analysisLambda = [otpod.UnivariateLinearModelAnalysis(defects[:size], signals[:size],
+                        noiseThres, saturationThres, boxCox=0.3) for size in [N, 50]]
+def test_18_batch_lambda():
+    for i, analysis in enumerate(analysisLambda):
+        columns = analysisColumns(analysis)
+        np.testing.assert_almost_equal(tableLambda.getMarginal(list(columns.keys()))[i],
+                                       list(columns.values()), decimal=5)
+
+
+# Test the Box Cox parameter computed once the linear trend is removed
+from otpod._math_tools import computeBoxCox, ReducedLogLikelihood
+def test_19_boxcox_linear_trend():
+    lambdaBoxCox = computeBoxCox(defects, signals, 0., linearTrend=True)[0]
+    np.testing.assert_almost_equal(lambdaBoxCox, 0.291620621811, decimal=5)
+    logLikelihood = ot.Function(ReducedLogLikelihood(defects, signals))
+    grid = np.linspace(-3, 3, 500)
+    assert logLikelihood([lambdaBoxCox])[0] >= np.max(logLikelihood(np.vstack(grid)))
+
+# Test the cached Box Cox parameter : the result of the optimization is given
+# back for the same data, shift and linear trend only
+def test_20_boxcox_cache():
+    lambdaBoxCox, graph = computeBoxCox(defects, signals, 10., cache=True)
+    lambdaCached, graphCached = computeBoxCox(defects, signals, 10., cache=True)
+    assert graphCached is graph
+    assert lambdaCached == lambdaBoxCox
+    assert computeBoxCox(defects, signals, 20., cache=True)[1] is not graph
+    assert computeBoxCox(defects, signals, 10., cache=False)[1] is not graph
+    graphTrend = computeBoxCox(defects, signals, 10., True, cache=True)[1]
+    assert computeBoxCox(defects, signals, 10., True, cache=True)[1] is graphTrend
+    assert computeBoxCox(defects[::-1], signals, 10., True, cache=True)[1] is not graphTrend
+
+# Test the censored linear regression on data where the quasi Newton method
+# stops far from the optimum : the log likelihood must be at least as good as
+# the one of the Nelder Mead simplex
+from scipy.optimize import fmin
+from otpod._math_tools import MLE, computeLinearParametersCensored
+def test_21_censored_MLE():
+    randomState = np.random.RandomState(90)
+    size = randomState.randint(20, 120)
+    defectsMLE = randomState.uniform(0.1, 1., size)
+    b0, b1, sigma = randomState.uniform(-2, 2), randomState.uniform(0.5, 5), randomState.uniform(0.1, 1.5)
+    signalsMLE = b0 + b1 * defectsMLE + sigma * randomState.randn(size)
+    noiseMLE = np.quantile(signalsMLE, randomState.uniform(0, .35))
+    saturationMLE = np.quantile(signalsMLE, randomState.uniform(.65, 1.))
+    isNoise = signalsMLE < noiseMLE
+    isSat = signalsMLE > saturationMLE
+    isUncensored = ~isNoise & ~isSat
+    defectsUncensored = defectsMLE[isUncensored]
+    signalsUncensored = signalsMLE[isUncensored]
+    # initial starting point given by the least squares of the uncensored data
+    slope, intercept = np.polyfit(defectsUncensored, signalsUncensored, 1)
+    stderr = np.std(signalsUncensored - (intercept + slope * defectsUncensored), ddof=2)
+    args = (defectsUncensored, defectsMLE[isNoise], defectsMLE[isSat],
+            signalsUncensored, noiseMLE, saturationMLE)
+    parameters = computeLinearParametersCensored([intercept, slope, stderr], *args)
+    parametersFmin = fmin(MLE, [intercept, slope, stderr], args=args, disp=0, maxiter=500)
+    assert MLE(parameters, *args) <= MLE(parametersFmin, *args) + 1e-6
+    np.testing.assert_allclose(parameters, parametersFmin, rtol=1e-3)
@@ -104,3 +104,67 @@ def test_4_R2_90():
     np.testing.assert_almost_equal(POD4.getR2(), 0.8716647905822066)
 def test_4_Q2_90():
     np.testing.assert_almost_equal(POD4.getQ2(), 0.86811804068316134)
+
+# Test polynomial chaos with parallel computation : the result must not
+# depend on the number of jobs nor on the backend
+PODParallel = []
+for nJobs, backend in [(1, "process"), (2, "thread"), (2, "process")]:
+    np.random.seed(0)
+    ot.RandomGenerator.SetSeed(0)
+    POD5 = otpod.PolynomialChaosPOD(defects, signals, detection, boxCox=False)
+    POD5.setSamplingSize(300)
+    POD5.setSimulationSize(100)
+    POD5.setVerbose(False)
+    POD5.setParallelism(nJobs, backend)
+    POD5.run()
+    PODParallel.append(POD5.computeDetectionSize(0.9, 0.95))
+def test_5_thread():
+    np.testing.assert_array_equal(PODParallel[1], PODParallel[0])
+def test_5_process():
+    np.testing.assert_array_equal(PODParallel[2], PODParallel[0])
+def test_5_a95():
+    np.testing.assert_almost_equal(PODParallel[0][1], detectionSize1[1], decimal=2)
+
+# Test polynomial chaos with the input sample shared by all random coefficients
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+POD6 = otpod.PolynomialChaosPOD(defects, signals, detection, boxCox=False)
+POD6.setSamplingSize(300)
+POD6.setSimulationSize(100)
+POD6.setSharedSampling(True)
+POD6.setVerbose(False)
+POD6.run()
+detectionSize6 = POD6.computeDetectionSize(0.9, 0.95)
+def test_6_a90():
+    np.testing.assert_almost_equal(detectionSize6[0], detectionSize1[0])
+def test_6_a95():
+    np.testing.assert_almost_equal(detectionSize6[1], detectionSize1[1], decimal=2)
+
+# Test the chaos values computed on the grid of the defect sizes and the
+# sample versus the metamodel
+from otpod._polynomial_chaos_pod import ChaosGridBasis
+def test_7_grid_basis():
+    chaosResult = POD1.getPolynomialChaosResult()
+    gridBasis = ChaosGridBasis(chaosResult)
+    defectSizes = np.linspace(0.1, 0.6, 11)
+    coefs = np.hstack(chaosResult.getCoefficients())
+    values = gridBasis.computeValues(defectSizes, np.zeros((3, 0)), coefs)
+    np.testing.assert_allclose(values[0], np.repeat(chaosResult.getMetaModel()(
+                               defectSizes[:, None]), 3, axis=1), rtol=1e-12)
+
+# Test polynomial chaos without Box Cox with randomized quasi Monte Carlo
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+POD8 = otpod.PolynomialChaosPOD(defects, signals, detection, boxCox=False)
+POD8.setSamplingSize(320)
+POD8.setSimulationSize(100)
+POD8.setSamplingMethod("QMC", 10)
+POD8.setVerbose(False)
+POD8.run()
+detectionSize8 = POD8.computeDetectionSize(0.9, 0.95)
+def test_8_a90():
+    np.testing.assert_almost_equal(detectionSize8[0], detectionSize1[0], decimal=2)
+def test_8_a95():
+    np.testing.assert_almost_equal(detectionSize8[1], detectionSize1[1], decimal=2)
+def test_8_sampling_method():
+    assert POD8.getSamplingMethod() == ("QMC", 10)
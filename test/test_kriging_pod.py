@@ -113,3 +113,170 @@ def test_4_a95():
     np.testing.assert_almost_equal(detectionSize4[1], 4.632483680577114, decimal=2)
 def test_4_Q2_90():
     np.testing.assert_almost_equal(POD4.getQ2(), 0.999906599236, decimal=4)
+
+# Test kriging with censored data without Box Cox using the closed form
+# distribution of the POD estimator
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+ot.RandomGenerator.SetState(ot.RandomGeneratorState(ot.Indices([0]*768), 0))
+POD5 = otpod.KrigingPOD(inputSample, signals, detection, noiseThres, saturationThres, boxCox=False)
+POD5.setCovarianceModel(ot.SquaredExponential([5.03148,13.9442,20,20], [15.1697]))
+POD5.setInitialStartSize(0)
+POD5.setSamplingSize(100)
+POD5.setSimulationSize(100)
+POD5.setPODDistributionMethod("analytic")
+POD5.run()
+detectionSize5 = POD5.computeDetectionSize(0.6, 0.95)
+def test_5_a90():
+    np.testing.assert_almost_equal(detectionSize5[0], detectionSize2[0], decimal=1)
+def test_5_a95():
+    np.testing.assert_almost_equal(detectionSize5[1], detectionSize2[1], decimal=1)
+
+# Test kriging with censored data without Box Cox storing only an histogram
+# of the POD estimator
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+ot.RandomGenerator.SetState(ot.RandomGeneratorState(ot.Indices([0]*768), 0))
+POD6 = otpod.KrigingPOD(inputSample, signals, detection, noiseThres, saturationThres, boxCox=False)
+POD6.setCovarianceModel(ot.SquaredExponential([5.03148,13.9442,20,20], [15.1697]))
+POD6.setInitialStartSize(0)
+POD6.setSamplingSize(100)
+POD6.setSimulationSize(100)
+POD6.setPODDistributionMethod("histogram")
+POD6.run()
+detectionSize6 = POD6.computeDetectionSize(0.6, 0.95)
+def test_6_a90():
+    np.testing.assert_almost_equal(detectionSize6[0], detectionSize2[0], decimal=1)
+def test_6_a95():
+    np.testing.assert_almost_equal(detectionSize6[1], detectionSize2[1], decimal=1)
+
+# Test the POD of the conditional simulations computed with the sorted
+# thresholds versus the simulated signals
+from otpod._kriging_tools import computePODFromMoments, randomVectorSampling
+def test_7_pod_simulations():
+    ot.RandomGenerator.SetSeed(0)
+    sample = POD2._transformation(ot.Normal(4).getSample(200)) + [4.5, 0.05, 1.04, 40.]
+    normalSample = ot.Normal().getSample(50)
+    predictor = POD2._getKrigingPredictor(POD2._krigingResult)
+    Y_sample = randomVectorSampling(predictor, sample, normalSample)
+    np.testing.assert_array_equal(computePODFromMoments(predictor.computeMean(sample),
+                                  predictor.computeVariance(sample), normalSample,
+                                  detection), np.mean(Y_sample > detection, axis=1))
+
+# Test the kriging mean and variance of the grid of the defect sizes and the
+# sample versus the full sample
+def test_8_mean_variance_grid():
+    ot.RandomGenerator.SetSeed(0)
+    defects = np.linspace(-1.5, 1.5, 7)
+    sample = np.array(ot.Normal(3).getSample(30))
+    grid = np.hstack([np.tile(defects, 30)[:, None], sample.repeat(7, axis=0)])
+    predictor = POD2._getKrigingPredictor(POD2._krigingResult)
+    mean, variance = predictor.computeMeanVarianceGrid(defects, sample)
+    np.testing.assert_allclose(mean.ravel(), predictor.computeMean(grid), rtol=1e-9)
+    np.testing.assert_allclose(variance.ravel(), predictor.computeVariance(grid), atol=1e-9)
+    np.testing.assert_array_equal(predictor.computeMeanGrid(defects, sample), mean)
+
+# Test kriging with censored data without Box Cox with the same random numbers
+# for all defect sizes
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+POD9 = otpod.KrigingPOD(inputSample, signals, detection, noiseThres, saturationThres, boxCox=False)
+POD9.setCovarianceModel(ot.SquaredExponential([5.03148,13.9442,20,20], [15.1697]))
+POD9.setInitialStartSize(0)
+POD9.setSamplingSize(100)
+POD9.setSimulationSize(100)
+POD9.setCommonRandomNumbers(True)
+POD9.run()
+detectionSize9 = POD9.computeDetectionSize(0.6, 0.95)
+def test_9_a90():
+    np.testing.assert_almost_equal(detectionSize9[0], detectionSize2[0], decimal=1)
+def test_9_a95():
+    np.testing.assert_almost_equal(detectionSize9[1], detectionSize2[1], decimal=1)
+def test_9_monotone():
+    meanPOD = np.array(POD9.getPODModel()(POD9.getDefectSizes()[:, None]))
+    assert np.all(np.diff(meanPOD[:, 0]) >= 0)
+
+# Test kriging with censored data without Box Cox with Latin hypercube designs,
+# the variance of the Monte Carlo estimator being computed from the replicates
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+POD10 = otpod.KrigingPOD(inputSample, signals, detection, noiseThres, saturationThres, boxCox=False)
+POD10.setCovarianceModel(ot.SquaredExponential([5.03148,13.9442,20,20], [15.1697]))
+POD10.setInitialStartSize(0)
+POD10.setSamplingSize(100)
+POD10.setSimulationSize(100)
+POD10.setSamplingMethod("LHS", 5)
+POD10.run()
+detectionSize10 = POD10.computeDetectionSize(0.6, 0.95)
+def test_10_a90():
+    np.testing.assert_almost_equal(detectionSize10[0], detectionSize2[0], decimal=1)
+def test_10_a95():
+    np.testing.assert_almost_equal(detectionSize10[1], detectionSize2[1], decimal=1)
+
+# Test the variance of the Monte Carlo estimator computed from the replicates
+# versus the variance of the estimator over independent samples
+from otpod._sampling import drawSample
+from otpod._kriging_tools import computePODVariance
+def test_11_replicates_variance():
+    predictor = POD2._getKrigingPredictor(POD2._krigingResult)
+    distribution = POD2.getDistribution()
+    distribution = ot.ComposedDistribution([ot.Dirac(4.55)] +
+                        [distribution.getMarginal(i) for i in range(1, 4)])
+    ot.RandomGenerator.SetSeed(0)
+    normalSample = ot.Normal().getSample(5)
+    for method in ["LHS", "QMC"]:
+        PODSample, varianceSample = [], []
+        for i in range(50):
+            sample = POD2._transformation(drawSample(distribution, 1600, method, 16))
+            mean = predictor.computeMean(sample)
+            variance = predictor.computeVariance(sample)
+            POD = computePODFromMoments(mean, variance, normalSample, detection)
+            PODSample.append(POD)
+            varianceSample.append(computePODVariance(POD, mean, variance,
+                                    normalSample, detection, method, 16))
+        ratio = np.sqrt(np.mean(varianceSample, axis=0)) / np.std(PODSample, axis=0, ddof=1)
+        assert np.all(ratio > 0.7) and np.all(ratio < 1.4)
+
+# Test the Monte Carlo sampling method without replicates
+def test_12_sampling_method():
+    POD12 = otpod.KrigingPOD(inputSample, signals, detection)
+    POD12.setSamplingMethod("MonteCarlo", 1)
+    assert POD12.getSamplingMethod() == ("MonteCarlo", 1)
+
+# Test the vectorized kriging predictor versus OpenTURNS with a fixed
+# covariance model
+from otpod._kriging_tools import KrigingPredictor
+inputNormed = (np.array(inputSample) - np.array(inputSample.computeMean())) / \
+               np.array(inputSample.computeStandardDeviation())
+def buildKrigingResult(size):
+    algo = ot.KrigingAlgorithm(ot.Sample(inputNormed[:size]), signals[:size],
+                               ot.SquaredExponential([2.] * 4, [5.]),
+                               ot.ConstantBasisFactory(4).build())
+    algo.setOptimizeParameters(False)
+    algo.run()
+    return algo.getResult()
+def test_13_predictor():
+    result = buildKrigingResult(15)
+    predictor = KrigingPredictor(result)
+    sample = ot.Sample(inputNormed[16:])
+    covariance = np.array(result.getConditionalCovariance(sample))
+    np.testing.assert_allclose(predictor.computeMean(sample),
+                        np.array(result.getConditionalMean(sample))[:, 0], atol=1e-10)
+    np.testing.assert_allclose(predictor.computeVariance(sample),
+                        np.diag(covariance), atol=1e-10)
+    np.testing.assert_allclose(predictor.computeCovariance(sample[:4], sample[4:]),
+                        covariance[:4, 4:], atol=1e-10)
+def test_13_predictor_augment():
+    # the augmented predictor is the one of the kriging model built on the
+    # augmented sample
+    predictor = KrigingPredictor(buildKrigingResult(15)).augment(
+                                    inputNormed[15], signals[15, 0])
+    result = buildKrigingResult(16)
+    sample = ot.Sample(inputNormed[16:])
+    covariance = np.array(result.getConditionalCovariance(sample))
+    np.testing.assert_allclose(predictor.computeMean(sample),
+                        np.array(result.getConditionalMean(sample))[:, 0], atol=1e-10)
+    np.testing.assert_allclose(predictor.computeVariance(sample),
+                        np.diag(covariance), atol=1e-10)
+    np.testing.assert_allclose(predictor.computeCovariance(sample[:4], sample[4:]),
+                        covariance[:4, 4:], atol=1e-10)
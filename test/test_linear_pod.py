@@ -355,7 +355,7 @@ detectionSize27 = POD27.computeDetectionSize(0.9, 0.95)
 def test_27_a90():
     np.testing.assert_almost_equal(detectionSize27[0], 0.31307250797)
 def test_27_a9095():
-    np.testing.assert_almost_equal(detectionSize27[1], 0.325364972586)
+    np.testing.assert_almost_equal(detectionSize27[1], 0.325365281175)
 
 
 # Test linear regression with no hypothesis on residuals, high censored data and Box Cox
@@ -367,7 +367,7 @@ detectionSize28 = POD28.computeDetectionSize(0.9, 0.95)
 def test_28_a90():
     np.testing.assert_almost_equal(detectionSize28[0], 0.309757773325)
 def test_28_a9095():
-    np.testing.assert_almost_equal(detectionSize28[1], 0.321470244842)
+    np.testing.assert_almost_equal(detectionSize28[1], 0.321469972994)
 
 
 # Test from the linear analysis
@@ -553,3 +553,90 @@ def test_42_a90():
     np.testing.assert_almost_equal(detectionSize42[0], 0.29132498542758567)
 def test_42_a9095():
     np.testing.assert_almost_equal(detectionSize42[1], 0.3074995096280702)
+
+# Test the evaluation of the POD models on a sample of defects
+defectGrid = ot.Sample([[0.2], [0.3], [0.4]])
+def test_43_PODModelSample():
+    for POD in [POD13, POD31]:
+        PODmodel = POD.getPODModel()
+        np.testing.assert_almost_equal(np.hstack(PODmodel(defectGrid)),
+                    [PODmodel(defect)[0] for defect in defectGrid])
+def test_43_PODModelClSample():
+    for POD in [POD13, POD31]:
+        PODmodelCl = POD.getPODCLModel()
+        np.testing.assert_almost_equal(np.hstack(PODmodelCl(defectGrid)),
+                    [PODmodelCl(defect)[0] for defect in defectGrid])
+
+# Test the bootstrap in parallel : the result must not depend on the number of
+# jobs nor on the backend
+PODParallel = []
+for nJobs, backend in [(None, "process"), (2, "thread"), (2, "process")]:
+    np.random.seed(0)
+    ot.RandomGenerator.SetSeed(0)
+    POD44 = otpod.UnivariateLinearModelPOD(dataFiltered[0], dataFiltered[3],
+                            detection, resDistFact=ot.KernelSmoothing(), boxCox=True)
+    POD44.setSimulationSize(100)
+    POD44.setVerbose(False)
+    POD44.setParallelism(nJobs, backend)
+    POD44.run()
+    PODParallel.append(POD44.computeDetectionSize(0.9, 0.95))
+def test_44_thread():
+    np.testing.assert_array_equal(PODParallel[1], PODParallel[0])
+def test_44_process():
+    np.testing.assert_array_equal(PODParallel[2], PODParallel[0])
+def test_44_a9095():
+    np.testing.assert_almost_equal(PODParallel[0][1], detectionSize42[1])
+
+# Test the bootstrap of censored data with Box Cox run concurrently in threads :
+# the fits do not lock the random generator and the result must not change
+PODThread = []
+for nJobs in [None, 4]:
+    np.random.seed(0)
+    ot.RandomGenerator.SetSeed(0)
+    POD44 = otpod.UnivariateLinearModelPOD(defects, signals, detection,
+                            noiseThres, saturationThres,
+                            resDistFact=ot.KernelSmoothing(), boxCox=True)
+    POD44.setSimulationSize(20)
+    POD44.setVerbose(False)
+    POD44.setParallelism(nJobs, "thread")
+    POD44.run()
+    PODThread.append(POD44.computeDetectionSize(0.9, 0.95))
+def test_44_thread_censored():
+    np.testing.assert_array_equal(PODThread[1], PODThread[0])
+
+# Test the bootstrap with the Box Cox parameter of the data used for all
+# bootstrap samples : the regressions are solved at once
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+POD45 = otpod.UnivariateLinearModelPOD(dataFiltered[0], dataFiltered[3],
+                        detection, resDistFact=ot.KernelSmoothing(), boxCox=True)
+POD45.setSimulationSize(100)
+POD45.setVerbose(False)
+POD45.setBoxCoxRefit(False)
+POD45.run()
+detectionSize45 = POD45.computeDetectionSize(0.9, 0.95)
+def test_45_a90():
+    np.testing.assert_almost_equal(detectionSize45[0], detectionSize42[0])
+def test_45_a9095():
+    np.testing.assert_almost_equal(detectionSize45[1], 0.30605486340686533)
+def test_45_refit():
+    np.testing.assert_almost_equal(detectionSize45[1], detectionSize42[1], decimal=2)
+
+# Test the Box Cox refit given by PODSummary to the kernel smoothing POD
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+PODSummary46 = otpod.PODSummary(dataFiltered[0], dataFiltered[3], detection,
+                                boxCox=True)
+for method in ['LinearGauss', 'LinearBinomial', 'QuantileRegression',
+               'PolynomialChaos', 'Kriging']:
+    PODSummary46.setMethodActive(method, False)
+PODSummary46.setSimulationSize(100)
+PODSummary46.setVerbose(False)
+PODSummary46.setBoxCoxRefit(False)
+PODSummary46.run()
+POD46 = PODSummary46.getLinearKernelSmoothingPOD()
+detectionSize46 = POD46.computeDetectionSize(0.9, 0.95)
+def test_46_refit():
+    assert(POD46.getBoxCoxRefit() is False)
+def test_46_a9095():
+    np.testing.assert_almost_equal(detectionSize46[1], detectionSize45[1], decimal=2)
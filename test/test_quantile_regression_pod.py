@@ -91,3 +91,64 @@ def test_4_a95():
     np.testing.assert_almost_equal(detectionSize4[1], 0.317139410914)
 def test_4_R2_90():
     np.testing.assert_almost_equal(POD4.getR2(0.9), 0.565484415155)
+
+# Test quantile regression with parallel bootstrap : the result must not
+# depend on the number of jobs nor on the backend
+PODParallel = []
+for nJobs, backend in [(None, "process"), (2, "thread"), (2, "process")]:
+    np.random.seed(0)
+    ot.RandomGenerator.SetSeed(0)
+    POD5 = otpod.QuantileRegressionPOD(defects, signals, detection, boxCox=True)
+    POD5.setSimulationSize(10)
+    POD5.setVerbose(False)
+    POD5.setParallelism(nJobs, backend)
+    POD5.run()
+    PODParallel.append(POD5.computeDetectionSize(0.9, 0.95))
+def test_5_thread():
+    np.testing.assert_array_equal(PODParallel[1], PODParallel[0])
+def test_5_process():
+    np.testing.assert_array_equal(PODParallel[2], PODParallel[0])
+def test_5_a95():
+    np.testing.assert_almost_equal(PODParallel[0][1], detectionSize3[1], decimal=5)
+
+# Test the bootstrap of censored data with Box Cox run concurrently in threads :
+# the fits do not lock the random generator and the result must not change
+PODThread = []
+for nJobs in [None, 4]:
+    np.random.seed(0)
+    ot.RandomGenerator.SetSeed(0)
+    POD5 = otpod.QuantileRegressionPOD(defects, signals, detection, noiseThres,
+                                       saturationThres, boxCox=True)
+    POD5.setSimulationSize(20)
+    POD5.setVerbose(False)
+    POD5.setParallelism(nJobs, "thread")
+    POD5.run()
+    PODThread.append(POD5.computeDetectionSize(0.9, 0.95))
+def test_5_thread_censored():
+    np.testing.assert_array_equal(PODThread[1], PODThread[0])
+
+# Test quantile regression with the Box Cox parameter of the data used for
+# all bootstrap samples
+np.random.seed(0)
+ot.RandomGenerator.SetSeed(0)
+POD6 = otpod.QuantileRegressionPOD(defects, signals, detection, boxCox=True)
+POD6.setSimulationSize(10)
+POD6.setVerbose(False)
+POD6.setBoxCoxRefit(False)
+POD6.run()
+detectionSize6 = POD6.computeDetectionSize(0.9, 0.95)
+def test_6_a90():
+    np.testing.assert_almost_equal(detectionSize6[0], detectionSize3[0])
+def test_6_a95():
+    np.testing.assert_almost_equal(detectionSize6[1], detectionSize3[1], decimal=2)
+
+# Test the quantile regressions fitted for all levels at once versus statsmodels
+from otpod._quantile_regression_pod import computeQuantileRegressionBatch
+from statsmodels.regression.quantile_regression import QuantReg
+def test_7_batch():
+    levels = 1. - POD1.getQuantile()
+    intercept, slope = computeQuantileRegressionBatch(defects, signals, levels)
+    X = np.hstack([np.ones((len(defects), 1)), np.array(defects)])
+    algo = QuantReg(np.array(signals), X)
+    params = [algo.fit(q, max_iter=300, p_tol=1e-2).params for q in levels]
+    np.testing.assert_allclose(np.vstack([intercept, slope]).T, params, rtol=1e-7)
@@ -146,3 +146,82 @@ def test_6_FA():
     np.testing.assert_almost_equal(firstAgg6, [0.765053,0.119978,0.0796234], decimal=2)
 def test_6_TA():
     np.testing.assert_almost_equal(totalAgg6, [0.859471,0.252722,0.0116165], decimal=2)
+
+################################################################################
+# Test 7 PLI with Latin hypercube and quasi Monte Carlo designs versus a large
+# Monte Carlo simulation
+indicesRef7 = [[[0.0787, 0.0484, 0.0203], [-0.0129, -0.0104, -0.0085], [0.0004, 0., 0.0006]],
+               [[-0.0862, -0.0534, -0.0225], [0.0127, 0.0103, 0.0084], [-0.0004, 0., -0.0006]]]
+indices7 = {}
+for method in ["LHS", "QMC"]:
+    ot.RandomGenerator.SetSeed(0)
+    pli = otpod.PLIMean(POD, [-0.1, 0.1])
+    pli.setDefectSizes([4.4, 4.5, 4.6])
+    pli.setSamplingSize(2000)
+    pli.setSamplingMethod(method, 10)
+    pli.run()
+    indices7[method] = pli.getIndices()
+def test_7_LHS():
+    np.testing.assert_allclose(indices7["LHS"], indicesRef7, atol=5e-3)
+def test_7_QMC():
+    np.testing.assert_allclose(indices7["QMC"], indicesRef7, atol=5e-3)
+
+################################################################################
+# Test 8 the vectorized POD of the kriging model versus the POD of each point
+# computed with the conditional mean and variance of OpenTURNS
+from otpod._sobol_indices import PODaggrKriging, PODaggrChaos
+defectSizes8 = np.array([4.4, 4.5, 4.6, 4.7])
+ot.RandomGenerator.SetSeed(0)
+sample8 = POD.getDistribution().getMarginal([1, 2, 3]).getSample(7)
+krigingResult8 = POD.getKrigingResult()
+PODRef8 = np.zeros((7, 4))
+for i, x in enumerate(sample8):
+    for j, defect in enumerate(defectSizes8):
+        point = [defect] + list(x)
+        mean = krigingResult8.getConditionalMean(point)[0]
+        variance = krigingResult8.getConditionalCovariance(point)[0, 0]
+        PODRef8[i, j] = ot.Normal().computeCDF((mean - POD._detectionBoxCox) / np.sqrt(variance))
+def test_8_aggregated_kriging():
+    PODaggr = PODaggrKriging(POD, 3, defectSizes8, POD._detectionBoxCox)
+    np.testing.assert_allclose(PODaggr._exec_sample(sample8), PODRef8, atol=1e-8)
+def test_8_aggregated_kriging_blocks():
+    # the points are given to the predictor by blocks of 2 points
+    PODaggr = PODaggrKriging(POD, 3, defectSizes8, POD._detectionBoxCox)
+    PODaggr.blockSize = 10
+    np.testing.assert_allclose(PODaggr._exec_sample(sample8), PODRef8, atol=1e-8)
+
+################################################################################
+# Test 9 the vectorized POD of the chaos model versus the aggregated function
+# of the chaos models of all simulated coefficients
+chaosPOD9 = otpod.PolynomialChaosPOD(inputSample, signals, detection)
+chaosPOD9.setVerbose(False)
+chaosPOD9.setSimulationSize(20)
+chaosPOD9.setSamplingSize(100)
+distribution9 = ot.ComposedDistribution([ot.Uniform(inputSample.getMin()[i],
+                        inputSample.getMax()[i]) for i in range(4)])
+chaosPOD9.setDistribution(distribution9)
+basis9 = ot.OrthogonalProductPolynomialFactory([ot.StandardDistributionPolynomialFactory(
+            distribution9.getMarginal(i)) for i in range(4)])
+chaosPOD9.setAdaptiveStrategy(ot.FixedStrategy(basis9, 15))
+chaosPOD9.setProjectionStrategy(ot.LeastSquaresStrategy())
+ot.RandomGenerator.SetSeed(0)
+chaosPOD9.run()
+ot.RandomGenerator.SetSeed(0)
+PODaggr9 = PODaggrChaos(chaosPOD9, 3, defectSizes8, chaosPOD9._detectionBoxCox, 20)
+ot.RandomGenerator.SetSeed(1)
+PODSample9 = PODaggr9._exec_sample(sample8)
+# old evaluation of the signals of all chaos models
+chaosResult9 = chaosPOD9.getPolynomialChaosResult()
+chaosFunction9 = ot.AggregatedFunction([ot.ComposedFunction(
+                    ot.LinearCombinationFunction(chaosResult9.getReducedBasis(), coefs),
+                    chaosResult9.getTransformation()) for coefs in PODaggr9.coefs])
+fullSample9 = np.array([[defect] + list(x) for x in sample8 for defect in defectSizes8])
+signals9 = np.array(chaosFunction9(fullSample9)).reshape(7, 4, 20)
+ot.RandomGenerator.SetSeed(1)
+residuals9 = np.array(ot.Normal().getSample(20 * 7)).reshape(20, 7) * chaosPOD9._stderr
+PODRef9 = np.mean(signals9 + residuals9.T[:, None, :] > chaosPOD9._detectionBoxCox, axis=2)
+def test_9_chaos_signals():
+    np.testing.assert_allclose(np.transpose(PODaggr9.gridBasis.computeValues(
+            defectSizes8, sample8, PODaggr9.coefs), (2, 1, 0)), signals9, rtol=1e-10)
+def test_9_aggregated_chaos():
+    np.testing.assert_array_equal(PODSample9, PODRef9)